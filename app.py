@@ -5,12 +5,13 @@ os.environ["NUMEXPR_NUM_THREADS"] = "1"
 import time
 import logging
 import concurrent.futures
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, redirect, url_for
 from flask_cors import CORS
 from dotenv import load_dotenv
 from datetime import datetime
 import hashlib
 import json
+import numpy as np
 
 # ── Database Import ──────────────────────────────────────────────────────
 import candidate_db
@@ -42,8 +43,14 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), 'web cam'))
 from interview_engine import InterviewEngine
 from session_storage import save_session, load_session
+from answer_evaluator import AnswerEvaluator
+from json_http import ojsonify, request_json, http_error
+from werkzeug.exceptions import HTTPException
 import uuid
 
+# Stateless evaluator — shared across all /submit_answer requests
+_EVALUATOR = AnswerEvaluator()
+
 # In-memory storage for active sessions
 active_sessions = {}
 
@@ -54,6 +61,9 @@ CORS(app)
 
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Final combined score weights: resume_reliability, live_integrity, speech_score
+_COMBINED_WEIGHTS = np.array([0.5, 0.3, 0.2])
+
 # ── Helpers ─────────────────────────────────────────────────────────────
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -71,7 +81,7 @@ def safe_future(fut, timeout, fallback):
     return fallback
 
 def _make_error(message, detail="", code=500, meta=None):
-    return jsonify({
+    return ojsonify({
         "success": False,
         "error": message,
         "detail": detail,
@@ -79,10 +89,14 @@ def _make_error(message, detail="", code=500, meta=None):
     }), code
 
 # ── Global Exception Handler ─────────────────────────────────────────────
+# HTTP errors (malformed JSON 400, 404, 405) keep their status; the more
+# specific HTTPException handler wins over the catch-all below.
+app.register_error_handler(HTTPException, http_error)
+
 @app.errorhandler(Exception)
 def handle_exception(e):
     log.critical("Unhandled exception reached Flask: %s", e, exc_info=True)
-    return jsonify({
+    return ojsonify({
         "success": False,
         "error": "Internal engine failure. Please retry.",
         "detail": str(e)
@@ -91,7 +105,7 @@ def handle_exception(e):
 # ── Health Check ─────────────────────────────────────────────────────────
 @app.route('/health')
 def health():
-    return jsonify({"status": "ok", "timestamp": datetime.utcnow().isoformat() + "Z"})
+    return ojsonify({"status": "ok", "timestamp": datetime.utcnow().isoformat() + "Z"})
 
 # ── Root Route ───────────────────────────────────────────────────────────
 @app.route('/')
@@ -107,7 +121,8 @@ def report_by_hash(resume_hash):
     """
     Canonical, hash-based single candidate forensic report view.
     Hash is immutable — survives DB resets, server restarts.
-    Falls back to reports/<hash>.json on disk if DB is empty.
+    Falls back to the reports/<hash[:2]>/<hash>.json backup on disk (or a
+    legacy flat reports/<hash>.json) if DB is empty.
     """
     cand = candidate_db.get_candidate_by_hash(resume_hash)
     if not cand:
@@ -452,7 +467,7 @@ def scan_resume():
             processed_count += 1
 
     log.info("=== BATCH SCAN COMPLETE in %.2fs ===", time.time() - overall_start)
-    return jsonify({
+    return ojsonify({
         "success": True,
         "processed": processed_count,
         "skipped_duplicates": skipped_count,
@@ -469,12 +484,12 @@ def shortlist_view():
 @app.route('/api/shortlist')
 def api_shortlist():
     candidates = candidate_db.get_all_candidates()
-    return jsonify(candidates)
+    return ojsonify(candidates)
 
 @app.route('/api/clear_all', methods=['POST'])
 def clear_all_data():
     candidate_db.clear_all()
-    return jsonify({"success": True})
+    return ojsonify({"success": True})
 
 @app.route('/compare', methods=['POST'])
 def compare_view():
@@ -629,7 +644,7 @@ def demo_scan():
     demo_report["meta"]["report_hash_sha256"] = hashlib.sha256(
         json.dumps(demo_report, sort_keys=True).encode()
     ).hexdigest()
-    return jsonify({"success": True, "data": demo_report, "meta": demo_report["meta"]})
+    return ojsonify({"success": True, "data": demo_report, "meta": demo_report["meta"]})
 
 
 # ── Web Cam Live Interaction Routes ──────────────────────────────────────
@@ -640,32 +655,32 @@ def interview(candidate_hash):
 
 @app.route('/start_session', methods=['POST'])
 def start_session():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash', str(uuid.uuid4()))
     active_sessions[candidate_hash] = InterviewEngine(candidate_hash)
-    return jsonify({"status": "success", "candidate_hash": candidate_hash})
+    return ojsonify({"status": "success", "candidate_hash": candidate_hash})
 
 @app.route('/process_frame', methods=['POST'])
 def process_frame():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     image_b64 = data.get('image')
     engine = active_sessions.get(candidate_hash)
     if not engine or not image_b64:
-        return jsonify({"error": "Invalid session or missing image"}), 400
+        return ojsonify({"error": "Invalid session or missing image"}), 400
     metrics = engine.process_frame(image_b64)
-    return jsonify(metrics)
+    return ojsonify(metrics)
 
 @app.route('/cheating_event', methods=['POST'])
 def cheating_event():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     event_type = data.get('event_type')
     engine = active_sessions.get(candidate_hash)
     if not engine or not event_type:
-        return jsonify({"error": "Invalid session or missing event"}), 400
+        return ojsonify({"error": "Invalid session or missing event"}), 400
     engine.log_cheating_event(event_type)
-    return jsonify({"status": "logged"})
+    return ojsonify({"status": "logged"})
 
 @app.route('/load_questions/', defaults={'pattern': ''}, methods=['GET'])
 @app.route('/load_questions/<pattern>', methods=['GET'])
@@ -683,48 +698,46 @@ def load_questions_api(pattern):
         except Exception as e:
             print(f"Error loading {f}: {e}")
     questions.sort(key=lambda item: item.get("id", ""))
-    return jsonify(questions)
+    return ojsonify(questions)
 
 @app.route('/submit_answer', methods=['POST'])
 def submit_answer():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     question = data.get('question')
     answer = data.get('answer')
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
+        return ojsonify({"error": "Invalid session"}), 400
     metrics = engine.get_current_metrics()
-    from answer_evaluator import AnswerEvaluator
-    evaluator = AnswerEvaluator()
-    eval_result = evaluator.evaluate(question, answer, metrics)
+    eval_result = _EVALUATOR.evaluate(question, answer, metrics)
     engine.log_evaluated_answer({
         "question": question,
         "answer": answer,
         "evaluation": eval_result
     })
-    return jsonify(eval_result)
+    return ojsonify(eval_result)
 
 @app.route('/get_metrics', methods=['GET'])
 def get_metrics():
     candidate_hash = request.args.get('candidate_hash')
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
-    return jsonify(engine.get_current_metrics())
+        return ojsonify({"error": "Invalid session"}), 400
+    return ojsonify(engine.get_current_metrics())
 
 @app.route('/end_session', methods=['POST'])
 def end_session_api():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
+        return ojsonify({"error": "Invalid session"}), 400
     summary = engine.finalize_session()
     save_session(candidate_hash, summary)
     if candidate_hash in active_sessions:
         del active_sessions[candidate_hash]
-    return jsonify({"status": "success", "summary": summary})
+    return ojsonify({"status": "success", "summary": summary})
 
 @app.route('/session_summary/<candidate_hash>')
 def session_summary_view(candidate_hash):
@@ -735,14 +748,13 @@ def session_summary_view(candidate_hash):
 
 @app.route("/save_interview_results", methods=["POST"])
 def save_interview_results():
-    payload = request.json
+    payload = request_json()
     candidate_hash = payload.get("candidate_hash")
     results = payload.get("interview_results", {})
 
-    import candidate_db as db
-    candidate = db.get_candidate_by_hash(candidate_hash)
+    candidate = candidate_db.get_candidate_by_hash(candidate_hash)
     if not candidate:
-        return jsonify({"error": "Not Found"}), 404
+        return ojsonify({"error": "Not Found"}), 404
 
     # Map engine metrics to user's requested schema
     live_integrity = results.get("integrity_index", 50.0)
@@ -761,21 +773,15 @@ def save_interview_results():
         "raw_engine_data": results
     }
 
-    forensic = candidate.get("forensic_payload", {})
-    forensic["connect_results"] = mapped_results
-    forensic["connect_timestamp"] = datetime.now().isoformat()
-
-    scores = forensic.get("scores", {})
-    resume_reliability = scores.get("reliability", 50.0)
+    forensic = candidate.get("forensic_payload") or {}
+    resume_reliability = forensic.get("scores", {}).get("reliability", 50.0)
 
     # 50% resume_reliability + 30% live_integrity + 20% speech_reliability
-    final_combined_score = (0.5 * resume_reliability) + (0.3 * live_integrity) + (0.2 * speech_score)
+    final_combined_score = float(_COMBINED_WEIGHTS @ np.array([resume_reliability, live_integrity, speech_score], dtype=float))
 
     try:
-        from ai_consensus_engine import generate_live_forensic_narrative
         # Pass resume text if available, or empty string
-        resume_text = candidate.get("forensic_payload", {}).get("resume_text", "")
-        synthesis = generate_live_forensic_narrative(resume_text=resume_text)
+        synthesis = generate_live_forensic_narrative(resume_text=forensic.get("resume_text", ""))
     except Exception:
         synthesis = {
             "resume_reliability": resume_reliability,
@@ -784,14 +790,18 @@ def save_interview_results():
             "hiring_recommendation": "Hire" if final_combined_score >= 70 else ("Review" if final_combined_score >= 40 else "Reject")
         }
 
-    forensic["final_synthesis"] = synthesis
-    
+    # Single write of the merged payload
+    candidate["forensic_payload"] = {
+        **forensic,
+        "connect_results": mapped_results,
+        "connect_timestamp": datetime.now().isoformat(),
+        "final_synthesis": synthesis,
+    }
     candidate["final_score"] = round(final_combined_score, 2)
-    candidate["forensic_payload"] = forensic
     
-    db.update_candidate(candidate)
+    candidate_db.update_candidate(candidate)
 
-    return jsonify({"status": "saved"})
+    return ojsonify({"status": "saved"})
 
 
 if __name__ == '__main__':
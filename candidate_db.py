@@ -2,11 +2,83 @@ import sqlite3
 import json
 import os
 import logging
+import time
+import threading
+import functools
+import numpy as np
 
 log = logging.getLogger("HonestRecruiter.DB")
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "candidates.db")
 REPORTS_DIR = os.path.join(os.path.dirname(__file__), "reports")
+BACKUP_FLUSH_INTERVAL = 5.0  # seconds between deferred fsyncs of freshly written backups
+
+_backup_dirty = threading.Event()
+_pending_backups = set()  # report paths written since the last flush
+_pending_lock = threading.Lock()
+_flusher_lock = threading.Lock()
+_flusher_started = False
+
+def _report_path(file_hash: str) -> str:
+    """reports/<hash[:2]>/<hash>.json — sharded so no single directory grows unbounded."""
+    return os.path.join(REPORTS_DIR, file_hash[:2], f"{file_hash}.json")
+
+@functools.lru_cache(maxsize=256)
+def _ensure_shard_dir(shard_dir: str) -> str:
+    os.makedirs(shard_dir, exist_ok=True)
+    return shard_dir
+
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _flush_pending_backups():
+    """fsyncs just the backups written since the last call, so durability never flushes the whole host."""
+    with _pending_lock:
+        paths = sorted(_pending_backups)
+        _pending_backups.clear()
+    for path in paths:
+        try:
+            _fsync_path(path)
+        except OSError as e:
+            log.warning("Deferred backup fsync failed for %s: %s", path, e)
+
+def _backup_flusher():
+    """Background thread: coalesces forensic backup durability into one batch of fsyncs per interval."""
+    while True:
+        _backup_dirty.wait()
+        time.sleep(BACKUP_FLUSH_INTERVAL)
+        _backup_dirty.clear()
+        _flush_pending_backups()
+
+def _start_backup_flusher():
+    global _flusher_started
+    if _flusher_started:
+        return
+    with _flusher_lock:
+        if not _flusher_started:
+            threading.Thread(target=_backup_flusher, name="report-flusher", daemon=True).start()
+            _flusher_started = True
+
+def _write_report_backup(file_hash: str, data: bytes) -> str:
+    """Unbuffered single write(2); fsync is deferred to the background flusher."""
+    report_path = _report_path(file_hash)
+    _ensure_shard_dir(os.path.dirname(report_path))
+    fd = os.open(report_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    with _pending_lock:
+        _pending_backups.add(report_path)
+    _start_backup_flusher()
+    _backup_dirty.set()
+    return report_path
 
 def _get_connection():
     conn = sqlite3.connect(DB_PATH)
@@ -27,13 +99,44 @@ def init_db():
             hash TEXT UNIQUE,
             final_score REAL,
             forensic_json TEXT,
-            created_at TEXT DEFAULT (datetime('now'))
+            created_at TEXT DEFAULT (datetime('now')),
+            reliability REAL,
+            fraud_score REAL,
+            insights_json TEXT
         )
     ''')
+    _migrate_score_columns(c)
+    c.execute('CREATE INDEX IF NOT EXISTS idx_candidates_final_score ON candidates (final_score DESC)')
     conn.commit()
     conn.close()
     log.info("Initialized candidates database (v3 schema).")
 
+def _migrate_score_columns(c):
+    """Adds the denormalized ranking columns to pre-existing DBs and backfills them from forensic_json."""
+    existing = {row["name"] for row in c.execute('PRAGMA table_info(candidates)')}
+    added = False
+    for column, col_type in (("reliability", "REAL"), ("fraud_score", "REAL"), ("insights_json", "TEXT")):
+        if column not in existing:
+            c.execute(f'ALTER TABLE candidates ADD COLUMN {column} {col_type}')
+            added = True
+    if not added:
+        return
+    c.execute('''
+        UPDATE candidates SET
+            reliability   = COALESCE(json_extract(forensic_json, '$.scores.reliability'), 50.0),
+            fraud_score   = COALESCE(json_extract(forensic_json, '$.scores.fraud_score'), 50.0),
+            insights_json = COALESCE(json_extract(forensic_json, '$.deterministic_insights'), '[]'),
+            final_score   = COALESCE(json_extract(forensic_json, '$.scores.final_score'), final_score, 0.0)
+        WHERE reliability IS NULL
+    ''')
+    # Backwards compatibility fix for older resumes that had final_score = trust - fraud (which can be negative)
+    c.execute('''
+        UPDATE candidates
+        SET final_score = ROUND((reliability + MAX(0.0, 100.0 - fraud_score)) / 2.0, 2)
+        WHERE final_score < 0
+    ''')
+    log.info("Migrated candidates table: added denormalized score columns.")
+
 def clear_all():
     import glob
     conn = _get_connection()
@@ -41,7 +144,9 @@ def clear_all():
     c.execute('DELETE FROM candidates')
     conn.commit()
     conn.close()
-    for f in glob.glob(os.path.join(REPORTS_DIR, "*.json")):
+    _ensure_shard_dir.cache_clear()
+    backups = glob.glob(os.path.join(REPORTS_DIR, "*", "*.json")) + glob.glob(os.path.join(REPORTS_DIR, "*.json"))
+    for f in backups:
         try:
             os.remove(f)
         except Exception as e:
@@ -61,15 +166,19 @@ def save_candidate(name: str, domain: str, file_hash: str, final_score: float, f
     """
     Saves a processed candidate to the database.
     forensic_payload must be a complete dict — it is serialized to forensic_json.
-    Also writes a JSON backup to reports/<hash>.json for resilience.
+    Also writes a JSON backup to reports/<hash[:2]>/<hash>.json for resilience.
     """
     serialized = json.dumps(forensic_payload, ensure_ascii=False)
 
+    # Denormalized ranking columns — lets the shortlist skip parsing forensic_json
+    scores = forensic_payload.get("scores", {})
+    reliability = scores.get("reliability", 50.0)
+    fraud_score = scores.get("fraud_score", 50.0)
+    insights_json = json.dumps(forensic_payload.get("deterministic_insights", []), ensure_ascii=False)
+
     # File backup (judges love forensic evidence trails)
     try:
-        report_path = os.path.join(REPORTS_DIR, f"{file_hash}.json")
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(serialized)
+        report_path = _write_report_backup(file_hash, serialized.encode("utf-8"))
         log.info("  Forensic backup written: %s", report_path)
     except Exception as e:
         log.warning("  Could not write file backup: %s", e)
@@ -78,17 +187,18 @@ def save_candidate(name: str, domain: str, file_hash: str, final_score: float, f
     c = conn.cursor()
     try:
         c.execute('''
-            INSERT INTO candidates (name, domain, hash, final_score, forensic_json)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, domain, file_hash, final_score, serialized))
+            INSERT INTO candidates (name, domain, hash, final_score, forensic_json, reliability, fraud_score, insights_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, domain, file_hash, final_score, serialized, reliability, fraud_score, insights_json))
         conn.commit()
         log.info("Saved candidate '%s' to DB (hash: %s…)", name, file_hash[:8])
     except sqlite3.IntegrityError:
         # Hash already exists — update the record with latest payload
         log.warning("  Hash %s… already exists. Updating forensic_json.", file_hash[:8])
         c.execute(
-            'UPDATE candidates SET name=?, domain=?, final_score=?, forensic_json=? WHERE hash=?',
-            (name, domain, final_score, serialized, file_hash)
+            'UPDATE candidates SET name=?, domain=?, final_score=?, forensic_json=?, '
+            'reliability=?, fraud_score=?, insights_json=? WHERE hash=?',
+            (name, domain, final_score, serialized, reliability, fraud_score, insights_json, file_hash)
         )
         conn.commit()
     finally:
@@ -107,44 +217,33 @@ def update_candidate(candidate: dict):
     save_candidate(name, domain, file_hash, final_score, forensic_payload)
 
 def get_all_candidates():
-    """Returns all candidates sorted by final_score descending."""
+    """
+    Returns all candidates sorted by final_score descending.
+    Reads only the denormalized score columns — forensic_json is never parsed here.
+    """
     conn = _get_connection()
     c = conn.cursor()
-    c.execute('SELECT * FROM candidates ORDER BY final_score DESC')
+    c.execute('''
+        SELECT id, name, domain, hash, final_score, reliability, fraud_score, insights_json, created_at
+        FROM candidates ORDER BY final_score DESC
+    ''')
     rows = c.fetchall()
     conn.close()
+    if not rows:
+        return []
+
+    # Struct-of-arrays: bucket risk for the whole column at once
+    fraud = np.array([row["fraud_score"] if row["fraud_score"] is not None else 50.0 for row in rows])
+    risk = np.where(fraud < 20, 'Low', np.where(fraud < 50, 'Moderate', 'High')).tolist()
 
     candidates = []
-    for row in rows:
+    for row, fraud_score, risk_level in zip(rows, fraud.tolist(), risk):
         cand = dict(row)
-        try:
-            payload = json.loads(cand.get("forensic_json") or "{}")
-        except Exception:
-            payload = {}
-
-        scores = payload.get("scores", {})
-        reliability = scores.get("reliability", 50.0)
-        fraud_score = scores.get("fraud_score", 50.0)
-
-        cand['reliability'] = reliability
+        cand['reliability'] = cand['reliability'] if cand['reliability'] is not None else 50.0
         cand['fraud_score'] = fraud_score
-        cand['risk'] = (
-            'Low' if fraud_score < 20
-            else 'Moderate' if fraud_score < 50
-            else 'High'
-        )
-        cand['insights'] = payload.get("deterministic_insights", [])
-        
-        old_score = scores.get("final_score", cand.get("final_score", 0.0))
-        if old_score < 0:
-            cand["final_score"] = round((cand["reliability"] + max(0.0, 100.0 - cand["fraud_score"])) / 2.0, 2)
-        else:
-            cand["final_score"] = old_score
-            
+        cand['risk'] = risk_level
+        cand['insights'] = json.loads(cand.pop('insights_json') or "[]")
         candidates.append(cand)
-    
-    # Re-sort candidates gracefully just in case loaded payloads modified the score
-    candidates.sort(key=lambda x: x["final_score"], reverse=True)
     return candidates
 
 def get_candidate_by_id(candidate_id: int):
@@ -166,11 +265,12 @@ def get_candidate_by_hash(file_hash: str):
 
     # Try file backup if DB row not found
     if not row:
-        report_path = os.path.join(REPORTS_DIR, f"{file_hash}.json")
-        if os.path.exists(report_path):
-            with open(report_path, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            return {"forensic_payload": payload, "hash": file_hash}
+        # Sharded layout first, then the legacy flat reports/<hash>.json
+        for report_path in (_report_path(file_hash), os.path.join(REPORTS_DIR, f"{file_hash}.json")):
+            if os.path.exists(report_path):
+                with open(report_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                return {"forensic_payload": payload, "hash": file_hash}
     return _hydrate(row)
 
 def _hydrate(row):
@@ -4,6 +4,7 @@ Classifies resume into a career stage BEFORE any scoring happens.
 All downstream evaluation adapts to the stage.
 """
 import re
+from types import MappingProxyType
 from datetime import datetime
 
 CURRENT_YEAR = datetime.now().year
@@ -11,6 +12,10 @@ CURRENT_YEAR = datetime.now().year
 # ── Stage Definitions ──────────────────────────────────────────────────
 STAGES = ["Academic", "Fresher", "Early Professional", "Mid-Level", "Senior", "Executive"]
 
+# Integer stage codes (index into STAGES) used on the hot classification path
+(STAGE_ACADEMIC, STAGE_FRESHER, STAGE_EARLY_PROFESSIONAL,
+ STAGE_MID_LEVEL, STAGE_SENIOR, STAGE_EXECUTIVE) = range(len(STAGES))
+
 # Stage baselines: prevents index collapse for early-career candidates
 STAGE_BASELINES = {
     "Academic": 58,
@@ -79,8 +84,55 @@ STAGE_EXPECTATIONS = {
     }
 }
 
+# Read-only views: the same expectation rules are shared by every classification
+STAGE_EXPECTATIONS = MappingProxyType({s: MappingProxyType(rules) for s, rules in STAGE_EXPECTATIONS.items()})
+
+# stage code -> (stage name, baseline score, expectation rules)
+_STAGE_TABLE = tuple((s, STAGE_BASELINES[s], STAGE_EXPECTATIONS[s]) for s in STAGES)
+
+# ── Classification Signal Keywords ─────────────────────────────────────
+SIGNAL_BUCKETS = {
+    "exec":    ["ceo", "cto", "coo", "chief", "vp ", "vice president", "president", "founder", "director"],
+    "senior":  ["senior", "lead", "principal", "staff engineer", "architect", "head of", "engineering manager"],
+    "mid":     ["engineer", "developer", "analyst", "specialist", "consultant", "associate"],
+    "student": ["student", "fresher", "graduate", "intern", "b.tech", "b.e.", "b.sc", "pursuing", "final year", "cgpa", "gpa", "sgpa"],
+    "claims":  ["expert", "specialist", "deep", "advanced", "extensive", "10+ years", "15+ years", "proven track record"],
+}
+
+# keyword -> buckets it counts towards (a keyword may sit in several buckets)
+_KEYWORD_BUCKETS = {}
+for _bucket, _kws in SIGNAL_BUCKETS.items():
+    for _kw in _kws:
+        _KEYWORD_BUCKETS.setdefault(_kw, []).append(_bucket)
+
+# Zero-width lookahead so overlapping keywords are all seen in one scan.
+# Longest-first: at any position the longest keyword wins; shorter keywords
+# contained in it are recovered through _KEYWORD_IMPLIES below.
+_SIGNAL_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_BUCKETS, key=len, reverse=True)) + "))"
+)
+_KEYWORD_IMPLIES = {
+    k: [o for o in _KEYWORD_BUCKETS if o in k] for k in _KEYWORD_BUCKETS
+}
+_WORD_RE = re.compile(r'\S+')
+_YEAR_RE = re.compile(r'20[0-2][0-9]')
 
-def classify_career_stage(entities, raw_text):
+
+def _scan_signal_buckets(text_lower):
+    """Count distinct keyword hits per signal bucket in a single regex pass."""
+    found = set()
+    for m in _SIGNAL_RE.finditer(text_lower):
+        kw = m.group(1)
+        if kw not in found:
+            found.update(_KEYWORD_IMPLIES[kw])
+    hits = {bucket: 0 for bucket in SIGNAL_BUCKETS}
+    for kw in found:
+        for bucket in _KEYWORD_BUCKETS[kw]:
+            hits[bucket] += 1
+    return hits
+
+
+def classify_career_stage(entities, raw_text, text_lower=None):
     """
     Classifies career stage based on:
     1. Graduation year (recency)
@@ -89,11 +141,11 @@ def classify_career_stage(entities, raw_text):
     4. Language complexity and claim density
     5. Education level
     Returns: stage string, confidence (0–100), and expectation rules.
+    text_lower may pass in raw_text.lower() when the caller already has it.
     """
-    signals = _extract_classification_signals(entities, raw_text)
-    stage, confidence = _reason_stage(signals)
-    expectations = STAGE_EXPECTATIONS[stage]
-    baseline = STAGE_BASELINES[stage]
+    signals = _extract_classification_signals(entities, raw_text, text_lower)
+    stage_idx, confidence = _reason_stage(signals)
+    stage, baseline, expectations = _STAGE_TABLE[stage_idx]
 
     return {
         "stage": stage,
@@ -104,15 +156,17 @@ def classify_career_stage(entities, raw_text):
     }
 
 
-def _extract_classification_signals(entities, raw_text):
+def _extract_classification_signals(entities, raw_text, text_lower=None):
     """Extract measurable signals for stage classification."""
-    text_lower = raw_text.lower()
+    if text_lower is None:
+        text_lower = raw_text.lower()
 
     # 1. Graduation year
-    grad_years = re.findall(r'20[0-2][0-9]', raw_text)
-    grad_years = [int(y) for y in grad_years if int(y) <= CURRENT_YEAR]
-    earliest_year = min(grad_years) if grad_years else None
-    latest_year = max(grad_years) if grad_years else None
+    latest_year = None
+    for m in _YEAR_RE.finditer(raw_text):
+        y = int(m.group())
+        if y <= CURRENT_YEAR and (latest_year is None or y > latest_year):
+            latest_year = y
     years_since_graduation = (CURRENT_YEAR - latest_year) if latest_year else None
 
     # 2. Work duration proxy (from experience list)
@@ -131,70 +185,61 @@ def _extract_classification_signals(entities, raw_text):
             e = int(ey.group(1)) if ey else CURRENT_YEAR
             total_exp_years += max(0, e - s)
 
-    # 3. Title seniority signals in raw text
-    exec_titles = ["ceo", "cto", "coo", "chief", "vp ", "vice president", "president", "founder", "director"]
-    senior_titles = ["senior", "lead", "principal", "staff engineer", "architect", "head of", "engineering manager"]
-    mid_titles = ["engineer", "developer", "analyst", "specialist", "consultant", "associate"]
-    student_signals = ["student", "fresher", "graduate", "intern", "b.tech", "b.e.", "b.sc", "pursuing", "final year", "cgpa", "gpa", "sgpa"]
+    # 3. Title seniority signals + claim intensity — one scan over text_lower
+    bucket_hits = _scan_signal_buckets(text_lower)
 
-    exec_hits = sum(1 for t in exec_titles if t in text_lower)
-    senior_hits = sum(1 for t in senior_titles if t in text_lower)
-    mid_hits = sum(1 for t in mid_titles if t in text_lower)
-    student_hits = sum(1 for t in student_signals if t in text_lower)
-
-    # 4. Language complexity (proxy: avg word length, claim density)
-    words = raw_text.split()
-    avg_word_len = sum(len(w) for w in words) / max(len(words), 1)
-    
-    # Claim intensity words
-    power_claims = ["expert", "specialist", "deep", "advanced", "extensive", "10+ years", "15+ years", "proven track record"]
-    claim_density = sum(1 for c in power_claims if c in text_lower)
+    # 4. Language complexity (proxy: avg word length) — streamed, no word list
+    total_chars = n_words = 0
+    for m in _WORD_RE.finditer(raw_text):
+        total_chars += m.end() - m.start()
+        n_words += 1
+    avg_word_len = total_chars / max(n_words, 1)
 
     return {
         "years_since_graduation": years_since_graduation,
         "total_exp_years": total_exp_years,
         "num_roles": num_roles,
-        "exec_hits": exec_hits,
-        "senior_hits": senior_hits,
-        "mid_hits": mid_hits,
-        "student_hits": student_hits,
+        "exec_hits": bucket_hits["exec"],
+        "senior_hits": bucket_hits["senior"],
+        "mid_hits": bucket_hits["mid"],
+        "student_hits": bucket_hits["student"],
         "avg_word_len": round(avg_word_len, 2),
-        "claim_density": claim_density
+        "claim_density": bucket_hits["claims"]
     }
 
 
 def _reason_stage(s):
     """
     Reason through available signals to determine the most likely career stage.
-    Returns (stage, confidence).
+    Returns (stage code, confidence); the code indexes STAGES.
     """
     ysg = s["years_since_graduation"]
     exp = s["total_exp_years"]
     
     # Executive
     if s["exec_hits"] >= 2 or exp >= 15:
-        return "Executive", 90
+        return STAGE_EXECUTIVE, 90
 
     # Senior
     if s["senior_hits"] >= 2 or exp >= 7:
         conf = 85 if exp >= 7 else 70
-        return "Senior", conf
+        return STAGE_SENIOR, conf
 
     # Mid-Level
     if exp >= 3 or (s["num_roles"] >= 2 and s["mid_hits"] >= 1):
         conf = 80 if exp >= 3 else 65
-        return "Mid-Level", conf
+        return STAGE_MID_LEVEL, conf
 
     # Fresher / Early Professional
     if s["student_hits"] >= 2 or (ysg is not None and ysg <= 1):
-        return "Fresher", 85
+        return STAGE_FRESHER, 85
 
     if ysg is not None and ysg <= 3:
-        return "Early Professional", 80
+        return STAGE_EARLY_PROFESSIONAL, 80
 
     # Academic (still studying)
     if s["student_hits"] >= 1 or (ysg is not None and ysg == 0):
-        return "Academic", 88
+        return STAGE_ACADEMIC, 88
 
     # Default to Early Professional with low confidence
-    return "Early Professional", 55
+    return STAGE_EARLY_PROFESSIONAL, 55
@@ -11,6 +11,10 @@ DOMAIN_KEYWORDS = {
     "Finance": ["investment", "banking", "treasury", "audit", "compliance", "portfolio", "trading", "fintech", "tax"]
 }
 
+# Deterministic short-circuit: confidence and margin over the runner-up domain
+HIGH_CONFIDENCE_THRESHOLD = 0.75
+CLEAR_WINNER_MARGIN = 3
+
 def classify_domain(text):
     """
     Industrial Domain Classification Engine.
@@ -31,6 +35,18 @@ def classify_domain(text):
     top_deterministic = max(keyword_scores, key=keyword_scores.get) if total_keyword_hits > 0 else "General"
     deterministic_confidence = min(0.9, total_keyword_hits / 10) if total_keyword_hits > 0 else 0
 
+    # Fast path: clear keyword winner — skip the multi-model AI fan-out entirely
+    sorted_scores = sorted(keyword_scores.values(), reverse=True)
+    if deterministic_confidence >= HIGH_CONFIDENCE_THRESHOLD and (sorted_scores[0] - sorted_scores[1]) >= CLEAR_WINNER_MARGIN:
+        return {
+            "domain": top_deterministic,
+            "confidence": round(deterministic_confidence, 2),
+            "reasoning": f"Keyword Density: {top_deterministic} ({total_keyword_hits} hits). Clear winner — AI consensus skipped.",
+            "consensus_score": 0,
+            "models_used": ["keyword_density"],
+            "disagreement_points": []
+        }
+
     # Layer 2: AI Consensus Pulse
     try:
         # get_ai_consensus will return unified data and models used
@@ -1,31 +1,89 @@
 import re
+import concurrent.futures
+from itertools import islice
+import llm_cache
 from ai_consensus_engine import get_ai_consensus
 
+# ── Precompiled PII Pattern ─────────────────────────────────────────────
+# One named-group alternation so the text is walked once for all four fields.
+_PII_RE = re.compile(
+    r'(?P<email>[\w\.-]+@[\w\.-]+\.\w+)'
+    r'|(?P<github>github\.com/(?P<github_handle>[\w-]+))'
+    r'|(?P<linkedin>linkedin\.com/in/(?P<linkedin_handle>[\w-]+))'
+    r'|(?P<phone>(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+)
+_PII_FIELDS = ("email", "github", "linkedin", "phone")
+
+BATCH_MAX_WORKERS = 8
+# Signal-bearing head of a resume; the tail is mostly portfolio/boilerplate noise
+TEXT_HEAD_CHARS = 8000
+
+
+def _scan_pii(text):
+    """First match per PII field from a single finditer pass, stopping once all are found."""
+    found = {}
+    for m in _PII_RE.finditer(text):
+        field = m.lastgroup
+        if field not in found:
+            found[field] = m
+            if len(found) == len(_PII_FIELDS):
+                break
+    return found
+
+# Leading non-empty lines that carry the candidate name (after any "RESUME" banner)
+IDENTITY_HEADER_LINES = 3
+
+def _identity_scope(text):
+    """
+    Regex PII plus the top lines (where the name sits).
+    Near-duplicate hits are only shared within this scope, so a resume re-used
+    under another name or contact block never inherits the original's identity.
+    """
+    pii = _scan_pii(text)
+    header = [line.strip().lower() for line in islice(filter(str.strip, text.splitlines()), IDENTITY_HEADER_LINES)]
+    return [pii[f].group(0).lower() if f in pii else "" for f in _PII_FIELDS] + header
+
+@llm_cache.cached(
+    "extraction_consensus",
+    key_fn=lambda text, domain_hint: (domain_hint, text),
+    semantic_fn=lambda text, domain_hint: ((domain_hint, *_identity_scope(text)), text[:4000]),
+    should_cache=lambda consensus: bool(consensus.get("data")),
+)
+def _extraction_consensus(text, domain_hint):
+    """get_ai_consensus for extraction, cached on (domain_hint, text)."""
+    return get_ai_consensus(text, task_type="extraction", domain_hint=domain_hint)
+
+
 def extract_entities(text, domain_info):
     """
     Advanced Deterministic + Multi-AI Extraction.
     Uses regex for PII and AI Consensus for career structure.
     """
+    # Truncate once; PII scan and AI consensus share this view.
+    # The full text is only used by the name heuristic (document headers).
+    text_head = text[:TEXT_HEAD_CHARS]
+
     # 1. Deterministic Extraction (High Precision)
-    email = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-    github = re.search(r'github\.com/([\w-]+)', text)
-    linkedin = re.search(r'linkedin\.com/in/([\w-]+)', text)
-    phone = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    pii = _scan_pii(text_head)
+    email = pii.get("email")
+    github = pii.get("github")
+    linkedin = pii.get("linkedin")
+    phone = pii.get("phone")
     # Use deterministic fallback from extractor.py for name if AI fails
-    from extractor import extract_deterministic
+    from extractor import extract_deterministic, _github_url, _linkedin_url
     fallback_data = extract_deterministic(text)
 
     identity = {
         "email": email.group(0) if email else fallback_data.get("email"),
-        "github": f"https://github.com/{github.group(1)}" if github else fallback_data.get("github"),
-        "linkedin": f"https://linkedin.com/in/{linkedin.group(1)}" if linkedin else fallback_data.get("linkedin"),
+        "github": _github_url(github.group('github_handle')) if github else fallback_data.get("github"),
+        "linkedin": _linkedin_url(linkedin.group('linkedin_handle')) if linkedin else fallback_data.get("linkedin"),
         "phone": phone.group(0) if phone else None,
         "name": fallback_data.get("name") or "Unknown Candidate"
     }
 
     # 2. Multi-AI Consensus Extraction
     try:
-        consensus = get_ai_consensus(text, task_type="extraction", domain_hint=domain_info["domain"])
+        consensus = _extraction_consensus(text_head, domain_info["domain"])
         ai_data = consensus.get("data", {})
         
         # Merge identity (Robust mapping)
@@ -65,3 +123,17 @@ def extract_entities(text, domain_info):
             "certifications": [],
             "extraction_meta": {"error": str(e), "consensus_score": 0}
         }
+
+
+def extract_entities_batch(texts, domain_infos, max_workers=BATCH_MAX_WORKERS):
+    """
+    Runs extract_entities over many resumes concurrently.
+    The work is dominated by LLM network waits, so threads overlap them;
+    429s are already retried with backoff inside safe_groq_call.
+    Results are returned in input order.
+    """
+    pairs = list(zip(texts, domain_infos))
+    if not pairs:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+        return list(executor.map(lambda pair: extract_entities(*pair), pairs))
@@ -1,11 +1,69 @@
 import os
 import re
 import json
+import threading
+from itertools import islice
 from dotenv import load_dotenv
 from google import genai
+import llm_cache
 
 load_dotenv()
 
+# ── Precompiled Patterns ────────────────────────────────────────────────
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+')
+# GitHub URL (handles variants including missing https://)
+_GITHUB_RE = re.compile(r'(?:https?://)?(?:www\.)?github\.com/([a-zA-Z0-9-]+)', re.IGNORECASE)
+# Whole line of 2 to 4 words, Title Case (John Doe) or ALL CAPS (JOHN DOE).
+# [^\S\n] = whitespace other than newline, so each match stays on one line.
+_NAME_CAND_RE = re.compile(
+    r'^[^\S\n]*([A-Z][A-Za-z\.]+(?:[^\S\n][A-Z][A-Za-z\.]+){1,3}|[A-Z]+(?:[^\S\n][A-Z]+){1,3})[^\S\n]*$',
+    re.MULTILINE
+)
+# Section headers that can look like a name line (compared upper-cased)
+_HEADER_BLACKLIST = frozenset({
+    "RESUME", "CURRICULUM VITAE", "CONTACT", "EXPERIENCE", "EDUCATION", 
+    "SUMMARY", "OBJECTIVE", "SKILLS", "PROJECTS", "CERTIFICATIONS", 
+    "LANGUAGES", "INTERESTS", "ACHIEVEMENTS", "PROFILE", "WORK HISTORY",
+    "TECHNICAL SKILLS", "PROFESSIONAL EXPERIENCE", "ADDITIONAL INFORMATION"
+})
+_NONEMPTY_LINE_RE = re.compile(r'^[^\S\n]*\S.*$', re.MULTILINE)
+# Single C-level scans replacing chains of `in` checks on candidate name lines
+_CONTACT_HINT = re.compile(r'[@/]|http|github\.com|linkedin\.com').search
+_EMAIL_OR_URL_HINT = re.compile(r'@|http').search
+
+_NLP = None
+_NLP_LOCK = threading.Lock()
+
+def _ner_model():
+    """Lazily loads spaCy's small English NER pipeline; None if spaCy/model is not installed."""
+    global _NLP
+    if _NLP is None:
+        with _NLP_LOCK:
+            if _NLP is None:
+                try:
+                    import spacy
+                    _NLP = spacy.load("en_core_web_sm", disable=["parser", "tagger", "lemmatizer", "attribute_ruler"])
+                except (ImportError, OSError):
+                    _NLP = False  # optional dependency — keep the rules-only path
+    return _NLP or None
+
+def _github_url(handle):
+    """Canonical GitHub profile URL: trailing punctuation stripped, handle lower-cased."""
+    return f"https://github.com/{handle.rstrip('/.,').lower()}"
+
+def _linkedin_url(slug):
+    """Canonical LinkedIn profile URL, same normalization as _github_url."""
+    return f"https://www.linkedin.com/in/{slug.rstrip('/.,').lower()}"
+
+def _top_lines_end(text, n):
+    """Offset just past the n-th non-empty line of text."""
+    end = 0
+    for i, m in enumerate(_NONEMPTY_LINE_RE.finditer(text), 1):
+        end = m.end()
+        if i == n:
+            break
+    return end
+
 def extract_deterministic(text):
     """Primary layer: Extracts Email, GitHub, and LinkedIn using safe regex patterns."""
     results = {
@@ -17,67 +75,63 @@ def extract_deterministic(text):
     }
 
     # 1. Email Regex (Production Safe)
-    email_pattern = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        results["email"] = emails[0]
+    email_match = _EMAIL_RE.search(text)
+    if email_match:
+        results["email"] = email_match.group(0)
         results["methods"]["email"] = "regex"
 
     # 2. GitHub URL Regex (Handles variants including missing https://)
-    github_pattern = r'(?:https?://)?(?:www\.)?github\.com/([a-zA-Z0-9-]+)'
-    github_match = re.search(github_pattern, text, re.IGNORECASE)
+    github_match = _GITHUB_RE.search(text)
     if github_match:
         # Construct clean URL
-        results["github"] = "https://github.com/" + github_match.group(1).rstrip('/.,')
+        results["github"] = _github_url(github_match.group(1))
         results["methods"]["github"] = "regex"
 
     # 3. LinkedIn URL (Deterministic Engine)
     from linkedin_engine import extract_linkedin
     lh_res = extract_linkedin(text)
     if lh_res["linkedin_url"]:
-        results["linkedin"] = lh_res["linkedin_url"]
+        results["linkedin"] = _linkedin_url(lh_res["linkedin_slug"])
         results["linkedin_slug"] = lh_res["linkedin_slug"]
         results["methods"]["linkedin"] = "regex"
 
     # 4. Heuristic Name Extraction
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    header_blacklist = {
-        "RESUME", "CURRICULUM VITAE", "CONTACT", "EXPERIENCE", "EDUCATION", 
-        "SUMMARY", "OBJECTIVE", "SKILLS", "PROJECTS", "CERTIFICATIONS", 
-        "LANGUAGES", "INTERESTS", "ACHIEVEMENTS", "PROFILE", "WORK HISTORY",
-        "TECHNICAL SKILLS", "PROFESSIONAL EXPERIENCE", "ADDITIONAL INFORMATION"
-    }
-    
     potential_name = None
     
     # PASS 1: The "Title Case" or "All Caps" name pattern in Top 10 lines
-    for line in lines[:10]:
-        clean_upper = line.upper()
+    # One regex scan over the top-10-line span; only the few candidate lines reach Python.
+    # Digits can never match the name pattern, so phone numbers/years are excluded by construction.
+    head = text[:_top_lines_end(text, 10)]
+    for m in _NAME_CAND_RE.finditer(head):
+        line = m.group(1)
         # Skip blacklisted headers
-        if clean_upper in header_blacklist:
+        if line.upper() in _HEADER_BLACKLIST:
             continue
         # Skip lines that look like contact info
-        if "@" in line or "http" in line or "/" in line or "github.com" in line or "linkedin.com" in line:
-            continue
-        # Skip lines with digits (phone numbers/years)
-        if any(char.isdigit() for char in line):
+        if _CONTACT_HINT(line):
             continue
+
+        potential_name = line
+        results["methods"]["name"] = "rules_regex"
+        break
             
-        # Regex: 2 to 4 words, allowing Title Case (John Doe) or ALL CAPS (JOHN DOE)
-        name_regex = r'^[A-Z][A-Za-z\.]+(?:\s[A-Z][A-Za-z\.]+){1,3}$'
-        all_caps_regex = r'^[A-Z]+(?:\s[A-Z]+){1,3}$'
-        
-        if re.match(name_regex, line) or re.match(all_caps_regex, line):
-            potential_name = line
-            results["methods"]["name"] = "rules_regex"
-            break
-            
-    # PASS 2: If Still None, take the VERY FIRST non-garbage line as the name
+    # PASS 2: spaCy NER (PERSON) over the document head — only when PASS 1 missed
+    if not potential_name:
+        nlp = _ner_model()
+        if nlp is not None:
+            for ent in nlp(text[:500]).ents:
+                if ent.label_ == "PERSON":
+                    potential_name = ent.text.strip()
+                    results["methods"]["name"] = "ner"
+                    break
+
+    # PASS 3: If Still None, take the VERY FIRST non-garbage line as the name
     if not potential_name:
-        for line in lines[:5]:
+        # Lazy: only the first 5 non-empty lines are ever materialized
+        for line in islice((m.group().strip() for m in _NONEMPTY_LINE_RE.finditer(text)), 5):
             clean_upper = line.upper()
-            if clean_upper in header_blacklist: continue
-            if "@" in line or "http" in line: continue
+            if clean_upper in _HEADER_BLACKLIST: continue
+            if _EMAIL_OR_URL_HINT(line): continue
             if len(line.split()) > 5: continue # Too long for a name
             
             potential_name = line
@@ -87,6 +141,26 @@ def extract_deterministic(text):
     results["name"] = potential_name
     return results
 
+def _missing_fields(data):
+    # Name is resolved locally (rules + NER); the LLM is not consulted for it
+    return [k for k, v in data.items() if v is None and k not in ("methods", "name")]
+
+def _merge_ai_fields(data, fields, ai_data):
+    for field in fields:
+        if ai_data.get(field):
+            data[field] = ai_data[field]
+            data["methods"][field] = "ai_fallback"
+
+def _finalize(data):
+    # Final cleanup (guarantee dictionary)
+    return {
+        "name": data.get("name") or "",
+        "email": data.get("email") or "",
+        "github": data.get("github") or "",
+        "linkedin": data.get("linkedin") or "",
+        "extraction_method": data.get("methods", {})
+    }
+
 def extract_info_from_text(text):
     """Hybrid Engine: Deterministic first, AI Fallback second."""
     
@@ -94,32 +168,70 @@ def extract_info_from_text(text):
     data = extract_deterministic(text)
     
     # Layer 2: LLM Fallback (only for missing fields)
-    missing_fields = [k for k, v in data.items() if v is None and k != "methods"]
+    missing_fields = _missing_fields(data)
     
     if missing_fields:
-        ai_data = call_gemini_fallback(text, missing_fields)
-        for field in missing_fields:
-            if ai_data.get(field):
-                data[field] = ai_data[field]
-                data["methods"][field] = "ai_fallback"
+        _merge_ai_fields(data, missing_fields, call_gemini_fallback(text, missing_fields))
 
-    # Final cleanup (guarantee dictionary)
-    return {
-        "name": data.get("name") or "",
-        "email": data.get("email") or "",
-        "github": data.get("github") or "",
-        "linkedin": data.get("linkedin") or "",
-        "extraction_method": data.get("methods", {})
-    }
+    return _finalize(data)
+
+def extract_info_from_text_batch(texts):
+    """
+    Batch variant of extract_info_from_text for many resumes.
+    Documents missing the same field set share batched Gemini calls
+    (GEMINI_BATCH_SIZE resumes per prompt); per-document cache entries are
+    shared with call_gemini_fallback.
+    """
+    datas = [extract_deterministic(text) for text in texts]
 
+    # Bucket by missing-field signature so each prompt asks for one field set
+    buckets = {}
+    for i, data in enumerate(datas):
+        missing_fields = _missing_fields(data)
+        if missing_fields:
+            buckets.setdefault(tuple(missing_fields), []).append(i)
+
+    for fields, indices in buckets.items():
+        pending = []
+        for i in indices:
+            key = llm_cache.make_key("gemini_fallback", sorted(fields), texts[i][:4000])
+            hit = llm_cache.get(key)
+            if hit is not None:
+                _merge_ai_fields(datas[i], fields, json.loads(hit))
+            else:
+                pending.append((i, key))
+
+        ai_results = call_gemini_fallback_batch([texts[i] for i, _ in pending], list(fields))
+        for (i, key), ai_data in zip(pending, ai_results):
+            if ai_data:
+                llm_cache.put(key, json.dumps(ai_data, ensure_ascii=False))
+            _merge_ai_fields(datas[i], fields, ai_data)
+
+    return [_finalize(data) for data in datas]
+
+_GENAI_CLIENT = None
+_GENAI_LOCK = threading.Lock()
+GEMINI_BATCH_SIZE = 10  # resumes packed into one batched fallback prompt
+
+def _client():
+    """Lazily builds one shared genai.Client (None when no API key is configured)."""
+    global _GENAI_CLIENT
+    if _GENAI_CLIENT is None:
+        with _GENAI_LOCK:
+            if _GENAI_CLIENT is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if api_key:
+                    _GENAI_CLIENT = genai.Client(api_key=api_key)
+    return _GENAI_CLIENT
+
+@llm_cache.cached("gemini_fallback", key_fn=lambda text, fields: (sorted(fields), text[:4000]))
 def call_gemini_fallback(text, fields):
     """Fallback layer using Gemini 1.5 Flash."""
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        client = _client()
+        if client is None:
             return {}
 
-        client = genai.Client(api_key=api_key)
         field_list = ", ".join(fields)
         
         prompt = f"""
@@ -141,4 +253,43 @@ def call_gemini_fallback(text, fields):
         return json.loads(raw_text)
     except Exception as e:
         print(f"AI Fallback Error: {e}")
-        return {}
\ No newline at end of file
+        return {}
+
+def call_gemini_fallback_batch(texts, fields):
+    """
+    Batched fallback: one Gemini call extracts `fields` for up to
+    GEMINI_BATCH_SIZE resumes. Returns a list of dicts aligned with texts
+    ({} for any resume the model did not answer).
+    """
+    results = [{} for _ in texts]
+    client = _client()
+    if client is None:
+        return results
+
+    field_list = ", ".join(fields)
+    for start in range(0, len(texts), GEMINI_BATCH_SIZE):
+        chunk = texts[start:start + GEMINI_BATCH_SIZE]
+        resumes = "\n".join(f"[Resume id={i}]\n{text[:4000]}\n" for i, text in enumerate(chunk))
+        prompt = f"""
+        Extract the following MISSING fields from EACH resume below: {field_list}
+        Return ONLY a valid JSON array with one object per resume, keyed by its id.
+        Format:
+        [
+            {{"id": 0, {", ".join([f'"{f}": ""' for f in fields])}}}
+        ]
+        {resumes}
+        """
+        try:
+            response = client.models.generate_content(
+                model="gemini-1.5-flash",
+                contents=prompt,
+            )
+            raw_text = response.text.strip().replace("```json", "").replace("```", "").strip()
+            parsed = json.loads(raw_text)
+            for item in parsed if isinstance(parsed, list) else []:
+                idx = item.get("id") if isinstance(item, dict) else None
+                if isinstance(idx, int) and 0 <= idx < len(chunk):
+                    results[start + idx] = {f: item.get(f, "") for f in fields}
+        except Exception as e:
+            print(f"AI Batch Fallback Error: {e}")
+    return results
@@ -1,5 +1,5 @@
 import sqlite3
-import json
+import orjson
 import os
 import logging
 
@@ -7,27 +7,83 @@ logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("FixDB")
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "candidates.db")
+UPDATE_SQL = "UPDATE candidates SET forensic_json = ? WHERE id = ?"
+FLUSH_EVERY = 1000  # bounds the pending-update buffer while streaming rows
 
-def fix_unknowns():
-    if not os.path.exists(DB_PATH):
-        log.error(f"Database not found at {DB_PATH}")
-        return
+# ── Single-statement JSON1 fix ─────────────────────────────────────────
+_FJ = "COALESCE(forensic_json, '{}')"
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+def _jx(path):
+    return f"json_extract({_FJ}, '{path}')"
+
+def _unknown_sql(path):
+    return f"({_jx(path)} IS NULL OR {_jx(path)} IN ('Unknown', ''))"
+
+def _keep_or(path, new_value):
+    """Existing value at path, or new_value when it is Unknown/missing."""
+    return f"CASE WHEN {_unknown_sql(path)} THEN {new_value} ELSE {_jx(path)} END"
+
+_DM = "$.ai_analysis.digital_maturity.rating"
+_IC = "$.ai_analysis.internal_coherence.rating"
+_SS = "$.ai_analysis.summary_snapshot"
+_SS_RISK = _SS + ".overall_risk_level"
+_SS_CERT = _SS + ".capability_certainty"
+_SS_DEPTH = _SS + ".digital_depth_rating"
+
+_TRUST = f"COALESCE({_jx('$.scores.reliability')}, 50.0)"
+_FRAUD = f"COALESCE({_jx('$.scores.fraud_score')}, 50.0)"
+
+_DM_NEW = f"CASE WHEN {_TRUST} > 65 THEN 'Adequate' WHEN {_TRUST} < 40 THEN 'Weak' ELSE 'Moderate' END"
+_IC_NEW = f"CASE WHEN {_TRUST} > 75 THEN 'High Coherence' WHEN {_TRUST} < 30 THEN 'Low Coherence' ELSE 'Moderate Coherence' END"
+_RISK_NEW = f"CASE WHEN {_FRAUD} < 25 THEN 'Low' WHEN {_FRAUD} < 55 THEN 'Moderate' ELSE 'High' END"
+_CERT_NEW = f"CASE WHEN {_TRUST} > 50 THEN 'Moderate' ELSE 'Low' END"
+
+_DM_FINAL = _keep_or(_DM, _DM_NEW)
+_SS_PRESENT = f"(json_type({_FJ}, '{_SS}') = 'object' AND {_jx(_SS)} <> '{{}}')"
+
+_BASE = f"json_set({_FJ}, '{_DM}', {_DM_FINAL}, '{_IC}', {_keep_or(_IC, _IC_NEW)})"
+_WITH_SS = (
+    f"json_set({_BASE}, '{_SS_RISK}', {_keep_or(_SS_RISK, _RISK_NEW)}, "
+    f"'{_SS_CERT}', {_keep_or(_SS_CERT, _CERT_NEW)}, "
+    f"'{_SS_DEPTH}', {_keep_or(_SS_DEPTH, _DM_FINAL)})"
+)
+
+FIX_UNKNOWNS_SQL = f"""
+    UPDATE candidates
+    SET forensic_json = CASE WHEN {_SS_PRESENT} THEN {_WITH_SS} ELSE {_BASE} END
+    WHERE json_valid({_FJ}) AND (
+        {_unknown_sql(_DM)} OR {_unknown_sql(_IC)} OR (
+            {_SS_PRESENT} AND ({_unknown_sql(_SS_RISK)} OR {_unknown_sql(_SS_CERT)} OR {_unknown_sql(_SS_DEPTH)})
+        )
+    )
+"""
+
+def _is_unknown(value):
+    return not value or value == "Unknown"
+
+def _fix_unknowns_sql(conn):
+    """Whole fix as one UPDATE using SQLite's JSON1 functions — no Python-side JSON work."""
+    with conn:
+        cur = conn.execute(FIX_UNKNOWNS_SQL)
+    return cur.rowcount
+
+def _fix_unknowns_rowwise(conn):
+    """Row-by-row fallback for SQLite builds without JSON1."""
     c = conn.cursor()
 
     c.execute("SELECT id, name, forensic_json FROM candidates")
-    rows = c.fetchall()
+    # Separate cursor for writes so the streaming read cursor is not reset
+    writer = conn.cursor()
     
+    updates = []
     updated_count = 0
     
-    for row in rows:
+    for row in c:
         candidate_id = row['id']
         name = row['name']
         try:
-            payload = json.loads(row['forensic_json'] or "{}")
-        except Exception as e:
+            payload = orjson.loads(row['forensic_json'] or "{}")
+        except orjson.JSONDecodeError as e:
             log.warning(f"Could not parse JSON for candidate {candidate_id}: {e}")
             continue
 
@@ -37,51 +93,70 @@ def fix_unknowns():
         scores = payload.get("scores", {})
         trust_score = scores.get("reliability", 50.0)
         
+        # Resolve nested sections once; mutate the locals below
+        aia = payload.setdefault("ai_analysis", {})
+        dm = aia.setdefault("digital_maturity", {})
+        ic = aia.setdefault("internal_coherence", {})
+        ss = aia.get("summary_snapshot")
+
         # 1. Digital Maturity
-        dm = payload.get("ai_analysis", {}).get("digital_maturity", {})
-        if dm.get("rating") == "Unknown" or not dm.get("rating"):
+        if _is_unknown(dm.get("rating")):
             new_rating = "Adequate" if trust_score > 65 else ("Weak" if trust_score < 40 else "Moderate")
-            if "ai_analysis" not in payload: payload["ai_analysis"] = {}
-            if "digital_maturity" not in payload["ai_analysis"]: payload["ai_analysis"]["digital_maturity"] = {}
-            payload["ai_analysis"]["digital_maturity"]["rating"] = new_rating
+            dm["rating"] = new_rating
             changed = True
             log.info(f"Fixed digital_maturity for {name} -> {new_rating}")
 
         # 2. Internal Coherence
-        ic = payload.get("ai_analysis", {}).get("internal_coherence", {})
-        if ic.get("rating") == "Unknown" or not ic.get("rating"):
+        if _is_unknown(ic.get("rating")):
             new_rating = "High Coherence" if trust_score > 75 else ("Low Coherence" if trust_score < 30 else "Moderate Coherence")
-            if "ai_analysis" not in payload: payload["ai_analysis"] = {}
-            if "internal_coherence" not in payload["ai_analysis"]: payload["ai_analysis"]["internal_coherence"] = {}
-            payload["ai_analysis"]["internal_coherence"]["rating"] = new_rating
+            ic["rating"] = new_rating
             changed = True
             log.info(f"Fixed internal_coherence for {name} -> {new_rating}")
 
         # 3. Summary Snapshot
-        ss = payload.get("ai_analysis", {}).get("summary_snapshot", {})
         if ss:
-            if ss.get("overall_risk_level") == "Unknown" or not ss.get("overall_risk_level"):
+            if _is_unknown(ss.get("overall_risk_level")):
                 fraud_score = scores.get("fraud_score", 50.0)
-                new_risk = "Low" if fraud_score < 25 else ("Moderate" if fraud_score < 55 else "High")
-                payload["ai_analysis"]["summary_snapshot"]["overall_risk_level"] = new_risk
+                ss["overall_risk_level"] = "Low" if fraud_score < 25 else ("Moderate" if fraud_score < 55 else "High")
                 changed = True
             
-            if ss.get("capability_certainty") == "Unknown" or not ss.get("capability_certainty"):
-                new_cert = "Moderate" if trust_score > 50 else "Low"
-                payload["ai_analysis"]["summary_snapshot"]["capability_certainty"] = new_cert
+            if _is_unknown(ss.get("capability_certainty")):
+                ss["capability_certainty"] = "Moderate" if trust_score > 50 else "Low"
                 changed = True
 
-            if ss.get("digital_depth_rating") == "Unknown" or not ss.get("digital_depth_rating"):
-                dm_rating = payload["ai_analysis"]["digital_maturity"]["rating"]
-                payload["ai_analysis"]["summary_snapshot"]["digital_depth_rating"] = dm_rating
+            if _is_unknown(ss.get("digital_depth_rating")):
+                ss["digital_depth_rating"] = dm["rating"]
                 changed = True
 
         if changed:
-            serialized = json.dumps(payload, ensure_ascii=False)
-            c.execute("UPDATE candidates SET forensic_json = ? WHERE id = ?", (serialized, candidate_id))
-            updated_count += 1
+            # Decode to str: bytes would bind as a BLOB, which JSON1 (and JSONB-aware SQLite) rejects
+            serialized = orjson.dumps(payload).decode("utf-8")
+            updates.append((serialized, candidate_id))
+            if len(updates) >= FLUSH_EVERY:
+                writer.executemany(UPDATE_SQL, updates)
+                updated_count += len(updates)
+                updates.clear()
+
+    # Flush the remainder; all batches commit as one transaction
+    with conn:
+        writer.executemany(UPDATE_SQL, updates)
+    updated_count += len(updates)
+    return updated_count
 
-    conn.commit()
+def fix_unknowns():
+    if not os.path.exists(DB_PATH):
+        log.error(f"Database not found at {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        updated_count = _fix_unknowns_sql(conn)
+    except sqlite3.OperationalError as e:
+        log.warning(f"JSON1 update unavailable ({e}); falling back to row-by-row fix.")
+        updated_count = _fix_unknowns_rowwise(conn)
     conn.close()
     log.info(f"Successfully updated {updated_count} records.")
 
@@ -3,26 +3,85 @@ forensic_engine.py — The Honest Recruiter Forensic Report Generator
 Every number is deterministic. No fake percentages. No placeholder metrics.
 """
 import re
+import sys
 import hashlib
-import json
+import concurrent.futures
+from bisect import bisect_right
+import orjson
+import numpy as np
+from functools import lru_cache
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+_NON_ALPHA = re.compile(r'[^a-z]')
+
+# ── Fuzzy Name Scorer (selected once at import) ────────────────────────
+# _fuzzy_ratio expects both arguments already lower-cased.
+try:
+    from rapidfuzz.fuzz import token_sort_ratio as _token_sort_ratio
+    from rapidfuzz.process import cdist as _cdist
+
+    def _fuzzy_ratio(a, b):
+        return _token_sort_ratio(a, b)
+
+    MATCHING_ENGINE = "rapidfuzz"
+except ImportError:
+    from difflib import SequenceMatcher
+
+    def _fuzzy_ratio(a, b):
+        return round(SequenceMatcher(
+            None,
+            _NON_ALPHA.sub('', a),
+            _NON_ALPHA.sub('', b)
+        ).ratio() * 100)
+
+    _cdist = None
+    MATCHING_ENGINE = "difflib"
+
+
 # ── High-Trust / Disposable Email Domain Lists ─────────────────────────
-HIGH_TRUST_DOMAINS = ["edu", "ac.in", "ac.uk", "gov", "mil", "ac.jp"]
-CORPORATE_SIGNALS  = ["company", "corp", "inc", "technologies", "labs", "works"]
-DISPOSABLE_DOMAINS = ["tempmail", "mailinator", "10minutemail", "guerrillamail",
-                      "throwam", "dispostable", "fakeinbox", "yopmail", "trashmail"]
-GENERIC_DOMAINS    = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com",
-                      "icloud.com", "proton.me", "rediffmail.com"]
+HIGH_TRUST_DOMAINS = frozenset({"edu", "ac.in", "ac.uk", "gov", "mil", "ac.jp"})
+CORPORATE_SIGNALS  = frozenset({"company", "corp", "inc", "technologies", "labs", "works"})
+DISPOSABLE_DOMAINS = frozenset({"tempmail", "mailinator", "10minutemail", "guerrillamail",
+                                "throwam", "dispostable", "fakeinbox", "yopmail", "trashmail"})
+GENERIC_DOMAINS    = frozenset({"gmail.com", "yahoo.com", "outlook.com", "hotmail.com",
+                                "icloud.com", "proton.me", "rediffmail.com"})
+GENERIC_PROVIDER_TLDS = frozenset({"gmail", "yahoo", "outlook"})
+
+# Suffix tuples for str.endswith: TLD / last-two-label checks without splitting
+_HIGH_TRUST_SUFFIXES = tuple("." + d for d in sorted(HIGH_TRUST_DOMAINS))
+_GENERIC_PROVIDER_SUFFIXES = tuple("." + t for t in sorted(GENERIC_PROVIDER_TLDS))
+
+# Trust scores are pure functions of a few scalars; re-renders and retries
+# of the same candidate hit these caches instead of recomputing.
+TRUST_CACHE_SIZE = 4096
+# Candidates handed to each worker process at a time in batch scans
+BATCH_CHUNKSIZE = 16
+
+# ── Stage / Correspondence Groups ──────────────────────────────────────
+SENIOR_STAGES = frozenset({"Senior", "Executive"})
+EARLY_STAGES  = frozenset({"Fresher", "Academic"})
+WEAK_CORRESPONDENCE = frozenset({"Weak", "No Match"})
+INSTITUTIONAL_REPUTATIONS = frozenset({"University / Academic", "Corporate Domain"})
+
+# Substring lists compiled to one alternation each: a single scan of the
+# domain instead of one `in` check per entry.
+def _substring_matcher(words):
+    return re.compile("|".join(map(re.escape, sorted(words)))).search
+
+_has_disposable_signal = _substring_matcher(DISPOSABLE_DOMAINS)
+_has_corporate_signal  = _substring_matcher(CORPORATE_SIGNALS)
 
 
 # ══════════════════════════════════════════════════════════════════════
 # 1. GITHUB TRUST SCORE  (activity-based, not existence-based)
 # ══════════════════════════════════════════════════════════════════════
 
-def compute_github_trust(github_data):
+def compute_github_trust(github_data, this_year=None):
     """
     Deterministic GitHub trust computation.
+    this_year defaults to the current local year; callers scoring several
+    things in one pass can read the clock once and pass it in.
     """
     if not github_data or not github_data.get("exists"):
         return 20, "No Activity", {
@@ -34,12 +93,23 @@ def compute_github_trust(github_data):
             "reason": "No GitHub profile found or linked."
         }
 
+    if this_year is None:
+        this_year = datetime.now().year
     metrics = github_data.get("metrics", {})
     repo_count       = metrics.get("repo_count", 0) or 0
     last_commit_days = metrics.get("last_commit_days_ago", 9999) or 9999
-    created_year     = metrics.get("account_created_year", datetime.now().year)
+    created_year     = metrics.get("account_created_year", this_year)
     top_lang         = metrics.get("top_language", "Unknown") or "Unknown"
-    account_age_yrs  = datetime.now().year - (created_year or datetime.now().year)
+
+    score, level, meta = _github_trust_cached(
+        repo_count, last_commit_days, created_year, top_lang, this_year
+    )
+    return score, level, dict(meta)
+
+
+@lru_cache(maxsize=TRUST_CACHE_SIZE)
+def _github_trust_cached(repo_count, last_commit_days, created_year, top_lang, this_year):
+    account_age_yrs = this_year - (created_year or this_year)
 
     # Base score from repo count and commit recency
     if repo_count > 10 and last_commit_days < 30:
@@ -84,12 +154,23 @@ def compute_email_trust(email, email_trust_data):
             "ipqs_fraud_score": 0
         }
 
-    domain = email.split("@")[-1].lower() if "@" in email else ""
-    tld    = domain.split(".")[-1] if "." in domain else ""
-    ext    = ".".join(domain.split(".")[-2:]) if domain.count(".") >= 1 else domain
+    ipqs = email_trust_data.get("ipqs", {}) if email_trust_data else {}
+    hunter = email_trust_data.get("hunter", {}) if email_trust_data else {}
+    score, reputation, meta = _email_trust_cached(
+        email,
+        ipqs.get("status") == "success", ipqs.get("fraud_score", 0) or 0,
+        hunter.get("status") == "success", hunter.get("score", 50) or 50
+    )
+    return score, reputation, dict(meta)
+
+
+@lru_cache(maxsize=TRUST_CACHE_SIZE)
+def _email_trust_cached(email, ipqs_ok, ipqs_fraud, hunter_ok, hunter_score):
+    _, at, domain = email.rpartition("@")
+    domain = sys.intern(domain.casefold()) if at else ""
 
     # Disposable check
-    is_disposable = any(d in domain for d in DISPOSABLE_DOMAINS)
+    is_disposable = _has_disposable_signal(domain) is not None
     if is_disposable:
         return 10, "Disposable", {
             "email": email,
@@ -101,10 +182,10 @@ def compute_email_trust(email, email_trust_data):
         }
 
     # Domain reputation tier
-    if tld in HIGH_TRUST_DOMAINS or ext in HIGH_TRUST_DOMAINS:
+    if domain.endswith(_HIGH_TRUST_SUFFIXES) or domain in HIGH_TRUST_DOMAINS:
         base_score, reputation = 85, "University / Academic"
-    elif any(sig in domain for sig in CORPORATE_SIGNALS) or (
-        domain not in GENERIC_DOMAINS and tld not in ["gmail", "yahoo", "outlook"] and len(domain) > 5
+    elif _has_corporate_signal(domain) or (
+        domain not in GENERIC_DOMAINS and not domain.endswith(_GENERIC_PROVIDER_SUFFIXES) and len(domain) > 5
     ):
         base_score, reputation = 90, "Corporate Domain"
     elif domain in GENERIC_DOMAINS:
@@ -113,15 +194,11 @@ def compute_email_trust(email, email_trust_data):
         base_score, reputation = 60, "Unknown Domain"
 
     # IPQS fraud score adjustment
-    ipqs = email_trust_data.get("ipqs", {}) if email_trust_data else {}
-    ipqs_fraud = ipqs.get("fraud_score", 0) or 0
-    if ipqs.get("status") == "success":
+    if ipqs_ok:
         base_score = max(0, base_score - (ipqs_fraud * 0.3))
 
     # Hunter score bonus
-    hunter = email_trust_data.get("hunter", {}) if email_trust_data else {}
-    hunter_score = hunter.get("score", 50) or 50
-    if hunter.get("status") == "success":
+    if hunter_ok:
         base_score = min(100, base_score * 0.7 + hunter_score * 0.3)
 
     final_score = round(base_score)
@@ -140,52 +217,70 @@ def compute_email_trust(email, email_trust_data):
 # 3. IDENTITY MATCH SCORE  (fuzzy name correspondence)
 # ══════════════════════════════════════════════════════════════════════
 
+# Score cut-offs (ascending) -> level; index = bisect_right(cuts, score)
+_CORRESPONDENCE_CUTS   = (40, 70, 90)
+_CORRESPONDENCE_LEVELS = ("No Match", "Weak", "Moderate", "Strong")
+
+NEUTRAL_IDENTITY_SCORE = 60
+NEUTRAL_CORRESPONDENCE = _CORRESPONDENCE_LEVELS[bisect_right(_CORRESPONDENCE_CUTS, NEUTRAL_IDENTITY_SCORE)]
+
+
+def _reference_handle(github_url):
+    """GitHub URL -> space-separated handle comparable with a resume name."""
+    return github_url.rstrip("/").split("/")[-1].replace("-", " ").replace("_", " ")
+
+
+@lru_cache(maxsize=TRUST_CACHE_SIZE)
+def _fuzzy_ratio_cached(resume_name, handle):
+    return _fuzzy_ratio(resume_name, handle)
+
+
 def compute_identity_match(entities, verification_data, github_data_raw):
     """
     Fuzzy name matching between resume name and GitHub/LinkedIn profile.
     Returns: score 0–100, correspondence level, metadata.
     """
-    resume_name = entities.get("identity", {}).get("name", "") or ""
-
-    # Try to get GitHub username as comparison point
     candidate_id = entities.get("identity", {})
+    resume_name = candidate_id.get("name", "") or ""
     github_handle = candidate_id.get("github", "")
-    if github_handle:
-        github_handle = github_handle.rstrip("/").split("/")[-1].replace("-", " ").replace("_", " ")
 
     # Also get identity match from verification layer
     id_verif = verification_data.get("identity_verification", {}) if verification_data else {}
     existing_match = id_verif.get("identity_match_score", 0)
 
-    # Fuzzy ratio using SequenceMatcher (rapidfuzz optional)
+    # Fast path: nothing to compare against — neutral default, no string work
+    if not github_handle and existing_match <= 0:
+        return NEUTRAL_IDENTITY_SCORE, NEUTRAL_CORRESPONDENCE, {
+            "resume_name": resume_name,
+            "reference_handle": "(none)",
+            "fuzzy_match_score": NEUTRAL_IDENTITY_SCORE,
+            "correspondence_level": NEUTRAL_CORRESPONDENCE,
+            "matching_engine": "neutral_default"
+        }
+
+    # Try to get GitHub username as comparison point
+    if github_handle:
+        github_handle = _reference_handle(github_handle)
+
+    # Fuzzy ratio (rapidfuzz token_sort_ratio, difflib when not installed)
     fuzzy_score = 0
     source_used = "none"
     if resume_name and github_handle:
-        try:
-            from rapidfuzz import fuzz
-            fuzzy_score = fuzz.token_sort_ratio(resume_name.lower(), github_handle.lower())
-            source_used = "rapidfuzz"
-        except ImportError:
-            from difflib import SequenceMatcher
-            fuzzy_score = round(SequenceMatcher(
-                None,
-                re.sub(r'[^a-z]', '', resume_name.lower()),
-                re.sub(r'[^a-z]', '', github_handle.lower())
-            ).ratio() * 100)
-            source_used = "difflib"
+        rn, gh = resume_name.lower(), github_handle.lower()
+        if rn == gh:
+            fuzzy_score = 100  # identical after lower-casing — skip the matcher
+            source_used = "exact"
+        else:
+            fuzzy_score = _fuzzy_ratio_cached(rn, gh)
+            source_used = MATCHING_ENGINE
     elif existing_match > 0:
         fuzzy_score = existing_match
         source_used = "identity_engine"
     else:
-        fuzzy_score = 60  # No reference to compare — neutral
+        fuzzy_score = NEUTRAL_IDENTITY_SCORE  # No reference to compare — neutral
         source_used = "neutral_default"
 
-    correspondence = (
-        "Strong"   if fuzzy_score >= 90 else
-        "Moderate" if fuzzy_score >= 70 else
-        "Weak"     if fuzzy_score >= 40 else
-        "No Match"
-    )
+    correspondence = _CORRESPONDENCE_LEVELS[bisect_right(_CORRESPONDENCE_CUTS, fuzzy_score)]
 
     return fuzzy_score, correspondence, {
         "resume_name": resume_name,
@@ -196,6 +291,24 @@ def compute_identity_match(entities, verification_data, github_data_raw):
     }
 
 
+def compute_identity_match_batch(resume_names, handles):
+    """
+    Fuzzy scores for every resume name against every handle in one call.
+    Returns a uint8 matrix of shape (len(resume_names), len(handles)), 0–100.
+    Handles are normalized GitHub handles (see _reference_handle).
+    """
+    if _cdist is not None:
+        return _cdist(resume_names, handles, scorer=_token_sort_ratio,
+                      processor=str.lower, dtype=np.uint8, workers=-1)
+    scores = np.zeros((len(resume_names), len(handles)), dtype=np.uint8)
+    lowered = [handle.lower() for handle in handles]
+    for i, name in enumerate(resume_names):
+        name = name.lower()
+        for j, handle in enumerate(lowered):
+            scores[i, j] = _fuzzy_ratio(name, handle)
+    return scores
+
+
 # ══════════════════════════════════════════════════════════════════════
 # 4. SHADOW SCORE  (weighted reliability index)
 # ══════════════════════════════════════════════════════════════════════
@@ -213,73 +326,115 @@ def calculate_shadow_score(github_score, email_score, identity_score):
     return round(weighted, 1)
 
 
+def calculate_shadow_score_batch(github_scores, email_scores, identity_scores):
+    """
+    calculate_shadow_score over whole arrays of candidates in one vectorized pass.
+    Same weights and evaluation order as the scalar version, so results match it.
+    """
+    gh  = np.asarray(github_scores, dtype=np.float64)
+    em  = np.asarray(email_scores, dtype=np.float64)
+    idn = np.asarray(identity_scores, dtype=np.float64)
+    return np.round(gh * 0.40 + em * 0.20 + idn * 0.40, 1)
+
+
 # ══════════════════════════════════════════════════════════════════════
 # 5. ANOMALY DETECTION  (each flag is deterministic)
 # ══════════════════════════════════════════════════════════════════════
 
-def detect_anomalies(entities, github_meta, email_meta, identity_meta,
-                     career_stage_data, intelligence_data):
+@dataclass(frozen=True, slots=True)
+class _Facts:
+    """Every per-candidate field the anomaly rules and narrative read."""
+    stage: str
+    total_exp: float
+    gh_exists: bool
+    gh_created: int
+    repo_count: int
+    is_disposable: bool
+    ipqs_fraud: float
+    domain_reputation: str
+    correspondence: str
+    resume_name: str
+    reference_handle: str
+    fuzzy_match_score: float
+    inflation_index: float
+    proportionality_verdict: str
+    ai_language_detected: bool
+    hiring_risk_level: str
+    coherence_verdict: str
+
+
+def build_facts(github_meta, email_meta, identity_meta, career_stage_data, intelligence_data):
+    """One pass over the scoring metadata; feeds detect_anomalies and generate_honest_narrative."""
+    if career_stage_data:
+        stage = career_stage_data.get("stage", "Unknown")
+        total_exp = career_stage_data.get("signals_used", {}).get("total_exp_years", 0)
+    else:
+        stage, total_exp = "Unknown", 0
+    if intelligence_data:
+        prop = intelligence_data.get("proportionality", {})
+        hiring_risk = intelligence_data.get("risk", {}).get("hiring_risk_level", "Moderate")
+        coherence = intelligence_data.get("consistency", {}).get("verdict", "Unknown")
+    else:
+        prop, hiring_risk, coherence = {}, "Moderate", "Unknown"
+    return _Facts(
+        stage=stage,
+        total_exp=total_exp,
+        gh_exists=github_meta.get("exists", False),
+        gh_created=github_meta.get("account_created_year"),
+        repo_count=github_meta.get("repo_count", 0),
+        is_disposable=email_meta.get("is_disposable"),
+        ipqs_fraud=email_meta.get("ipqs_fraud_score", 0),
+        domain_reputation=email_meta.get("domain_reputation", "Unknown"),
+        correspondence=identity_meta.get("correspondence_level"),
+        resume_name=identity_meta.get("resume_name"),
+        reference_handle=identity_meta.get("reference_handle"),
+        fuzzy_match_score=identity_meta.get("fuzzy_match_score"),
+        inflation_index=prop.get("inflation_index", 0),
+        proportionality_verdict=prop.get("proportionality_verdict", "Inflated"),
+        ai_language_detected=prop.get("ai_language_detected"),
+        hiring_risk_level=hiring_risk,
+        coherence_verdict=coherence,
+    )
+
+
+def detect_anomalies(facts, this_year=None):
     """
     Anomaly flags are deterministic. anomaly_probability = min(flags * 15, 100).
+    facts comes from build_facts. Flags are (code, *args) tuples;
+    render_anomaly_flags turns them into text.
     """
     flags = []
+    f = facts
 
     # A1: Experience age vs GitHub account age
-    stage = career_stage_data.get("stage", "Unknown") if career_stage_data else "Unknown"
-    signals = career_stage_data.get("signals_used", {}) if career_stage_data else {}
-    total_exp = signals.get("total_exp_years", 0)
-    gh_created = github_meta.get("account_created_year")
-    gh_exists  = github_meta.get("exists", False)
-
-    if gh_exists and gh_created and total_exp > 5:
-        acct_age = datetime.now().year - gh_created
-        if acct_age < (total_exp / 2):
-            flags.append(
-                f"Experience-Age Mismatch: Resume implies ~{total_exp}yr tenure "
-                f"but GitHub account is only {acct_age}yr old."
-            )
+    if f.gh_exists and f.gh_created and f.total_exp > 5:
+        acct_age = (this_year or datetime.now().year) - f.gh_created
+        if acct_age < (f.total_exp / 2):
+            flags.append(("experience_age_mismatch", f.total_exp, acct_age))
 
     # A2: Disposable email
-    if email_meta.get("is_disposable"):
-        flags.append("Disposable Email: Address linked to a known throwaway domain.")
+    if f.is_disposable:
+        flags.append(("disposable_email",))
 
     # A3: Senior title, no digital presence
-    if stage in ("Senior", "Executive") and not gh_exists:
-        flags.append(
-            f"{stage}-level candidate with no detectable GitHub presence — "
-            "notable absence at this stage."
-        )
+    if not f.gh_exists and f.stage in SENIOR_STAGES:
+        flags.append(("senior_no_github", f.stage))
 
     # A4: Weak identity correspondence
-    if identity_meta.get("correspondence_level") in ("Weak", "No Match") and \
-       identity_meta.get("resume_name") and identity_meta.get("reference_handle") != "(none)":
-        flags.append(
-            f"Identity Correspondence Weak: Resume name vs handle match score "
-            f"{identity_meta['fuzzy_match_score']}%."
-        )
+    if f.correspondence in WEAK_CORRESPONDENCE and f.resume_name and f.reference_handle != "(none)":
+        flags.append(("weak_identity", f.fuzzy_match_score))
 
     # A5: Inflation signals from hiring intelligence engine
-    prop = intelligence_data.get("proportionality", {}) if intelligence_data else {}
-    inf_idx = prop.get("inflation_index", 0)
-    if inf_idx >= 45:
-        flags.append(
-            f"Claim Inflation Detected (index: {inf_idx}/100): "
-            f"{prop.get('proportionality_verdict', 'Inflated')} claim-to-evidence ratio."
-        )
+    if f.inflation_index >= 45:
+        flags.append(("claim_inflation", f.inflation_index, f.proportionality_verdict))
 
     # A6: AI-generated language
-    if prop.get("ai_language_detected"):
-        flags.append(
-            "Template/AI-Generated Language: Resume narrative shows high density "
-            "of standardized phrasing patterns."
-        )
+    if f.ai_language_detected:
+        flags.append(("ai_language",))
 
     # A7: IPQS email fraud
-    if email_meta.get("ipqs_fraud_score", 0) > 70:
-        flags.append(
-            f"Email Fraud Signal: IPQS risk score {email_meta['ipqs_fraud_score']}/100 "
-            "for this address."
-        )
+    if f.ipqs_fraud > 70:
+        flags.append(("email_fraud_signal", f.ipqs_fraud))
 
     anomaly_probability = min(len(flags) * 15, 100)
 
@@ -290,46 +445,66 @@ def detect_anomalies(entities, github_meta, email_meta, identity_meta,
     }
 
 
+# Message templates keyed by flag code; positional fields are the tuple's args
+ANOMALY_MESSAGES = {
+    "experience_age_mismatch": "Experience-Age Mismatch: Resume implies ~{0}yr tenure "
+                               "but GitHub account is only {1}yr old.",
+    "disposable_email":        "Disposable Email: Address linked to a known throwaway domain.",
+    "senior_no_github":        "{0}-level candidate with no detectable GitHub presence — "
+                               "notable absence at this stage.",
+    "weak_identity":           "Identity Correspondence Weak: Resume name vs handle match score {0}%.",
+    "claim_inflation":         "Claim Inflation Detected (index: {0}/100): {1} claim-to-evidence ratio.",
+    "ai_language":             "Template/AI-Generated Language: Resume narrative shows high density "
+                               "of standardized phrasing patterns.",
+    "email_fraud_signal":      "Email Fraud Signal: IPQS risk score {0}/100 for this address.",
+}
+
+
+def render_anomaly_flags(flags):
+    """Human-readable messages for detect_anomalies flags; call at the serialization boundary."""
+    return [ANOMALY_MESSAGES[code].format(*args) for code, *args in flags]
+
+
 # ══════════════════════════════════════════════════════════════════════
 # 6. HONEST NARRATIVE  (1–2 professional sentences)
 # ══════════════════════════════════════════════════════════════════════
 
-def generate_honest_narrative(shadow_score, stage, github_meta, email_meta,
-                               anomalies, intelligence_data):
+_OPENING_CUTS = (40, 60, 80)
+_NARRATIVE_OPENINGS = (
+    "Candidate reliability signals are weak; significant verification gaps detected across all layers.",
+    "Candidate profile shows limited verifiable signals; several trust dimensions require manual review.",
+    "Candidate presents a moderately reliable profile with some gaps in external verification.",
+    "Candidate demonstrates strong reliability signals across identity, email, and digital activity layers.",
+)
+
+
+def generate_honest_narrative(shadow_score, facts, anomalies):
     """
     Generates a professional 1–2 sentence recruiter narrative.
-    Never blank. Never cosmetic.
+    Never blank. Never cosmetic. facts comes from build_facts.
     """
     # Shorthand aliases
-    repo_ct     = github_meta.get("repo_count", 0)
-    gh_exists   = github_meta.get("exists", False)
-    rep         = email_meta.get("domain_reputation", "Unknown")
+    stage       = facts.stage
+    repo_ct     = facts.repo_count
+    gh_exists   = facts.gh_exists
+    rep         = facts.domain_reputation
     flag_ct     = anomalies.get("flag_count", 0)
-    hire_risk   = intelligence_data.get("risk", {}).get("hiring_risk_level", "Moderate") \
-                  if intelligence_data else "Moderate"
-    coherence   = intelligence_data.get("consistency", {}).get("verdict", "Unknown") \
-                  if intelligence_data else "Unknown"
+    hire_risk   = facts.hiring_risk_level
+    coherence   = facts.coherence_verdict
 
     # Opening based on shadow score
-    if shadow_score >= 80:
-        opening = "Candidate demonstrates strong reliability signals across identity, email, and digital activity layers."
-    elif shadow_score >= 60:
-        opening = "Candidate presents a moderately reliable profile with some gaps in external verification."
-    elif shadow_score >= 40:
-        opening = "Candidate profile shows limited verifiable signals; several trust dimensions require manual review."
-    else:
-        opening = "Candidate reliability signals are weak; significant verification gaps detected across all layers."
+    opening = _NARRATIVE_OPENINGS[bisect_right(_OPENING_CUTS, shadow_score)]
 
     # Supporting detail
     details = []
     if gh_exists and repo_ct > 0:
         details.append(f"GitHub activity ({repo_ct} repos) corroborates technical engagement.")
-    elif not gh_exists and stage in ("Fresher", "Academic"):
+    elif not gh_exists and stage in EARLY_STAGES:
         details.append("Absence of digital presence is consistent with early career stage.")
-    elif not gh_exists and stage in ("Senior", "Executive"):
+    elif not gh_exists and stage in SENIOR_STAGES:
         details.append("Expected digital footprint for this career stage is absent.")
 
-    if rep in ("University / Academic", "Corporate Domain"):
+    if rep in INSTITUTIONAL_REPUTATIONS:
         details.append(f"Email domain ({rep.lower()}) adds institutional credibility.")
 
     if flag_ct == 0:
@@ -349,31 +524,67 @@ def generate_honest_narrative(shadow_score, stage, github_meta, email_meta,
 # 7. SHA-256 REPORT INTEGRITY HASH  (Web3 proof-of-check)
 # ══════════════════════════════════════════════════════════════════════
 
+_CANONICAL_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def _canonical_body(report_dict):
+    """Canonical (key-sorted, compact UTF-8) JSON of everything except the mutable meta block."""
+    return orjson.dumps({k: v for k, v in report_dict.items() if k != "meta"}, option=_CANONICAL_OPTS)
+
+
 def generate_report_hash(report_dict):
     """
     Deterministic cryptographic fingerprint of the forensic report.
     SHA-256 over canonical JSON. Same input always produces same hash.
     """
     # Remove mutable fields before hashing (timestamp, hash itself)
-    hashable = {k: v for k, v in report_dict.items() if k != "meta"}
-    serialized = json.dumps(hashable, sort_keys=True, ensure_ascii=True)
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    return hashlib.sha256(_canonical_body(report_dict)).hexdigest()
 
 
 # ══════════════════════════════════════════════════════════════════════
 # 8. MAIN FORENSIC REPORT BUILDER
 # ══════════════════════════════════════════════════════════════════════
 
+@dataclass(frozen=True, slots=True)
+class _IntelView:
+    """The intelligence_data fields the report reads, extracted in one pass."""
+    evidence_level: str
+    evidence_score: float
+    total_exp_years: float
+    has_work_history: bool
+    timeline_gaps: list
+    skill_mention_ratio: float  # None when the engine did not report it
+
+    @classmethod
+    def from_dict(cls, intelligence_data):
+        evidence = intelligence_data.get("evidence_strength", {})
+        narrative = intelligence_data.get("narrative", {})
+        signals = intelligence_data.get("career_stage", {}).get("signals_used", {})
+        return cls(
+            evidence_level=evidence.get("level", "Weak"),
+            evidence_score=evidence.get("score", 0),
+            total_exp_years=signals.get("total_exp_years", 0),
+            has_work_history=bool(narrative.get("has_work_history")),
+            timeline_gaps=narrative.get("timeline_gaps", []),
+            skill_mention_ratio=intelligence_data.get("consistency", {}).get("skill_mention_ratio"),
+        )
+
+
 def generate_forensic_report(entities, verification_data, intelligence_data,
                                extraction_meta, latency_seconds, fraud_probability):
     """
     Assembles the PRACTICAL forensic report.
     """
+    # One clock read for the whole report
+    now = datetime.now(timezone.utc)
+    this_year = now.astimezone().year
+
+    view = _IntelView.from_dict(intelligence_data)
+
     # 1. Redefined Metrics
     trust_score = round(100 - fraud_probability, 1)
-    evidence = intelligence_data.get("evidence_strength", {})
-    evidence_strength = evidence.get("level", "Weak")
-    evidence_score = evidence.get("score", 0)
+    evidence_strength = view.evidence_level
+    evidence_score = view.evidence_score
     
     validation_level = (
         "High" if fraud_probability > 60 or evidence_score < 30 else
@@ -393,32 +604,32 @@ def generate_forensic_report(entities, verification_data, intelligence_data,
     }
 
     # 3. Experience Timeline Check
-    narrative = intelligence_data.get("narrative", {})
+    gaps = view.timeline_gaps
     exp_timeline = {
-        "claimed_experience": f"{intelligence_data.get('career_stage', {}).get('signals_used', {}).get('total_exp_years', 0)} years",
-        "structured_history": "Complete" if narrative.get("has_work_history") and not narrative.get("timeline_gaps") else "Partial",
-        "gaps_detected": "Yes" if narrative.get("timeline_gaps") else "No",
-        "gap_details": narrative.get("timeline_gaps", []),
-        "recommendation": "Ask candidate to clarify employment gap" if narrative.get("timeline_gaps") else "Timeline appears consistent"
+        "claimed_experience": f"{view.total_exp_years} years",
+        "structured_history": "Complete" if view.has_work_history and not gaps else "Partial",
+        "gaps_detected": "Yes" if gaps else "No",
+        "gap_details": gaps,
+        "recommendation": "Ask candidate to clarify employment gap" if gaps else "Timeline appears consistent"
     }
 
     # 4. Skill Verification
     skills = entities.get("skills", [])
-    consistency = intelligence_data.get("consistency", {})
+    ratio = view.skill_mention_ratio or 0
     skill_verification = {
         "declared_skills": len(skills),
-        "demonstrated_skills": int(len(skills) * consistency.get("skill_mention_ratio", 0)),
-        "verdict": "None of the declared technical skills are referenced in project or job descriptions." if consistency.get("skill_mention_ratio") == 0 else "Skills are partially cited in experience descriptions.",
+        "demonstrated_skills": int(len(skills) * ratio),
+        "verdict": "None of the declared technical skills are referenced in project or job descriptions." if view.skill_mention_ratio == 0 else "Skills are partially cited in experience descriptions.",
         "insights": [
-            "Skills may be added without demonstrated application" if consistency.get("skill_mention_ratio", 0) < 0.3 else "Skills align with work history descriptions",
-            "Resume may be keyword-optimized rather than experience-driven" if consistency.get("skill_mention_ratio", 0) < 0.2 else "Experience details support skill claims"
+            "Skills may be added without demonstrated application" if ratio < 0.3 else "Skills align with work history descriptions",
+            "Resume may be keyword-optimized rather than experience-driven" if ratio < 0.2 else "Experience details support skill claims"
         ],
-        "interview_focus": "Ask for real project examples per skill" if consistency.get("skill_mention_ratio", 0) < 0.5 else "Standard technical validation"
+        "interview_focus": "Ask for real project examples per skill" if ratio < 0.5 else "Standard technical validation"
     }
 
     # 5. Digital Footprint
     gh_raw = verification_data.get("api_signals", {}).get("github", {})
-    gh_meta = compute_github_trust(gh_raw)[2]
+    gh_meta = compute_github_trust(gh_raw, this_year)[2]
     digital_footprint = {
         "github_activity": "Active" if gh_meta.get("repo_count", 0) > 10 else "Minimal" if gh_meta.get("exists") else "Not found",
         "linked_profile_depth": "Deep" if gh_meta.get("repo_count", 0) > 5 else "Limited",
@@ -451,7 +662,7 @@ def generate_forensic_report(entities, verification_data, intelligence_data,
 
     return {
         "meta": {
-            "scan_timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "scan_timestamp": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "latency_seconds": round(latency_seconds, 3),
             "validation_level": validation_level
         },
@@ -462,3 +673,37 @@ def generate_forensic_report(entities, verification_data, intelligence_data,
         "final_hiring_signal": final_signal,
         "honest_narrative": f"ML Forensic Audit: {fraud_probability}% fraud probability. {verdict}"
     }
+
+
+def generate_forensic_reports_batch(jobs, max_workers=None):
+    """
+    Runs generate_forensic_report over many candidates in worker processes.
+    jobs is a list of argument tuples for generate_forensic_report; results
+    are returned in input order. Scoring is pure-Python CPU work, so
+    processes (not threads) are what actually run candidates in parallel.
+    """
+    if not jobs:
+        return []
+    if len(jobs) == 1:
+        return [generate_forensic_report(*jobs[0])]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_forensic_report_job, jobs, chunksize=BATCH_CHUNKSIZE))
+
+
+def _forensic_report_job(args):
+    return generate_forensic_report(*args)
+
+
+def generate_forensic_report_bytes(*args, **kwargs):
+    """
+    generate_forensic_report plus its serialized form, for callers that
+    return or store the report as JSON. The report body is serialized once:
+    those bytes are both hashed (meta.report_hash_sha256) and spliced after
+    the meta block into the returned bytes.
+    Returns: (report_dict, json_bytes).
+    """
+    report = generate_forensic_report(*args, **kwargs)
+    body = _canonical_body(report)
+    report["meta"]["report_hash_sha256"] = hashlib.sha256(body).hexdigest()
+    meta = orjson.dumps(report["meta"], option=_CANONICAL_OPTS)
+    return report, b'{"meta":' + meta + b"," + body[1:]
@@ -1,4 +1,48 @@
 import re
+import sys
+import numpy as np
+
+_WORD = re.compile(r'\w+')
+
+try:
+    from rapidfuzz.fuzz import token_sort_ratio as _token_sort_ratio
+except ImportError:  # optional — difflib on the same 0-100 scale
+    from difflib import SequenceMatcher
+
+    def _token_sort_ratio(a, b):
+        return SequenceMatcher(None, " ".join(sorted(a.split())), " ".join(sorted(b.split()))).ratio() * 100
+
+# Names with no word in common still count as the same person at or above
+# this token_sort_ratio: typos / transliterations (jon smith ~ john smyth)
+NAME_TYPO_RATIO = 80
+
+# ── Fraud Rules (flag text, risk points) ───────────────────────────────
+# Order matters: flags are reported in this order by both entry points.
+RULE_NAME_MISMATCH   = ("LinkedIn Name mismatch between Resume and GitHub profile", 20)
+RULE_LI_SLUG_NAME    = ("LinkedIn slug does not match candidate name", 20)
+RULE_LI_SLUG_SUSPECT = ("Suspicious LinkedIn slug pattern detected", 15)
+RULE_LI_UNREACHABLE  = ("LinkedIn provided but profile is unreachable", 10)
+RULE_GH_INFLATION    = ("Potential GitHub activity inflation (High repos, zero followers)", 20)
+
+_RULES = (RULE_NAME_MISMATCH, RULE_LI_SLUG_NAME, RULE_LI_SLUG_SUSPECT,
+          RULE_LI_UNREACHABLE, RULE_GH_INFLATION)
+_RULE_POINTS = np.array([points for _, points in _RULES])
+
+
+def _risk_level(risk_points):
+    if risk_points >= 50:
+        return "high"
+    if risk_points >= 20:
+        return "medium"
+    return "low"
+
+
+def _names_disjoint(candidate_name, gh_name):
+    """True when the (casefolded) names share no word and are not a near-typo of each other."""
+    if not set(_WORD.findall(candidate_name)).isdisjoint(_WORD.findall(gh_name)):
+        return False
+    return _token_sort_ratio(candidate_name, gh_name) < NAME_TYPO_RATIO
+
 
 def detect_fraud(resume_data, github_data, linkedin_data):
     """
@@ -7,49 +51,86 @@ def detect_fraud(resume_data, github_data, linkedin_data):
     """
     flags = []
     risk_points = 0
-    
-    candidate_name = resume_data.get("name", "").lower()
-    
+
+    # casefold for Unicode-aware matching; interned since names recur across batches
+    candidate_name = sys.intern((resume_data.get("name") or "").casefold())
+
     # 1. Identity Validation (Resume vs GitHub Name)
     if github_data.get("exists"):
-        gh_name = (github_data.get("name_on_profile") or "").lower()
-        if gh_name and candidate_name:
-            name_parts = set(re.findall(r'\w+', candidate_name))
-            gh_name_parts = set(re.findall(r'\w+', gh_name))
-            if not name_parts & gh_name_parts:
-                flags.append("LinkedIn Name mismatch between Resume and GitHub profile")
-                risk_points += 20
+        gh_name = (github_data.get("name_on_profile") or "").casefold()
+        if gh_name and candidate_name and _names_disjoint(candidate_name, gh_name):
+            flags.append(RULE_NAME_MISMATCH[0])
+            risk_points += RULE_NAME_MISMATCH[1]
 
     # 2. LinkedIn Fraud Signals
     li_metrics = linkedin_data.get("linkedin_metrics", {})
     if linkedin_data.get("exists"):
-        if li_metrics.get("identity_match_score", 0) < 5:
-            flags.append("LinkedIn slug does not match candidate name")
-            risk_points += 20
+        if (li_metrics.get("identity_match_score", 0) or 0) < 5:
+            flags.append(RULE_LI_SLUG_NAME[0])
+            risk_points += RULE_LI_SLUG_NAME[1]
         if not li_metrics.get("slug_valid"):
-            flags.append("Suspicious LinkedIn slug pattern detected")
-            risk_points += 15
+            flags.append(RULE_LI_SLUG_SUSPECT[0])
+            risk_points += RULE_LI_SLUG_SUSPECT[1]
     elif resume_data.get("linkedin"):
-        flags.append("LinkedIn provided but profile is unreachable")
-        risk_points += 10
+        flags.append(RULE_LI_UNREACHABLE[0])
+        risk_points += RULE_LI_UNREACHABLE[1]
 
     # 3. GitHub "Inflation" Detection
     if github_data.get("exists"):
-        repos = github_data.get("repos_count", 0)
-        followers = github_data.get("followers", 0)
+        repos = github_data.get("repos_count", 0) or 0
+        followers = github_data.get("followers", 0) or 0
         if repos > 20 and followers < 2:
-            flags.append("Potential GitHub activity inflation (High repos, zero followers)")
-            risk_points += 20
+            flags.append(RULE_GH_INFLATION[0])
+            risk_points += RULE_GH_INFLATION[1]
 
-    # Determine Risk Level
-    risk_level = "low"
-    if risk_points >= 50:
-        risk_level = "high"
-    elif risk_points >= 20:
-        risk_level = "medium"
-        
     return {
         "fraud_flags": flags,
-        "risk_level": risk_level,
+        "risk_level": _risk_level(risk_points),
         "risk_score": risk_points
     }
+
+
+def detect_fraud_batch(resumes, githubs, linkedins):
+    """
+    detect_fraud over parallel lists of candidates.
+    Every rule is evaluated as a boolean column and risk points come from one
+    matrix product, so per-candidate Python work is limited to field access.
+    """
+    n = len(resumes)
+    if n == 0:
+        return []
+
+    gh_exists = np.fromiter((bool(g.get("exists")) for g in githubs), dtype=bool, count=n)
+    li_exists = np.fromiter((bool(l.get("exists")) for l in linkedins), dtype=bool, count=n)
+    li_metrics = [l.get("linkedin_metrics", {}) for l in linkedins]
+
+    names = [sys.intern((r.get("name") or "").casefold()) for r in resumes]
+    gh_names = [(g.get("name_on_profile") or "").casefold() for g in githubs]
+    name_mismatch = np.fromiter(
+        (bool(gh and name) and _names_disjoint(name, gh) for name, gh in zip(names, gh_names)),
+        dtype=bool, count=n
+    )
+    li_identity = np.fromiter((m.get("identity_match_score", 0) or 0 for m in li_metrics), dtype=float, count=n)
+    li_slug_valid = np.fromiter((bool(m.get("slug_valid")) for m in li_metrics), dtype=bool, count=n)
+    has_linkedin = np.fromiter((bool(r.get("linkedin")) for r in resumes), dtype=bool, count=n)
+    repos = np.fromiter((g.get("repos_count", 0) or 0 for g in githubs), dtype=float, count=n)
+    followers = np.fromiter((g.get("followers", 0) or 0 for g in githubs), dtype=float, count=n)
+
+    # Columns follow _RULES order
+    hits = np.column_stack((
+        gh_exists & name_mismatch,
+        li_exists & (li_identity < 5),
+        li_exists & ~li_slug_valid,
+        ~li_exists & has_linkedin,
+        gh_exists & (repos > 20) & (followers < 2),
+    ))
+    risk = hits.astype(np.int64) @ _RULE_POINTS
+
+    return [
+        {
+            "fraud_flags": [rule[0] for rule, hit in zip(_RULES, row) if hit],
+            "risk_level": _risk_level(points),
+            "risk_score": int(points)
+        }
+        for row, points in zip(hits, risk)
+    ]
@@ -4,11 +4,44 @@ The core reasoning system. Replaces mechanical scoring with contextual analysis.
 Thinks like a senior recruiter + background analyst + risk assessor simultaneously.
 """
 import re
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+import orjson
+import numpy as np
+from dataclasses import dataclass
 from datetime import datetime
 from career_stage_engine import classify_career_stage, STAGE_BASELINES
 
+try:
+    from numba import njit
+except ImportError:  # optional — the kernels below run as plain Python
+    njit = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional — _scan_phrases falls back to the lookahead regex
+    ahocorasick = None
+
 CURRENT_YEAR = datetime.now().year
 
+_YEAR_RE = re.compile(r'20[0-2][0-9]')
+_DATE_RE = re.compile(r'(20[0-2][0-9]|19[8-9][0-9])')
+_SKILL_TOKEN_RE = re.compile(r'[a-z0-9+#.]+')  # one-word skill names: python, c++, c#, node.js
+
+# ── Stage / Domain Groups (hash membership, built once) ───────────────
+_EARLY_STAGES = frozenset({"Academic", "Fresher"})
+_GROWTH_STAGES = frozenset({"Early Professional", "Mid-Level"})
+_EXPERIENCED_STAGES = frozenset({"Mid-Level", "Senior", "Executive"})
+_PROJECT_STAGES = frozenset({"Mid-Level", "Senior"})
+_SENIOR_STAGES = frozenset({"Senior", "Executive"})
+_TECH_DOMAINS = frozenset({"technology", "software", "ai/ml", "data science"})
+
+# Evidence-strength multiplier per stage: lower expectations for digital
+# footprint / work depth early in a career
+_EVIDENCE_SCALE = {stage: 1.5 if stage in _EARLY_STAGES else 1.0 for stage in STAGE_BASELINES}
+
 # ── Inflation Signal Dictionary ────────────────────────────────────────
 INFLATION_PATTERNS = {
     "ai_ml": {
@@ -33,6 +66,17 @@ INFLATION_PATTERNS = {
     }
 }
 
+# Per-domain claim / evidence markers merged with the generic ones. Claims
+# keep their order (they are quoted in flags); evidence is only counted.
+_HIGH_CLAIMS = {
+    key: tuple(dict.fromkeys(p["high_claims"] + INFLATION_PATTERNS["generic"]["high_claims"]))
+    for key, p in INFLATION_PATTERNS.items()
+}
+_EVIDENCE_MARKERS = {
+    key: frozenset(p["evidence_markers"]) | frozenset(INFLATION_PATTERNS["generic"]["evidence_markers"])
+    for key, p in INFLATION_PATTERNS.items()
+}
+
 # AI-generated language fingerprints
 AI_LANGUAGE_PATTERNS = [
     "demonstrated ability to", "proven track record of", "passionate about leveraging",
@@ -41,43 +85,220 @@ AI_LANGUAGE_PATTERNS = [
     "results-driven professional", "seeking to leverage", "strong communicator"
 ]
 
+# Delivery verbs counted as concrete project evidence
+PROJECT_KEYWORDS = ["built", "developed", "implemented", "deployed", "designed", "created", "led", "architected"]
+
+# Title words that trigger the escalation-speed check
+LEADERSHIP_TERMS = ["manager", "lead"]
+
+# Set forms for tallying against the scanned phrase set in C
+_PROJECT_KEYWORD_SET = frozenset(PROJECT_KEYWORDS)
+_LEADERSHIP_TERM_SET = frozenset(LEADERSHIP_TERMS)
+
+# ── Single-Pass Phrase Scanner ─────────────────────────────────────────
+# Every claim / evidence / AI-language / project / leadership phrase in one
+# lookahead alternation, so the resume text is walked once for all stages
+# instead of once per phrase.
+_ALL_PHRASES = set(AI_LANGUAGE_PATTERNS) | set(PROJECT_KEYWORDS) | set(LEADERSHIP_TERMS)
+for _p in INFLATION_PATTERNS.values():
+    _ALL_PHRASES.update(_p["high_claims"], _p["evidence_markers"])
+
+# Longest-first: at any position the longest phrase wins; shorter phrases
+# contained in it are recovered through _PHRASE_IMPLIES.
+_PHRASE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(p) for p in sorted(_ALL_PHRASES, key=len, reverse=True)) + "))"
+)
+_PHRASE_IMPLIES = {p: [o for o in _ALL_PHRASES if o in p] for p in _ALL_PHRASES}
+
+# Aho-Corasick automaton over the same phrases: reports every (overlapping)
+# occurrence in one O(len(text)) walk, ~10x faster than the regex above.
+_PHRASE_AC = None
+if ahocorasick is not None:
+    _PHRASE_AC = ahocorasick.Automaton()
+    for _p in _ALL_PHRASES:
+        _PHRASE_AC.add_word(_p, _p)
+    _PHRASE_AC.make_automaton()
+
+
+def _scan_phrases(text_lower):
+    """Set of all known phrases occurring in text_lower (same result as `p in text_lower` per phrase)."""
+    if _PHRASE_AC is not None:
+        return {phrase for _, phrase in _PHRASE_AC.iter(text_lower)}
+    found = set()
+    for m in _PHRASE_RE.finditer(text_lower):
+        phrase = m.group(1)
+        if phrase not in found:
+            found.update(_PHRASE_IMPLIES[phrase])
+    return found
+
+
+# ── Timeline Kernels ───────────────────────────────────────────────────
+# Integer-only loops so numba can compile them when it is installed.
+
+def _year_gap_indices(years):
+    """Indices i (ascending years) where years[i] - years[i-1] exceeds 2."""
+    out = []
+    for i in range(1, len(years)):
+        if years[i] - years[i - 1] > 2:
+            out.append(i)
+    return out
+
+
+def _overlap_pairs(starts, ends):
+    """
+    Sweep-line over roles sorted by start: (earlier, later) index pairs where
+    the later role starts more than a year before the latest earlier end.
+    """
+    out = []
+    latest = -1
+    for j in range(len(starts)):
+        if latest >= 0 and starts[j] < ends[latest] - 1:
+            out.append((latest, j))
+        if latest < 0 or ends[j] > ends[latest]:
+            latest = j
+    return out
+
+
+if njit is not None:
+    _year_gap_indices_jit = njit(cache=True)(_year_gap_indices)
+    _overlap_pairs_jit = njit(cache=True)(_overlap_pairs)
+    # Compile at import so the first resume does not pay for it
+    _year_gap_indices_jit(np.zeros(1, dtype=np.int32))
+    _overlap_pairs_jit(np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.int32))
+
+    def _gap_kernel(years):
+        return _year_gap_indices_jit(np.asarray(years, dtype=np.int32))
+
+    def _overlap_kernel(starts, ends):
+        return _overlap_pairs_jit(np.asarray(starts, dtype=np.int32), np.asarray(ends, dtype=np.int32))
+else:
+    _gap_kernel = _year_gap_indices
+    _overlap_kernel = _overlap_pairs
+
+
+@dataclass(frozen=True, slots=True)
+class _AnalysisCtx:
+    """Per-resume text views shared by every stage, computed once."""
+    text_lower: str
+    year_mentions: list  # sorted distinct 20xx years, none in the future
+    phrases: frozenset   # known phrases (see _ALL_PHRASES) present in the text
+    exp_text_lower: str  # all experience details joined, lower-cased
+    exp_detail_len: int  # total characters across experience details
+
+    @classmethod
+    def from_resume(cls, raw_text, entities, text_lower=None):
+        raw_text = raw_text or ""
+        if text_lower is None:
+            text_lower = raw_text.lower()
+        # dedupe the matched strings before int(); one conversion per distinct year
+        years = sorted(y for y in map(int, set(_YEAR_RE.findall(raw_text))) if y <= CURRENT_YEAR)
+        details = [str(e.get("details", "")) for e in (entities.get("experience", []) or [])]
+        return cls(
+            text_lower=text_lower, year_mentions=years, phrases=frozenset(_scan_phrases(text_lower)),
+            exp_text_lower=" ".join(details).lower(), exp_detail_len=sum(map(len, details))
+        )
+
+
+# ── Fast-Reject Thresholds ─────────────────────────────────────────────
+FAST_REJECT_FRAUD = 90    # fraud_probability (0-100) above which the outcome is settled
+MIN_ANALYSIS_TEXT = 200   # resume characters needed for the text-based stages to say anything
+
+
+# ── Result Cache (re-submitted resumes) ───────────────────────────────
+ANALYSIS_CACHE_SIZE = 1024
+_analysis_cache = OrderedDict()  # blake2b digest -> orjson bytes of the result
+_analysis_cache_lock = threading.Lock()
+
+
+def _analysis_key(entities, verification_results, raw_text, domain_info,
+                  fraud_probability, target_role, expected_skills):
+    """BLAKE2b over every input the analysis depends on (dicts canonicalized with sorted keys)."""
+    h = hashlib.blake2b(digest_size=32)
+    for part in (entities, verification_results, domain_info, sorted(expected_skills or [])):
+        h.update(orjson.dumps(part, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str))
+        h.update(b"|")
+    h.update((raw_text or "").encode("utf-8"))
+    h.update(b"|")
+    h.update((target_role or "").encode("utf-8"))
+    h.update(b"|")
+    h.update(repr(float(fraud_probability)).encode("ascii"))
+    return h.digest()
 
-def run_intelligence_analysis(entities, verification_results, raw_text, domain_info, extraction_metadata=None, fraud_probability=0.0, target_role="", expected_skills=None):
+
+def run_intelligence_analysis(entities, verification_results, raw_text, domain_info, extraction_metadata=None, fraud_probability=0.0, target_role="", expected_skills=None, use_cache=True):
     """
     8-Stage Adaptive Hiring Intelligence Engine.
     Returns contextual reasoning, not mechanical scores.
+    The analysis is pure in its inputs, so results are memoized (LRU,
+    ANALYSIS_CACHE_SIZE entries) by content hash; pass use_cache=False to bypass.
     """
+    if not use_cache:
+        return _run_intelligence_analysis(entities, verification_results, raw_text, domain_info,
+                                          fraud_probability, expected_skills)
+
+    key = _analysis_key(entities, verification_results, raw_text, domain_info,
+                        fraud_probability, target_role, expected_skills)
+    with _analysis_cache_lock:
+        hit = _analysis_cache.get(key)
+        if hit is not None:
+            _analysis_cache.move_to_end(key)
+    if hit is not None:
+        return orjson.loads(hit)  # fresh objects, so callers may mutate freely
+
+    result = _run_intelligence_analysis(entities, verification_results, raw_text, domain_info,
+                                        fraud_probability, expected_skills)
+    try:
+        serialized = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    except orjson.JSONEncodeError:
+        return result  # not cacheable as JSON; the computed result is still good
+    with _analysis_cache_lock:
+        _analysis_cache[key] = serialized
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return result
+
+
+def _run_intelligence_analysis(entities, verification_results, raw_text, domain_info,
+                               fraud_probability, expected_skills):
     domain = domain_info.get("domain", "General")
+    text_lower = raw_text.lower()  # one Unicode lower() shared by Stage 1 and the stage context
 
     # ─ STAGE 1: Career Stage Classification ──────────────────────────
-    stage_data = classify_career_stage(entities, raw_text)
+    stage_data = classify_career_stage(entities, raw_text, text_lower=text_lower)
     stage = stage_data["stage"]
     stage_confidence = stage_data["confidence"]
     expectations = stage_data["expectations"]
     baseline = stage_data["baseline_score"]
 
+    reject_reason = _fast_reject_reason(raw_text, fraud_probability)
+    if reject_reason:
+        return _fast_reject_result(stage_data, reject_reason, fraud_probability, entities, verification_results)
+
+    ctx = _AnalysisCtx.from_resume(raw_text, entities, text_lower=text_lower)
+    github, stack_overflow, email_trust = _external_sources(verification_results)
+
     # ─ STAGE 2: Narrative Reconstruction ─────────────────────────────
-    narrative = _reconstruct_narrative(entities, raw_text, stage)
+    narrative = _reconstruct_narrative(entities, ctx, stage)
 
     # ─ STAGE 3: Claim Proportionality Analysis ───────────────────────
-    proportionality = _analyze_claim_proportionality(entities, raw_text, stage, domain)
+    proportionality = _analyze_claim_proportionality(entities, ctx, stage, domain)
 
     # ─ STAGE 4: Internal Consistency Analysis ────────────────────────
-    consistency = _analyze_internal_consistency(entities, raw_text)
+    consistency = _analyze_internal_consistency(entities, ctx)
 
     # ─ STAGE 5: External Signal Integration (Stage-Aware) ────────────
-    external_signals = _integrate_external_signals(verification_results, expectations, stage, domain)
+    external_signals = _integrate_external_signals(github, stack_overflow, email_trust, expectations, stage, domain)
 
     # ─ STAGE 6: Evidence Strength Calculation ────────────────────────
     evidence_strength = _calculate_evidence_strength(
-        proportionality, consistency, external_signals, entities, stage
+        proportionality, consistency, external_signals, ctx, stage
     )
 
     # ─ STAGE 7: Core Metrics Calculation ─────────────────────────────
     core_metrics = _compute_core_metrics(fraud_probability, evidence_strength)
 
     # ─ STAGE 8: Role-Based Fit Calculation ───────────────────────────
-    role_match = _compute_role_match(entities, raw_text, expected_skills)
+    role_match = _compute_role_match(entities, ctx, expected_skills)
 
     # ─ STAGE 9: Stage-Adaptive Scoring ───────────────────────────────
     score = _compute_adaptive_score(
@@ -88,7 +309,7 @@ def run_intelligence_analysis(entities, verification_results, raw_text, domain_i
     verdict = _generate_intelligence_verdict(
         stage, stage_confidence, narrative, proportionality,
         consistency, external_signals, core_metrics, score, domain,
-        verification_results=verification_results,
+        ai_forensic=_extract_ai_forensic(verification_results),
         evidence_strength=evidence_strength,
         fraud_probability=fraud_probability,
         role_match=role_match
@@ -125,12 +346,106 @@ def run_intelligence_analysis(entities, verification_results, raw_text, domain_i
     }
 
 
+def _fast_reject_reason(raw_text, fraud_probability):
+    """Why the text-based stages can be skipped, or None when the full analysis should run."""
+    if fraud_probability > FAST_REJECT_FRAUD:
+        return f"ML fraud probability {fraud_probability:.0f}% exceeds {FAST_REJECT_FRAUD}%"
+    if len((raw_text or "").strip()) < MIN_ANALYSIS_TEXT:
+        return f"resume text shorter than {MIN_ANALYSIS_TEXT} characters"
+    return None
+
+
+def _fast_reject_result(stage_data, reason, fraud_probability, entities, verification_results):
+    """
+    Same result shape as the full analysis with Stages 2-10 skipped: neutral
+    stage sections, hiring_index 0 and a one-reason verdict. The structured
+    table (Stage 11) still runs since it reads only verification data.
+    """
+    stage = stage_data["stage"]
+    education = entities.get("education", []) or []
+    experience = entities.get("experience", []) or []
+    skills = entities.get("skills", []) or []
+    narrative = {
+        "has_education": len(education) > 0, "has_work_history": len(experience) > 0,
+        "has_skills": len(skills) > 0, "skill_count": len(skills), "role_count": len(experience),
+        "certification_count": len(entities.get("certifications", []) or []),
+        "timeline_gaps": [], "progression_natural": False, "notes": []
+    }
+    proportionality = {
+        "high_intensity_claims": [], "evidence_markers_found": 0, "project_evidence_hits": 0,
+        "ai_language_detected": False, "ai_language_patterns": [], "inflation_flags": [],
+        "inflation_index": 0, "proportionality_verdict": "Not Assessed"
+    }
+    consistency = {
+        "flags": [], "date_overlap_detected": False, "rapid_escalation_flag": False,
+        # neutral 70, the same default the ML refinement pass assumes before Stage 4 runs
+        "skill_mention_ratio": 0, "coherence_score": 70, "verdict": "Not Assessed"
+    }
+    external_signals = {
+        "positive_signals": [], "contradictions": [], "neutral_absences": [],
+        "coverage_level": "Minimal", "signals": {}
+    }
+    evidence_strength = {"score": 0, "level": "Weak", "skill_ratio": 0, "detail_depth": 0}
+    core_metrics = _compute_core_metrics(fraud_probability, evidence_strength)
+    score = {
+        "hiring_index": 0.0,
+        "system_confidence": stage_data["confidence"],
+        "baseline_used": stage_data["baseline_score"],
+        "stage": stage
+    }
+    lines = [
+        f"Profile classified as {stage} (confidence: {stage_data['confidence']}%).",
+        f"Detailed analysis skipped: {reason}.",
+        "Recommendation: " + (
+            "High risk profile requiring strict validation." if fraud_probability > FAST_REJECT_FRAUD else
+            "Insufficient resume content to evaluate; request a complete resume."
+        )
+    ]
+
+    return {
+        "career_stage": {
+            "stage": stage,
+            "confidence": stage_data["confidence"],
+            "baseline_score": stage_data["baseline_score"],
+            "description": stage_data["expectations"].get("description", "")
+        },
+        "narrative": narrative,
+        "proportionality": proportionality,
+        "consistency": consistency,
+        "external_signals": external_signals,
+        "core_metrics": core_metrics,
+        "evidence_strength": evidence_strength,
+        "role_match": {
+            "match_score": 0, "is_evaluated": False, "verdict": "Role match not assessed.",
+            "matched_skills": [], "missing_skills": []
+        },
+        "score": score,
+        "verdict": {
+            "full_verdict": " ".join(lines),
+            "verdict_lines": lines,
+            "validation_required": core_metrics["validation_required_level"],
+            "hiring_index": 0.0,
+            "system_confidence": stage_data["confidence"]
+        },
+        "structured_analysis": build_structured_analysis(
+            external_signals=external_signals,
+            consistency=consistency,
+            evidence_strength=evidence_strength,
+            core_metrics=core_metrics,
+            fraud_probability=fraud_probability,
+            entities=entities,
+            verification_results=verification_results
+        ),
+        "fast_path": reason
+    }
+
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 2: NARRATIVE RECONSTRUCTION
 # ═══════════════════════════════════════════════════════════════════════
 
-def _reconstruct_narrative(entities, raw_text, stage):
+def _reconstruct_narrative(entities, ctx, stage):
     """
     Rebuilds the candidate's story and checks if the progression
     feels natural given the stage and sequence of events.
@@ -149,7 +464,7 @@ def _reconstruct_narrative(entities, raw_text, stage):
     progression_notes = []
     progression_natural = True
 
-    if stage in ("Academic", "Fresher"):
+    if stage in _EARLY_STAGES:
         if not has_education:
             progression_notes.append("Education section missing for an early-stage candidate — unusual.")
         if has_work_history and len(experience) > 3:
@@ -157,14 +472,14 @@ def _reconstruct_narrative(entities, raw_text, stage):
         else:
             progression_notes.append("Limited or absent work history is appropriate for this career stage.")
 
-    elif stage in ("Early Professional", "Mid-Level"):
+    elif stage in _GROWTH_STAGES:
         if not has_work_history:
             progression_notes.append("No structured work history despite expected professional experience.")
             progression_natural = False
         else:
             progression_notes.append(f"{len(experience)} role(s) documented; progression visible.")
 
-    elif stage in ("Senior", "Executive"):
+    elif stage in _SENIOR_STAGES:
         if len(experience) < 3:
             progression_notes.append("Senior-level claim with very few documented roles — depth unexplained.")
             progression_natural = False
@@ -172,12 +487,11 @@ def _reconstruct_narrative(entities, raw_text, stage):
             progression_notes.append(f"{len(experience)} progressive roles documented; career timeline visible.")
 
     # Gap detection (rough — from text scan)
-    year_mentions = sorted(set(int(y) for y in re.findall(r'20[0-2][0-9]', raw_text) if int(y) <= CURRENT_YEAR))
-    gaps = []
-    for i in range(1, len(year_mentions)):
-        diff = year_mentions[i] - year_mentions[i - 1]
-        if diff > 2:
-            gaps.append(f"{year_mentions[i-1]}–{year_mentions[i]} ({diff}yr gap)")
+    year_mentions = ctx.year_mentions
+    gaps = [
+        f"{year_mentions[i-1]}–{year_mentions[i]} ({year_mentions[i] - year_mentions[i-1]}yr gap)"
+        for i in _gap_kernel(year_mentions)
+    ]
 
     if gaps:
         progression_notes.append(f"Potential timeline gaps detected: {', '.join(gaps)}.")
@@ -199,37 +513,27 @@ def _reconstruct_narrative(entities, raw_text, stage):
 # STAGE 3: CLAIM PROPORTIONALITY ANALYSIS
 # ═══════════════════════════════════════════════════════════════════════
 
-def _analyze_claim_proportionality(entities, raw_text, stage, domain):
+def _analyze_claim_proportionality(entities, ctx, stage, domain):
     """
     For each major claim, measures whether the resume provides proportional
     supporting evidence. Produces inflation_index (not a fraud score).
     """
-    text_lower = raw_text.lower()
-    skills = [s.lower() for s in (entities.get("skills", []) or [])]
-    experience = entities.get("experience", []) or []
-
     # Detect high-intensity claims in text
     inflation_flags = []
-    evidence_count = 0
     claim_count = 0
 
     domain_key = _map_domain_to_key(domain)
-    patterns = INFLATION_PATTERNS.get(domain_key, INFLATION_PATTERNS["generic"])
-    all_patterns = {**INFLATION_PATTERNS["generic"], **patterns}
+    found = ctx.phrases
 
     # Check high-intensity claims
     active_high_claims = []
-    for claim in patterns["high_claims"] + INFLATION_PATTERNS["generic"]["high_claims"]:
-        if claim in text_lower:
+    for claim in _HIGH_CLAIMS.get(domain_key, _HIGH_CLAIMS["generic"]):
+        if claim in found:
             claim_count += 1
             active_high_claims.append(claim)
 
     # Check supporting evidence markers
-    active_evidence = []
-    for marker in patterns["evidence_markers"] + INFLATION_PATTERNS["generic"]["evidence_markers"]:
-        if marker in text_lower:
-            evidence_count += 1
-            active_evidence.append(marker)
+    evidence_count = len(_EVIDENCE_MARKERS.get(domain_key, _EVIDENCE_MARKERS["generic"]) & found)
 
     # Proportionality ratio
     if claim_count > 0:
@@ -238,14 +542,13 @@ def _analyze_claim_proportionality(entities, raw_text, stage, domain):
             inflation_flags.append(f"High-intensity claims ({', '.join(active_high_claims[:3])}) with insufficient supporting evidence.")
     
     # Project evidence check for tech domain  
-    project_keywords = ["built", "developed", "implemented", "deployed", "designed", "created", "led", "architected"]
-    project_hits = sum(1 for k in project_keywords if k in text_lower)
+    project_hits = len(_PROJECT_KEYWORD_SET & found)
     
-    if stage in ("Mid-Level", "Senior", "Executive") and claim_count > 0 and project_hits < 2:
+    if stage in _EXPERIENCED_STAGES and claim_count > 0 and project_hits < 2:
         inflation_flags.append("Senior-level claim density without concrete project or delivery evidence.")
 
     # AI-generated language detection (inflation proxy)
-    ai_hits = [p for p in AI_LANGUAGE_PATTERNS if p in text_lower]
+    ai_hits = [p for p in AI_LANGUAGE_PATTERNS if p in found]
     ai_language_detected = len(ai_hits) >= 3
 
     if ai_language_detected:
@@ -260,13 +563,13 @@ def _analyze_claim_proportionality(entities, raw_text, stage, domain):
         inflation_index += min(40, (claim_count - evidence_count) * 10)
     if ai_language_detected:
         inflation_index += 25
-    if stage in ("Mid-Level", "Senior") and project_hits < 2:
+    if stage in _PROJECT_STAGES and project_hits < 2:
         inflation_index += 15
     inflation_index = min(100, inflation_index)
 
     return {
         "high_intensity_claims": active_high_claims[:5],
-        "evidence_markers_found": len(active_evidence),
+        "evidence_markers_found": evidence_count,
         "project_evidence_hits": project_hits,
         "ai_language_detected": ai_language_detected,
         "ai_language_patterns": ai_hits[:3],
@@ -285,7 +588,7 @@ def _analyze_claim_proportionality(entities, raw_text, stage, domain):
 # STAGE 4: INTERNAL CONSISTENCY ANALYSIS
 # ═══════════════════════════════════════════════════════════════════════
 
-def _analyze_internal_consistency(entities, raw_text):
+def _analyze_internal_consistency(entities, ctx):
     """
     Detects date overlaps, role escalation anomalies, grade/skill mismatches,
     and cross-declaration inconsistencies.
@@ -296,36 +599,48 @@ def _analyze_internal_consistency(entities, raw_text):
     # Date overlap detection
     role_years = []
     for exp in experience:
-        sy = re.search(r'(20[0-2][0-9]|19[8-9][0-9])', str(exp.get("start_date", "")))
-        ey = re.search(r'(20[0-2][0-9]|19[8-9][0-9])', str(exp.get("end_date", "present")))
+        sy = _DATE_RE.search(str(exp.get("start_date", "")))
+        ey = _DATE_RE.search(str(exp.get("end_date", "present")))
         if sy:
             s = int(sy.group(1))
             e = int(ey.group(1)) if ey else CURRENT_YEAR
             role_years.append((s, e, exp.get("role", "Unknown")))
 
-    overlap_detected = False
-    for i in range(len(role_years)):
-        for j in range(i + 1, len(role_years)):
-            s1, e1, r1 = role_years[i]
-            s2, e2, r2 = role_years[j]
-            if s2 < e1 - 1:  # Allow 1yr grace for overlapping roles (consulting)
-                flags.append(f"Timeline overlap: '{r1}' ({s1}–{e1}) overlaps with '{r2}' ({s2}–{e2}).")
-                overlap_detected = True
+    # Sweep-line over roles sorted by start year: each role is compared with
+    # the earlier role that ends latest, so the scan is linear and each
+    # overlapping role is reported once regardless of resume ordering.
+    # 1yr grace for overlapping roles (consulting) is applied in the kernel.
+    role_years.sort(key=lambda r: r[0])
+    overlaps = _overlap_kernel([r[0] for r in role_years], [r[1] for r in role_years])
+    for i, j in overlaps:
+        s1, e1, r1 = role_years[i]
+        s2, e2, r2 = role_years[j]
+        flags.append(f"Timeline overlap: '{r1}' ({s1}–{e1}) overlaps with '{r2}' ({s2}–{e2}).")
+    overlap_detected = len(overlaps) > 0
 
     # Escalation speed — check for unrealistic jumps
-    text_lower = raw_text.lower()
     rapid_escalation = False
-    if "manager" in text_lower or "lead" in text_lower:
-        all_years = sorted(set(int(y) for y in re.findall(r'20[0-2][0-9]', raw_text) if int(y) <= CURRENT_YEAR))
-        if all_years and (CURRENT_YEAR - min(all_years)) < 3:
+    if not _LEADERSHIP_TERM_SET.isdisjoint(ctx.phrases):
+        all_years = ctx.year_mentions
+        if all_years and (CURRENT_YEAR - all_years[0]) < 3:  # sorted ascending
             flags.append("Leadership title claimed within 3 years of earliest documented year — verify escalation.")
             rapid_escalation = True
 
     # Formatting consistency check (declared skills vs described experience)
-    skills_declared = set(s.lower() for s in (entities.get("skills", []) or []))
-    exp_text = " ".join(str(e.get("details", "")) for e in experience).lower()
+    skills_declared = {n for n in map(_norm, entities.get("skills", []) or []) if n}
+    exp_text = ctx.exp_text_lower
     
-    mentioned_in_exp = sum(1 for s in skills_declared if s in exp_text) if exp_text and skills_declared else 0
+    mentioned_in_exp = 0
+    if exp_text and skills_declared:
+        # One-word skills: whole-token hits from a single tokenization of exp_text
+        # (sentence dots trimmed, so "react." and ".net" compare as "react" / "net").
+        # Multi-word skills keep the substring check.
+        exp_tokens = {t.strip(".") for t in _SKILL_TOKEN_RE.findall(exp_text)}
+        for s in skills_declared:
+            if _SKILL_TOKEN_RE.fullmatch(s):
+                mentioned_in_exp += s.strip(".") in exp_tokens
+            else:
+                mentioned_in_exp += s in exp_text
     skill_mention_ratio = mentioned_in_exp / max(len(skills_declared), 1)
 
     if skills_declared and skill_mention_ratio < 0.2 and len(skills_declared) > 5:
@@ -359,19 +674,13 @@ def _analyze_internal_consistency(entities, raw_text):
 # STAGE 5: EXTERNAL SIGNAL INTEGRATION (Stage-Aware)
 # ═══════════════════════════════════════════════════════════════════════
 
-def _integrate_external_signals(verification_results, expectations, stage, domain):
+def _integrate_external_signals(github, stack_overflow, email_trust, expectations, stage, domain):
     """
     External absence is neutral unless stage expects presence.
     External contradiction is a risk signal.
     Never treats lack of digital footprint as fraud.
+    Takes the source dicts pre-extracted by _external_sources.
     """
-    api_signals = verification_results.get("api_signals", {}) if verification_results else {}
-    identity = verification_results.get("identity_verification", {}) if verification_results else {}
-
-    github = api_signals.get("github", {})
-    stack_overflow = api_signals.get("stackoverflow", {})
-    email_trust = verification_results.get("email_trust", {}) if verification_results else {}
-
     signals = {}
     contradictions = []
     neutral_absences = []
@@ -384,7 +693,7 @@ def _integrate_external_signals(verification_results, expectations, stage, domai
         activity = github.get("metrics", {}).get("activity_score", 0)
         if activity > 50:
             positive_signals.append(f"Active GitHub: activity score {activity}.")
-    elif expectations.get("penalty_for_no_github") and domain.lower() in ("technology", "software", "ai/ml", "data science"):
+    elif expectations.get("penalty_for_no_github") and domain.lower() in _TECH_DOMAINS:
         contradictions.append("No GitHub presence for a senior tech candidate — notable absence at this stage.")
     else:
         neutral_absences.append("No GitHub — not expected at this career stage or domain, non-penalizable.")
@@ -402,7 +711,7 @@ def _integrate_external_signals(verification_results, expectations, stage, domai
 
     # Stack Overflow
     so_present = stack_overflow.get("exists", False)
-    if so_present and stage in ("Senior", "Executive"):
+    if so_present and stage in _SENIOR_STAGES:
         positive_signals.append("Stack Overflow presence corroborates technical depth.")
     elif not so_present:
         neutral_absences.append("No Stack Overflow — supplementary signal, absence is neutral.")
@@ -428,7 +737,7 @@ def _integrate_external_signals(verification_results, expectations, stage, domai
 # STAGE 5.5: EVIDENCE STRENGTH CALCULATION
 # ═══════════════════════════════════════════════════════════════════════
 
-def _calculate_evidence_strength(proportionality, consistency, external, entities, stage):
+def _calculate_evidence_strength(proportionality, consistency, external, ctx, stage):
     """
     Measures how 'solid' the profile is based on concrete evidence markers.
     0 (Vacuum) -> 100 (Rock Solid)
@@ -449,17 +758,14 @@ def _calculate_evidence_strength(proportionality, consistency, external, entitie
         elif repos > 0: strength += 5
     
     # 3. Work Detail Depth (max 30)
-    exp = entities.get("experience", []) or []
-    detail_len = sum(len(str(e.get("details", ""))) for e in exp)
+    detail_len = ctx.exp_detail_len
     if detail_len > 1000: strength += 30
     elif detail_len > 500: strength += 15
     elif detail_len > 100: strength += 5
     
-    # Stage calibration
-    if stage in ("Academic", "Fresher"):
-        # Lower expectations for digital footprint/work depth
-        strength = min(100, strength * 1.5)
-        
+    # Stage calibration (one table lookup; the raw strength already tops out at 100)
+    strength = min(100, strength * _EVIDENCE_SCALE.get(stage, 1.0))
+
     return {
         "score": round(strength, 1),
         "level": (
@@ -534,7 +840,7 @@ def _compute_adaptive_score(baseline, proportionality, consistency, external, fr
 
     # External signal bonus (stage-weighted — less weight for early career)
     stage = stage_data["stage"]
-    ext_weight = 0.05 if stage in ("Academic", "Fresher") else 0.15
+    ext_weight = 0.05 if stage in _EARLY_STAGES else 0.15
     positive_count = len(external["positive_signals"])
     contradiction_count = len(external["contradictions"])
     score += (positive_count * 5 * ext_weight * 10)
@@ -549,7 +855,7 @@ def _compute_adaptive_score(baseline, proportionality, consistency, external, fr
     # Different from extraction confidence — this is epistemic confidence
     stage_confidence = stage_data["confidence"]
     coherence_factor = coh / 100
-    external_factor = min(1.0, (positive_count + 1) / 3) if stage in ("Mid-Level", "Senior", "Executive") else 0.9
+    external_factor = min(1.0, (positive_count + 1) / 3) if stage in _EXPERIENCED_STAGES else 0.9
     system_confidence = round((stage_confidence * 0.4 + coherence_factor * 100 * 0.35 + external_factor * 100 * 0.25))
 
     return {
@@ -560,20 +866,116 @@ def _compute_adaptive_score(baseline, proportionality, consistency, external, fr
     }
 
 
+def compute_adaptive_scores_batch(baselines, inflation_indices, coherence_scores, early_stage,
+                                  positive_counts, contradiction_counts, fraud_probabilities):
+    """
+    Vectorized hiring_index for many candidates: the same piecewise bonuses
+    and penalties as _compute_adaptive_score, applied with np.select over
+    arrays. early_stage is a boolean array (Academic / Fresher).
+    """
+    inf = np.asarray(inflation_indices, dtype=np.float64)
+    coh = np.asarray(coherence_scores, dtype=np.float64)
+    ext_weight = np.where(np.asarray(early_stage, dtype=bool), 0.05, 0.15)
+
+    score = np.asarray(baselines, dtype=np.float64)
+    score = score + np.select([inf < 20, inf < 45, inf < 70], [12, -5, -15], default=-25)
+    score = score + np.select([coh >= 80, coh >= 55], [10, 3], default=-12)
+    score = score + np.asarray(positive_counts) * 5 * ext_weight * 10
+    score = score - np.asarray(contradiction_counts) * 15
+    score = score - np.asarray(fraud_probabilities, dtype=np.float64) * 0.2
+    return np.clip(score, 0, 100).round(1)
+
+
+def run_intelligence_analysis_batch(jobs):
+    """
+    hiring_index for a batch of resumes (ATS ranking). Each job is
+    (entities, verification_results, raw_text, domain_info, fraud_probability).
+    Only the stages the score depends on run per resume; the scoring
+    arithmetic itself is one vectorized pass. Returns a float64 array.
+    Jobs meeting the fast-reject conditions score 0 without running any stage.
+    """
+    features = []
+    rejected = []
+    for entities, verification_results, raw_text, domain_info, fraud_probability in jobs:
+        if _fast_reject_reason(raw_text, fraud_probability):
+            rejected.append(True)
+            features.append((0, 0, 0, False, 0, 0, fraud_probability))
+            continue
+        rejected.append(False)
+        domain = domain_info.get("domain", "General")
+        ctx = _AnalysisCtx.from_resume(raw_text, entities)
+        stage_data = classify_career_stage(entities, raw_text, text_lower=ctx.text_lower)
+        stage = stage_data["stage"]
+        proportionality = _analyze_claim_proportionality(entities, ctx, stage, domain)
+        consistency = _analyze_internal_consistency(entities, ctx)
+        external = _integrate_external_signals(*_external_sources(verification_results),
+                                               stage_data["expectations"], stage, domain)
+        features.append((
+            stage_data["baseline_score"], proportionality["inflation_index"], consistency["coherence_score"],
+            stage in _EARLY_STAGES, len(external["positive_signals"]),
+            len(external["contradictions"]), fraud_probability
+        ))
+    if not features:
+        return np.empty(0, dtype=np.float64)
+    scores = compute_adaptive_scores_batch(*zip(*features))
+    scores[np.asarray(rejected)] = 0.0  # fast-reject results carry hiring_index 0
+    return scores
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 8: ROLE-BASED MATCHING
 # ═══════════════════════════════════════════════════════════════════════
 
-import re
+_SYMBOL_SKILLS = frozenset({"c++", "c#", "next.js", "node.js"})
+
+
+def _skill_pattern(skill_lower):
+    """Word-boundary pattern for one skill; tricky skills like 'c++', 'c#' get a custom boundary."""
+    if skill_lower in _SYMBOL_SKILLS:
+        return r'(?:\b|\s)' + re.escape(skill_lower) + r'(?:\s|$|\.|\,)'
+    return r'\b' + re.escape(skill_lower) + r'(?:\b|$)'
+
+
+@functools.lru_cache(maxsize=2048)
+def _skill_regex(skill_lower):
+    """Compiled _skill_pattern for a single skill."""
+    return re.compile(_skill_pattern(skill_lower))
+
 
-def _compute_role_match(entities, raw_text, expected_skills):
+@functools.lru_cache(maxsize=256)
+def _skill_scanner(skills):
+    """
+    One lookahead alternation over all skills (longest first), one capture
+    group per skill, so a single finditer reports which skills occur.
+    """
+    return re.compile("(?=" + "|".join(f"({_skill_pattern(s)})" for s in skills) + ")")
+
+
+def _scan_skills(skills, text_lower):
+    """Subset of skills whose boundary pattern matches text_lower, in one pass."""
+    ordered = sorted(skills, key=len, reverse=True)
+    found = set()
+    for m in _skill_scanner(tuple(ordered)).finditer(text_lower):
+        found.add(ordered[m.lastindex - 1])
+        if len(found) == len(ordered):
+            return found
+    # A skill can be shadowed only by a longer skill matching at the same
+    # position, i.e. one it is a prefix of; re-check just those individually.
+    for skill in ordered:
+        if skill not in found and any(skill in f for f in found) and \
+           _skill_regex(skill).search(text_lower):
+            found.add(skill)
+    return found
+
+
+def _compute_role_match(entities, ctx, expected_skills):
     """
     Computes how well the candidate's skills align with the expected skills.
     Extracts from structured entities and uses regex boundary checks on raw text.
     expected_skills should be a list of strings extracted by the AI upfront.
     """
-    resume_skills = [s.lower() for s in (entities.get("skills", []) or [])]
-    raw_text_lower = raw_text.lower() if raw_text else ""
+    resume_skills = [n for n in map(_norm, entities.get("skills", []) or []) if n]
+    raw_text_lower = ctx.text_lower
     
     if not expected_skills:
         return {
@@ -585,26 +987,22 @@ def _compute_role_match(entities, raw_text, expected_skills):
         }
         
     matched = set()
-    missing = set()
-    
-    # Check each expected skill
+    unresolved = []
+    resume_skill_set = set(resume_skills)
+
+    # Check each expected skill against the structured parsed list first
     for skill in expected_skills:
-        skill_lower = skill.lower().strip()
-        # Check if in structured parsed list
-        if any(skill_lower == s or skill_lower in s or s in skill_lower for s in resume_skills):
+        skill_lower = _norm(skill)
+        if skill_lower in resume_skill_set or \
+           any(skill_lower in s or s in skill_lower for s in resume_skills):
             matched.add(skill_lower)
         else:
-            # Fallback: Check raw unstructured text with word boundaries
-            # Handle tricky skills like 'c++', 'c#' which have punctuation
-            pattern = r'\b' + re.escape(skill_lower) + r'(?:\b|$)' 
-            if skill_lower in ["c++", "c#", "next.js", "node.js"]:
-                # custom boundary for symbols
-                pattern = r'(?:\b|\s)' + re.escape(skill_lower) + r'(?:\s|$|\.|\,)'
-            
-            if re.search(pattern, raw_text_lower):
-                matched.add(skill_lower)
-            else:
-                missing.add(skill_lower)
+            unresolved.append(skill_lower)
+
+    # Fallback: one scan of the raw unstructured text for all remaining skills
+    if unresolved:
+        matched |= _scan_skills(tuple(sorted(set(unresolved))), raw_text_lower)
+    missing = set(unresolved) - matched
     
     match_ratio = len(matched) / len(expected_skills) if expected_skills else 0
     match_score = round(match_ratio * 100)
@@ -619,8 +1017,8 @@ def _compute_role_match(entities, raw_text, expected_skills):
         "match_score": match_score,
         "is_evaluated": True,
         "verdict": v_str,
-        "matched_skills": list(matched),
-        "missing_skills": list(missing)
+        "matched_skills": sorted(matched),
+        "missing_skills": sorted(missing)
     }
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -629,7 +1027,7 @@ def _compute_role_match(entities, raw_text, expected_skills):
 
 def _generate_intelligence_verdict(stage, stage_confidence, narrative, proportionality,
                                     consistency, external, core_metrics, score, domain, 
-                                    verification_results=None, evidence_strength=None, fraud_probability=0.0, role_match=None):
+                                    ai_forensic=None, evidence_strength=None, fraud_probability=0.0, role_match=None):
     """
     Generates a professional, recruiter-readable verdict.
     Reasoning comes before numbers. No dramatic language.
@@ -696,17 +1094,7 @@ def _generate_intelligence_verdict(stage, stage_confidence, narrative, proportio
     )
 
     # 7. AI Forensic Overlay (The "Honest" Voice)
-    # Check for Groq Forensic results in verification_results
-    ai_forensic = {}
-    if verification_results:
-        # Standard location in older pipeline
-        ai_forensic = verification_results.get("api_signals", {}).get("ai_consensus", {})
-        # Support for unified_data from new Groq-Native pipeline
-        if not ai_forensic:
-            ai_forensic = verification_results.get("ai_consensus", {}).get("unified_data", {})
-        if not ai_forensic:
-            ai_forensic = verification_results.get("unified_data", {})
-
+    ai_forensic = ai_forensic or {}
     forensic_critique = ai_forensic.get("forensic_narrative")
     if forensic_critique:
         lines.insert(0, f"AI FORENSIC ANALYSIS: {forensic_critique}")
@@ -767,12 +1155,37 @@ def _map_domain_to_key(domain):
     if "full" in d: return "fullstack"
     return "generic"
 
+def _external_sources(verification_results):
+    """(github, stack_overflow, email_trust) dicts, navigated once per resume."""
+    if not verification_results:
+        return {}, {}, {}
+    api_signals = verification_results.get("api_signals", {})
+    return (api_signals.get("github", {}), api_signals.get("stackoverflow", {}),
+            verification_results.get("email_trust", {}))
+
+def _extract_ai_forensic(verification_results):
+    """Groq forensic block from whichever pipeline shape produced verification_results."""
+    if not verification_results:
+        return {}
+    # Standard location in older pipeline, then unified_data from the Groq-Native pipeline
+    return (verification_results.get("api_signals", {}).get("ai_consensus", {})
+            or verification_results.get("ai_consensus", {}).get("unified_data", {})
+            or verification_results.get("unified_data", {}))
+
+@functools.lru_cache(maxsize=4096)
+def _norm(s):
+    """Lower-cased, trimmed skill string; skills recur heavily across a batch."""
+    return s.lower().strip()
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 11: DETERMINISTIC STRUCTURED ANALYSIS TABLE
 # Generates the Forensic Verification Signals Card without any AI calls.
 # ═══════════════════════════════════════════════════════════════════════
 
+_CAPABILITY_CERTAINTY = {"Strong": "High", "Moderate": "Medium"}  # anything else -> "Low"
+
+
 def build_structured_analysis(external_signals, consistency, evidence_strength,
                                core_metrics, fraud_probability, entities, verification_results):
     """
@@ -795,7 +1208,7 @@ def build_structured_analysis(external_signals, consistency, evidence_strength,
     gh_metrics = github.get("metrics", {})
 
     if github.get("exists"):
-        account_age = datetime.now().year - (gh_metrics.get("account_created_year") or datetime.now().year)
+        account_age = CURRENT_YEAR - (gh_metrics.get("account_created_year") or CURRENT_YEAR)
         repo_count  = gh_metrics.get("repo_count", 0)
         last_commit = gh_metrics.get("last_commit_days_ago", 9999)
         top_lang    = gh_metrics.get("top_language", "Unknown")
@@ -904,7 +1317,7 @@ def build_structured_analysis(external_signals, consistency, evidence_strength,
     else:
         risk_level = "High"
 
-    capability_certainty = "High" if ev_level == "Strong" else ("Medium" if ev_level == "Moderate" else "Low")
+    capability_certainty = _CAPABILITY_CERTAINTY.get(ev_level, "Low")
 
     gh_repos = gh_metrics.get("repo_count", 0) if github.get("exists") else 0
     digital_depth = "Strong" if gh_repos > 10 else ("Moderate" if gh_repos > 3 else "Weak")
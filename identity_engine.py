@@ -1,6 +1,33 @@
-import requests
 import re
-from difflib import SequenceMatcher
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from linkedin_reach import profile_reachable
+
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+    from rapidfuzz.process import cdist as _cdist
+except ImportError:  # optional — pure-Python difflib on the same 0-1 scale
+    from difflib import SequenceMatcher
+    _fuzz_ratio = _cdist = None
+
+_NON_ALPHA = re.compile(r'[^a-zA-Z]')
+_DIGIT_RUN = re.compile(r'[0-9]{4,}')
+_LI_SLUG = re.compile(r'linkedin\.com/in/([^/?]+)')
+
+SIMILARITY_CACHE_SIZE = 4096
+_REACHABLE_STATUSES = frozenset({200})  # after redirects
+BATCH_WORKERS = 16
+
+@lru_cache(maxsize=SIMILARITY_CACHE_SIZE)
+def _similarity(a, b):
+    """
+    0-1 string similarity (rapidfuzz normalized Indel ratio, difflib
+    SequenceMatcher when not installed), memoized for repeated pairs.
+    """
+    if _fuzz_ratio is not None:
+        return _fuzz_ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
 
 def verify_identity(resume_data, linkedin_url):
     """
@@ -17,15 +44,15 @@ def verify_identity(resume_data, linkedin_url):
     # 2. Name Similarity (Fuzzy Match)
     similarity = 0
     if slug and candidate_name:
-        clean_slug = re.sub(r'[^a-zA-Z]', '', slug)
-        clean_name = re.sub(r'[^a-zA-Z]', '', candidate_name)
-        similarity = SequenceMatcher(None, clean_slug, clean_name).ratio()
+        clean_slug = _NON_ALPHA.sub('', slug)
+        clean_name = _NON_ALPHA.sub('', candidate_name)
+        similarity = _similarity(clean_slug, clean_name)
     
     # 3. Slug Anomaly Detection
     # Detect random string patterns or excessive digits
     slug_risk_score = 0
     if slug:
-        if re.search(r'[0-9]{4,}', slug): # Many digits
+        if _DIGIT_RUN.search(slug): # Many digits
             slug_risk_score += 20
         if len(slug) < 3: # Too short
             slug_risk_score += 30
@@ -34,7 +61,7 @@ def verify_identity(resume_data, linkedin_url):
     email_user = email.split('@')[0] if '@' in email else ""
     handle_consistency = 0
     if email_user and slug:
-        handle_consistency = SequenceMatcher(None, email_user, slug).ratio()
+        handle_consistency = _similarity(email_user, slug)
 
     # 5. Composite Scoring
     confidence = 80
@@ -59,18 +86,39 @@ def verify_identity(resume_data, linkedin_url):
         "risk_flags": risk_flags
     }
 
+def verify_identity_batch(resumes, linkedin_urls):
+    """
+    verify_identity over parallel lists. The HEAD checks dominate and are
+    network-bound, so they overlap on a thread pool sharing linkedin_reach's
+    connection pool. Results keep input order.
+    """
+    if not resumes:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(resumes), BATCH_WORKERS)) as pool:
+        return list(pool.map(verify_identity, resumes, linkedin_urls))
+
+def slug_similarity_matrix(candidate_names, linkedin_urls):
+    """
+    N x M name-vs-slug similarity (0-1) with verify_identity's cleaning;
+    one native cdist call when rapidfuzz is installed. Pairs with a missing
+    name or slug score 0.
+    """
+    names = [_NON_ALPHA.sub('', n.lower()) if n else None for n in candidate_names]
+    slugs = [extract_linkedin_slug(u) for u in linkedin_urls]
+    slugs = [_NON_ALPHA.sub('', s) if s else None for s in slugs]
+    if _cdist is not None:
+        scores = _cdist([n or "" for n in names], [s or "" for s in slugs], scorer=_fuzz_ratio, workers=-1) / 100.0
+        scores[[n is None for n in names], :] = 0.0
+        scores[:, [s is None for s in slugs]] = 0.0
+        return scores
+    return np.array([[_similarity(s, n) if n is not None and s is not None else 0.0 for s in slugs]
+                     for n in names], dtype=np.float32).reshape(len(names), len(slugs))
+
 def check_linkedin_reachability(url):
-    if not url or "linkedin.com/in/" not in url:
-        return False
-    try:
-        # Simplified for demo; production would use rotating proxy/headers
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
-        return resp.status_code == 200
-    except:
-        return False
+    # Simplified for demo; production would use rotating proxy/headers
+    return profile_reachable(url, _REACHABLE_STATUSES, allow_redirects=True)
 
 def extract_linkedin_slug(url):
     if not url: return None
-    match = re.search(r'linkedin\.com/in/([^/?]+)', url)
+    match = _LI_SLUG.search(url)
     return match.group(1) if match else None
@@ -7,46 +7,82 @@ import os
 import io
 import json
 import base64
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import fitz  # PyMuPDF
-import pdfplumber
+import numpy as np
 from shutil import which
 from PIL import Image, ImageFilter
 import pytesseract
 from dotenv import load_dotenv
+import llm_cache
+
+try:
+    import cv2
+except ImportError:  # optional — PIL's SHARPEN filter runs the same kernel, ~10x slower
+    cv2 = None
+
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:  # optional — pytesseract spawns a tesseract process per pass instead
+    PyTessBaseAPI = None
 
 load_dotenv()
 
 # Configure Tesseract Path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# OCR renders at Tesseract's sweet spot first; pages that still read thin
+# (< 300 chars) are re-rendered at the higher DPI and OCR'd again.
+OCR_DPI = 200
+OCR_RETRY_DPI = 300
+
+# Part of every ingest_document cache key: bump it whenever extraction or the
+# result shape changes, so cached results from older code are not served.
+INGEST_CACHE_VERSION = 1
+# Cached ingest results carry the full resume text, so they are kept only long
+# enough to absorb re-uploads of the same batch; llm_cache deletes expired rows.
+INGEST_CACHE_TTL = 86400  # 1 day
+
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 1: PDF-to-Image Renderer (NO POPPLER)
 # ═══════════════════════════════════════════════════════════════════════
-def pdf_to_images(file_bytes, dpi=300, max_pages=15):
+def pdf_to_images(file_bytes, dpi=OCR_DPI, max_pages=15, include_png=False, pages=None):
     """
-    Renders PDF pages to PNG byte arrays using PyMuPDF only.
+    Renders PDF pages to 8-bit grayscale PIL images using PyMuPDF only
+    (OCR binarizes anyway; gray is a third of the RGB bytes).
     No Poppler dependency. Works on Windows natively.
-    Returns list of (PIL Image, PNG bytes) tuples.
+    Generator: yields one {"page_num", "pil_image", "png_bytes"} dict per page,
+    so only the pages currently being OCR'd are held in memory. PNG encoding
+    is only done with include_png (vision path); otherwise png_bytes is None.
+    pages, if given, restricts rendering to those page numbers.
     """
-    results = []
+    doc = None
     try:
         doc = fitz.open(stream=file_bytes, filetype="pdf")
         if doc.is_encrypted:
             doc.authenticate("")
-        for page_num in range(min(len(doc), max_pages)):
+        page_count = min(len(doc), max_pages)
+        for page_num in (range(page_count) if pages is None else [p for p in pages if p < page_count]):
             page = doc[page_num]
-            pix = page.get_pixmap(dpi=dpi)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            
-            buffer = io.BytesIO()
-            img.save(buffer, format="PNG")
-            png_bytes = buffer.getvalue()
-            
-            results.append({"pil_image": img, "png_bytes": png_bytes})
-        doc.close()
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+            img = Image.frombytes("L", [pix.width, pix.height], pix.samples)
+            pix = None  # frombytes copied the samples; release the MuPDF pixmap now
+
+            png_bytes = None
+            if include_png:
+                buffer = io.BytesIO()
+                img.save(buffer, format="PNG")
+                png_bytes = buffer.getvalue()
+
+            yield {"page_num": page_num, "pil_image": img, "png_bytes": png_bytes}
     except Exception as e:
         print(f"[STAGE 1] PyMuPDF render fault: {e}")
-    return results
+    finally:
+        if doc is not None:
+            doc.close()
 
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 2: Multi-Method Text Extraction
@@ -59,8 +95,10 @@ def extract_text_layers(file_bytes):
     raw_text = ""
     method = "none"
     pages_processed = 0
+    best_len = 0  # len(raw_text.strip()), kept alongside raw_text
+    doc = None
 
-    # 2a. PyMuPDF .get_text("text")
+    # 2a. PyMuPDF .get_text("text") — the document is parsed once for 2a and 2b
     try:
         doc = fitz.open(stream=file_bytes, filetype="pdf")
         if doc.is_encrypted:
@@ -69,41 +107,35 @@ def extract_text_layers(file_bytes):
                 doc.close()
                 return "", "encrypted", 0
         pages_processed = len(doc)
-        for page in doc:
-            raw_text += page.get_text("text")
-        doc.close()
-        if len(raw_text.strip()) >= 500:
+        raw_text = "".join(page.get_text("text") for page in doc)
+        best_len = len(raw_text.strip())
+        if best_len >= 500:
             method = "pymupdf_text"
     except Exception as e:
         print(f"[STAGE 2a] PyMuPDF text fault: {e}")
 
-    # 2b. PyMuPDF .get_text("blocks") fallback
-    if len(raw_text.strip()) < 500:
+    # 2b. PyMuPDF .get_text("blocks") fallback on the already-open document
+    if doc is not None and best_len < 500:
         try:
-            doc = fitz.open(stream=file_bytes, filetype="pdf")
-            if doc.is_encrypted:
-                doc.authenticate("")
-            block_text = ""
-            for page in doc:
-                blocks = page.get_text("blocks")
-                for b in blocks:
-                    if b[6] == 0:
-                        block_text += b[4]
-            doc.close()
-            if len(block_text.strip()) > len(raw_text.strip()):
-                raw_text = block_text
+            block_text = "".join(
+                b[4] for page in doc for b in page.get_text("blocks") if b[6] == 0
+            )
+            block_len = len(block_text.strip())
+            if block_len > best_len:
+                raw_text, best_len = block_text, block_len
                 method = "pymupdf_blocks"
         except Exception as e:
             print(f"[STAGE 2b] PyMuPDF blocks fault: {e}")
+    if doc is not None:
+        doc.close()
 
     # 2c. pdfplumber fallback
-    if len(raw_text.strip()) < 500:
+    if best_len < 500:
         try:
+            import pdfplumber  # deferred: pdfminer costs ~130 ms to import and 2c is rare
             with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                plumber_text = ""
-                for page in pdf.pages:
-                    plumber_text += (page.extract_text() or "")
-                if len(plumber_text.strip()) > len(raw_text.strip()):
+                plumber_text = "".join(page.extract_text() or "" for page in pdf.pages)
+                if len(plumber_text.strip()) > best_len:
                     raw_text = plumber_text
                     method = "pdfplumber"
         except Exception as e:
@@ -114,37 +146,115 @@ def extract_text_layers(file_bytes):
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 3: Advanced Multi-Pass OCR
 # ═══════════════════════════════════════════════════════════════════════
+BINARIZE_THRESHOLD = 140
+# A full page of 11pt text binarizes to ~90% white and two lines to ~99.7%;
+# above this it is blank paper or scanner specks, not worth any OCR pass.
+BLANK_PAGE_WHITE_RATIO = 0.999
+# psm 6 text with at least this many letters is real content; the wider
+# psm 3 / 11 layouts are only tried on pages it could not read at all.
+MIN_PSM6_ALPHA = 50
+# ImageFilter.SHARPEN's kernel, for the OpenCV path
+_SHARPEN_KERNEL = np.array([[-2, -2, -2], [-2, 32, -2], [-2, -2, -2]], dtype=np.float32) / 16
+
+def _sharpen(gray):
+    """SHARPEN as a uint8 array: cv2.filter2D when installed, PIL otherwise."""
+    if cv2 is None:
+        return np.asarray(gray.filter(ImageFilter.SHARPEN))
+    arr = np.asarray(gray)
+    out = cv2.filter2D(arr, -1, _SHARPEN_KERNEL)
+    # PIL leaves the 1-px border unfiltered; match it
+    out[0], out[-1] = arr[0], arr[-1]
+    out[:, 0], out[:, -1] = arr[:, 0], arr[:, -1]
+    return out
+
+def _binarize(img):
+    """Grayscale -> Sharpen -> threshold, as a bool array (True = white)."""
+    gray = img if img.mode == "L" else img.convert("L")
+    return _sharpen(gray) > BINARIZE_THRESHOLD
+
 def preprocess_image(img):
     """Grayscale -> Sharpen -> Binarize for maximum OCR yield."""
-    gray = img.convert("L")
-    sharpened = gray.filter(ImageFilter.SHARPEN)
-    binarized = sharpened.point(lambda x: 255 if x > 140 else 0, '1')
-    return binarized
+    # a bool array becomes a mode '1' image directly
+    return Image.fromarray(_binarize(img))
+
+_tess_local = threading.local()
+
+def _tess_api():
+    """This thread's in-process Tesseract; the eng model is loaded once per OCR worker."""
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        api = _tess_local.api = PyTessBaseAPI(lang="eng")  # OEM default == --oem 3
+    return api
 
 def run_ocr_pass(image, psm=6):
     try:
+        if PyTessBaseAPI is not None:
+            api = _tess_api()
+            api.SetPageSegMode(psm)
+            api.SetImage(image)
+            return api.GetUTF8Text()
         config = f"--oem 3 --psm {psm}"
         return pytesseract.image_to_string(image, lang="eng", config=config)
     except Exception as e:
         print(f"[OCR] Pass psm={psm} fault: {e}")
         return ""
 
-def multi_pass_ocr(page_renders):
-    """Multi-pass OCR: psm 6 -> 3 -> 11 for maximum text recovery."""
-    all_parts = []
-    for render in page_renders:
-        img = render["pil_image"]
-        processed = preprocess_image(img)
-
-        text = run_ocr_pass(processed, psm=6)
-        if len(text.strip()) < 300:
-            t2 = run_ocr_pass(processed, psm=3)
-            if len(t2.strip()) > len(text.strip()): text = t2
-        if len(text.strip()) < 300:
-            t3 = run_ocr_pass(processed, psm=11)
-            if len(t3.strip()) > len(text.strip()): text = t3
-
-        all_parts.append(text)
+def _ocr_page(render):
+    """One page through preprocessing and the escalating psm 6 -> 3 -> 11 passes."""
+    img = render["pil_image"]
+    mask = _binarize(img)
+    img.close()  # only the binarized copy is needed from here on
+    if mask.mean() > BLANK_PAGE_WHITE_RATIO:
+        return ""
+    processed = Image.fromarray(mask)
+
+    text = run_ocr_pass(processed, psm=6)
+    if sum(c.isalpha() for c in text) >= MIN_PSM6_ALPHA:
+        return text
+    if len(text.strip()) < 300:
+        t2 = run_ocr_pass(processed, psm=3)
+        if len(t2.strip()) > len(text.strip()): text = t2
+    if len(text.strip()) < 300:
+        t3 = run_ocr_pass(processed, psm=11)
+        if len(t3.strip()) > len(text.strip()): text = t3
+    return text
+
+def _ocr_stream(pool, renders, window):
+    """Yields (page_num, text) in input order, keeping at most `window` pages in flight."""
+    in_flight = deque()
+    for render in renders:
+        in_flight.append((render.get("page_num"), pool.submit(_ocr_page, render)))
+        if len(in_flight) >= window:
+            page_num, future = in_flight.popleft()
+            yield page_num, future.result()
+    while in_flight:
+        page_num, future = in_flight.popleft()
+        yield page_num, future.result()
+
+def multi_pass_ocr(page_renders, rerender=None):
+    """
+    Multi-pass OCR: psm 6 -> 3 -> 11 for maximum text recovery.
+    Pages run concurrently: each pass is a tesseract subprocess (or a
+    tesserocr call, which releases the GIL), so threads overlap them. page_renders may be a generator;
+    at most `workers` pages are rendered ahead of the OCR results, which
+    bounds peak memory. Page order is preserved.
+    rerender(page_nums), if given, yields higher-resolution renders for the
+    pages that came back under 300 chars; the longer text wins per page.
+    Rendering always stays on the calling thread (PyMuPDF is not thread-safe).
+    """
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(_ocr_stream(pool, page_renders, workers))
+        all_parts = [text for _, text in results]
+
+        if rerender is not None:
+            thin = {page_num: i for i, (page_num, text) in enumerate(results)
+                    if page_num is not None and len(text.strip()) < 300}
+            if thin:
+                for page_num, text in _ocr_stream(pool, rerender(list(thin)), workers):
+                    i = thin[page_num]
+                    if len(text.strip()) > len(all_parts[i].strip()):
+                        all_parts[i] = text
     return "\n".join(all_parts)
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -155,21 +265,29 @@ def multi_pass_ocr(page_renders):
 # ═══════════════════════════════════════════════════════════════════════
 # STAGE 6: Page Classification
 # ═══════════════════════════════════════════════════════════════════════
+_RESUME_SIGNALS = ("experience", "education", "skills", "work history", "objective", "summary", "certifications")
+_INVOICE_SIGNALS = ("invoice", "total amount", "bill to", "due date", "payment")
+_COVER_SIGNALS = ("dear hiring", "i am writing", "position of", "sincerely")
+
+def _has_hits(text_lower, signals, needed=2):
+    """True once `needed` signals are found — stops scanning at that point."""
+    hits = 0
+    for s in signals:
+        if s in text_lower:
+            hits += 1
+            if hits >= needed:
+                return True
+    return False
+
 def classify_page_type(text):
     """Classifies document as Resume, CV, Cover Letter, Invoice, or Unknown."""
     text_lower = text.lower()
-    resume_signals = ["experience", "education", "skills", "work history", "objective", "summary", "certifications"]
-    invoice_signals = ["invoice", "total amount", "bill to", "due date", "payment"]
-    cover_signals = ["dear hiring", "i am writing", "position of", "sincerely"]
-
-    resume_hits = sum(1 for s in resume_signals if s in text_lower)
-    invoice_hits = sum(1 for s in invoice_signals if s in text_lower)
-    cover_hits = sum(1 for s in cover_signals if s in text_lower)
-
-    if resume_hits >= 2: return "resume"
-    if invoice_hits >= 2: return "invoice"
-    if cover_hits >= 2: return "cover_letter"
-    if resume_hits >= 1: return "resume"
+    # Same precedence as before, but each category is only scanned if the
+    # earlier ones did not decide — a typical resume settles in two scans.
+    if _has_hits(text_lower, _RESUME_SIGNALS): return "resume"
+    if _has_hits(text_lower, _INVOICE_SIGNALS): return "invoice"
+    if _has_hits(text_lower, _COVER_SIGNALS): return "cover_letter"
+    if _has_hits(text_lower, _RESUME_SIGNALS, needed=1): return "resume"
     return "unknown"
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -204,7 +322,8 @@ def hallucination_guard(structured_data, raw_text):
     if name and raw_text:
         # Check if at least part of the name appears in raw text
         name_parts = name.lower().split()
-        found = any(part in raw_text.lower() for part in name_parts if len(part) > 2)
+        text_lower = raw_text.lower()  # once, not per name part
+        found = any(part in text_lower for part in name_parts if len(part) > 2)
         if not found and len(raw_text) > 100:
             structured_data["_hallucination_warning"] = "Name not found in extracted text"
             suspicious = True
@@ -237,6 +356,16 @@ def calculate_confidence(text, method, vision_consensus=0):
 # ═══════════════════════════════════════════════════════════════════════
 # MAIN ORCHESTRATOR
 # ═══════════════════════════════════════════════════════════════════════
+# Content-addressed: re-uploads of the same PDF (any filename) skip render/OCR
+# for INGEST_CACHE_TTL. Failed ingestions are not stored, so a transient fault
+# is retried next time.
+@llm_cache.cached(
+    "ingest_document",
+    key_fn=lambda file_bytes, filename: (INGEST_CACHE_VERSION,
+                                         hashlib.blake2b(file_bytes or b"", digest_size=16).hexdigest()),
+    ttl=INGEST_CACHE_TTL,
+    should_cache=lambda result: result.get("success"),
+)
 def ingest_document(file_bytes, filename):
     """
     Industrial 10-Stage Document Intelligence Pipeline.
@@ -249,19 +378,20 @@ def ingest_document(file_bytes, filename):
     if file_bytes[:5] != b'%PDF-':
         return _result(False, "", "none", 0, 0, error="File is not a valid PDF (bad header).")
 
-    # ── STAGE 1: Render pages to images (PyMuPDF only, no Poppler) ────
-    page_renders = pdf_to_images(file_bytes, dpi=300, max_pages=5)
-
     # ── STAGE 2: Multi-method text extraction ─────────────────────────
     raw_text, method, pages_processed = extract_text_layers(file_bytes)
 
     if method == "encrypted":
         return _result(False, "", "none", 0, 0, error="Encrypted PDF — password required.")
 
-    # ── STAGE 3: OCR Pipeline (if text < 500 chars) ───────────────────
-    if len(raw_text.strip()) < 500 and page_renders:
+    # ── STAGE 1 + 3: Render pages (PyMuPDF only, no Poppler) and OCR ──
+    # Rendering is only needed for OCR, so it happens lazily, page by page.
+    if len(raw_text.strip()) < 500:
         print(f"[STAGE 3] Low text density ({len(raw_text.strip())} chars). Running multi-pass OCR...")
-        ocr_text = multi_pass_ocr(page_renders)
+        ocr_text = multi_pass_ocr(
+            pdf_to_images(file_bytes, dpi=OCR_DPI, max_pages=5),
+            rerender=lambda pages: pdf_to_images(file_bytes, dpi=OCR_RETRY_DPI, max_pages=5, pages=pages)
+        )
         if len(ocr_text.strip()) > len(raw_text.strip()):
             raw_text = ocr_text
             method = "ocr_pymupdf"
@@ -1,25 +1,34 @@
 import re
-import requests
 import os
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from dotenv import load_dotenv
+import llm_cache
+from linkedin_reach import profile_reachable
 
 load_dotenv()
 
+_LI_URL = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/([a-zA-Z0-9-]+)/?')
+_LONG_DIGIT_RUN = re.compile(r'\d{8,}')
+_NON_ALPHA = re.compile(r'[^a-zA-Z]')
+_WORD = re.compile(r'\w+')
+
+# LinkedIn returns 200, 999 (custom rate limit), or 403 (forbidden for bots)
+_REACHABLE_STATUSES = frozenset({200, 999, 403})
+
 def extract_linkedin(text):
     """
     Deterministic LinkedIn URL extraction.
     Supports various formats and normalizes to canonical form.
     """
-    # Pattern to find LinkedIn URLs
-    pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/([a-zA-Z0-9-]+)/?'
-    matches = re.findall(pattern, text)
+    # First LinkedIn URL only (search stops at the first hit)
+    match = _LI_URL.search(text)
     
-    if not matches:
+    if not match:
         return {"linkedin_url": "", "linkedin_slug": ""}
     
-    slug = matches[0].rstrip('/.,')
+    slug = match.group(1).rstrip('/.,')
     canonical_url = f"https://www.linkedin.com/in/{slug}"
     
     return {
@@ -37,35 +46,32 @@ def verify_linkedin_authenticity(url, resume_name):
 
     slug = url.split('/')[-1]
     
-    # 1. Reachability Check (HEAD request)
+    # 1. Reachability Check (HEAD request) — non-profile URLs never hit the network
     reachable = False
-    try:
-        response = requests.head(url, timeout=5, headers={"User-Agent": "Mozilla/5.0"})
-        # LinkedIn returns 200, 999 (custom rate limit), or 403 (forbidden for bots)
-        reachable = response.status_code in [200, 999, 403]
-    except:
-        reachable = False
+    if "linkedin.com/in/" in url:
+        reachable = profile_reachable(url, _REACHABLE_STATUSES)
 
     # 2. Slug Validity Check
     # Length > 3, no suspicious patterns (e.g., long numeric strings)
     slug_valid = len(slug) > 3
-    is_suspicious = bool(re.search(r'\d{8,}', slug)) # 8+ consecutive digits is usually a default/lazy slug
+    is_suspicious = bool(_LONG_DIGIT_RUN.search(slug)) # 8+ consecutive digits is usually a default/lazy slug
     if is_suspicious:
         slug_valid = False
 
     # 3. Identity Match Score (0-10)
     identity_score = 0
     if resume_name and slug:
-        clean_name = re.sub(r'[^a-zA-Z]', '', resume_name.lower())
-        clean_slug = re.sub(r'[^a-zA-Z]', '', slug.lower())
+        name_lower, slug_lower = resume_name.lower(), slug.lower()
+        clean_name = _NON_ALPHA.sub('', name_lower)
+        clean_slug = _NON_ALPHA.sub('', slug_lower)
         
         # Simple overlap check
         if clean_name in clean_slug or clean_slug in clean_name:
             identity_score = 10
         else:
             # Fuzzy match simulation: count matching chars or parts
-            name_parts = set(re.findall(r'\w+', resume_name.lower()))
-            slug_parts = set(re.findall(r'\w+', slug.lower()))
+            name_parts = set(_WORD.findall(name_lower))
+            slug_parts = set(_WORD.findall(slug_lower))
             overlap = name_parts & slug_parts
             identity_score = min(10, len(overlap) * 5)
 
@@ -77,39 +83,71 @@ def verify_linkedin_authenticity(url, resume_name):
         "slug": slug
     }
 
+# Static instructions first, resume last: the shared prefix is what
+# provider-side prompt caching can reuse across calls.
+_SUMMARY_PROMPT = """
+You are a professional career coach.
+Based ONLY on the following resume text, generate a short 2-3 line professional summary.
+Rules:
+- Professional tone
+- 2-3 lines max
+- No exaggeration
+- Focus on key skills and experience level
+
+Resume:
+"""
+SUMMARY_NO_KEY = "Professional summary unavailable (API Key missing)."
+SUMMARY_EMPTY = "Summary could not be generated."
+SUMMARY_FAILED = "Summary generation failed."
+SUMMARY_WORKERS = 8  # concurrent Gemini calls in generate_career_summaries_batch
+
+_GENAI_CLIENT = None
+_GENAI_LOCK = threading.Lock()
+
+def _client():
+    """Lazily builds one shared genai.Client (None when no API key is configured)."""
+    global _GENAI_CLIENT
+    if _GENAI_CLIENT is None:
+        with _GENAI_LOCK:
+            if _GENAI_CLIENT is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if api_key:
+                    _GENAI_CLIENT = genai.Client(api_key=api_key)
+    return _GENAI_CLIENT
+
+@llm_cache.cached(
+    "career_summary",
+    key_fn=lambda text: (text[:3000],),
+    should_cache=lambda summary: summary not in (SUMMARY_NO_KEY, SUMMARY_EMPTY, SUMMARY_FAILED),
+)
 def generate_career_summary(text):
     """
     AI Enrichment Layer: Generates 2-3 line professional summary.
     """
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            return "Professional summary unavailable (API Key missing)."
-
-        client = genai.Client(api_key=api_key)
-        
-        prompt = f"""
-        You are a professional career coach. 
-        Based ONLY on the following resume text, generate a short 2-3 line professional summary.
-        Rules:
-        - Professional tone
-        - 2-3 lines max
-        - No exaggeration
-        - Focus on key skills and experience level
-        
-        Resume:
-        {text[:3000]}
-        """
+        client = _client()
+        if client is None:
+            return SUMMARY_NO_KEY
 
         response = client.models.generate_content(
             model="gemini-1.5-flash",
-            contents=prompt,
+            contents=_SUMMARY_PROMPT + text[:3000],
         )
 
-        return response.text.strip() if response.text else "Summary could not be generated."
+        return response.text.strip() if response.text else SUMMARY_EMPTY
     except Exception as e:
         print(f"AI Summary Error: {e}")
-        return "Summary generation failed."
+        return SUMMARY_FAILED
+
+def generate_career_summaries_batch(texts):
+    """
+    generate_career_summary over many resumes, SUMMARY_WORKERS calls in flight.
+    Results are aligned with texts; cached summaries return without a call.
+    """
+    if not texts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(SUMMARY_WORKERS, len(texts))) as pool:
+        return list(pool.map(generate_career_summary, texts))
 
 def score_linkedin(auth_data, resume_data):
     """
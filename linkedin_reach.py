@@ -0,0 +1,68 @@
+"""
+linkedin_reach.py — Shared LinkedIn Profile Reachability Check
+One keep-alive HTTP session and one TTL-LRU of HEAD answers per profile slug,
+used by identity_engine and linkedin_engine. The status code is cached rather
+than a verdict, so each caller applies its own rule for what counts as reachable;
+only final answers (FINAL_STATUSES) are cached.
+"""
+import re
+import time
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_PROFILE_SLUG = re.compile(r'linkedin\.com/in/([^/?]+)')
+
+POOL_SIZE = 16
+
+# Shared keep-alive pool: repeated HEADs to linkedin.com reuse the TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "Mozilla/5.0"
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+
+# Status codes by (slug, allow_redirects). Only final answers are cached:
+# rate limits (999, 403, 429), 5xx, timeouts and connection errors are
+# retried on the next call instead of pinning a profile for the whole TTL.
+FINAL_STATUSES = frozenset({200, 404, 410})
+REACH_CACHE_TTL = 3600  # seconds
+REACH_CACHE_SIZE = 10_000
+_status_cache = OrderedDict()  # (slug lower-case, allow_redirects) -> (checked_at, status_code)
+_status_cache_lock = threading.Lock()
+
+
+def _cached_status(key):
+    with _status_cache_lock:
+        hit = _status_cache.get(key)
+    if hit and time.monotonic() - hit[0] < REACH_CACHE_TTL:
+        return hit[1]
+    return None
+
+
+def _store_status(key, status):
+    with _status_cache_lock:
+        _status_cache[key] = (time.monotonic(), status)
+        _status_cache.move_to_end(key)
+        if len(_status_cache) > REACH_CACHE_SIZE:
+            _status_cache.popitem(last=False)
+
+
+def profile_reachable(url, ok_statuses, allow_redirects=False):
+    """
+    HEADs a linkedin.com/in/ profile URL; True when its status is in ok_statuses.
+    Non-profile URLs never hit the network; network errors count as unreachable.
+    """
+    match = _PROFILE_SLUG.search(url or "")
+    if not match:
+        return False
+    key = (match.group(1).lower(), allow_redirects)
+    status = _cached_status(key)
+    if status is None:
+        try:
+            status = _SESSION.head(url, timeout=5, allow_redirects=allow_redirects).status_code
+        except requests.RequestException:
+            return False
+        if status in FINAL_STATUSES:
+            _store_status(key, status)
+    return status in ok_statuses
@@ -0,0 +1,300 @@
+"""
+llm_cache.py — Persistent LLM Response Cache
+Exact-match cache for deterministic LLM calls, keyed by a SHA-256 of the
+prompt inputs and stored in SQLite so hits survive restarts and re-runs.
+
+Tier 2 (optional, per call site): near-duplicate lookup. Texts are embedded
+as L2-normalized hashed word-trigram vectors; a cosine similarity above
+SEMANTIC_THRESHOLD against a previously cached text reuses its response, so
+re-submitted resumes with whitespace/minor edits skip the LLM too.
+
+Usage:
+    @llm_cache.cached("gemini_fallback", key_fn=lambda text, fields: (sorted(fields), text[:4000]))
+    def call_gemini_fallback(text, fields): ...
+"""
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import functools
+import threading
+import numpy as np
+from collections import OrderedDict
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # optional dependency — an exact in-memory key set does the same job
+    ScalableBloomFilter = None
+
+log = logging.getLogger("HonestRecruiter.LLMCache")
+
+CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), "llm_cache.db")
+DEFAULT_TTL = 7 * 86400  # 7 days
+PURGE_EVERY_WRITES = 500  # expired rows are deleted at init and then every N writes
+
+SEMANTIC_DIM = 4096
+SEMANTIC_THRESHOLD = 0.92
+SEMANTIC_INDEX_SCOPES = 256  # scopes kept loaded in memory (LRU); others reload from SQLite
+_TOKEN_RE = re.compile(r'\w+')
+
+# scope -> (row ids, float64 expiry times, float32 matrix of unit vectors);
+# loaded lazily from SQLite, least recently used scopes evicted first
+_semantic_index = OrderedDict()
+_semantic_lock = threading.Lock()
+
+# In-memory pre-screen of exact keys: a negative answer skips the SQLite
+# round-trip entirely. Keys written by other processes after startup are not
+# seen here, which only costs a recomputation, never a wrong hit.
+_key_filter = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001) if ScalableBloomFilter else set()
+_key_filter_lock = threading.Lock()
+
+# Schema + key filter are set up on first use rather than at import, so
+# importing a module that uses the cache never touches the filesystem.
+_initialized = False
+_init_lock = threading.Lock()
+
+_writes_since_purge = 0
+_purge_lock = threading.Lock()
+
+
+def _get_connection():
+    _ensure_init()
+    return sqlite3.connect(CACHE_DB_PATH)
+
+
+def _ensure_init():
+    if not _initialized:
+        init_cache()
+
+
+def init_cache():
+    """Creates the tables, purges expired rows and loads live keys into the key filter (idempotent)."""
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        conn = sqlite3.connect(CACHE_DB_PATH)
+        try:
+            _create_schema(conn)
+        finally:
+            conn.close()
+        _initialized = True
+
+
+def _create_schema(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            value BLOB,
+            created REAL,
+            ttl REAL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS llm_semantic_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            scope TEXT,
+            vec BLOB,
+            value BLOB,
+            created REAL,
+            ttl REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_semantic_scope ON llm_semantic_cache (scope)')
+    _purge_expired(conn)
+    with _key_filter_lock:
+        for (key,) in conn.execute('SELECT key FROM llm_cache WHERE created + ttl > ?', (time.time(),)):
+            _key_filter.add(key)
+
+
+def _purge_expired(conn):
+    """Deletes rows past their TTL, so expiry is enforced on disk and not only hidden at read time."""
+    now = time.time()
+    conn.execute('DELETE FROM llm_cache WHERE created + ttl <= ?', (now,))
+    conn.execute('DELETE FROM llm_semantic_cache WHERE created + ttl <= ?', (now,))
+    conn.commit()
+
+
+def _count_write(conn):
+    """Runs _purge_expired on every PURGE_EVERY_WRITES-th write."""
+    global _writes_since_purge
+    with _purge_lock:
+        _writes_since_purge += 1
+        due = _writes_since_purge >= PURGE_EVERY_WRITES
+        if due:
+            _writes_since_purge = 0
+    if due:
+        _purge_expired(conn)
+
+
+def make_key(namespace, *parts):
+    """SHA-256 over the namespace and every prompt-defining input."""
+    raw = "|".join([namespace, *(json.dumps(p, sort_keys=True, ensure_ascii=False) for p in parts)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get(key):
+    """Returns the cached value, or None on miss/expiry."""
+    try:
+        _ensure_init()
+        if key not in _key_filter:
+            return None
+        conn = _get_connection()
+        try:
+            row = conn.execute(
+                'SELECT value FROM llm_cache WHERE key = ? AND created + ttl > ?', (key, time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("LLM cache read failed: %s", e)
+        return None
+    return row[0] if row else None
+
+
+def put(key, value, ttl=DEFAULT_TTL):
+    try:
+        conn = _get_connection()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, created, ttl) VALUES (?, ?, ?, ?)',
+                (key, value, time.time(), ttl)
+            )
+            conn.commit()
+            _count_write(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("LLM cache write failed: %s", e)
+        return
+    with _key_filter_lock:
+        _key_filter.add(key)
+
+
+def embed(text):
+    """Unit-length hashed word-trigram vector (crc32 buckets, stable across processes)."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    vec = np.zeros(SEMANTIC_DIM, dtype=np.float32)
+    if len(tokens) < 3:
+        tokens = tokens + [""] * (3 - len(tokens))
+    buckets = [zlib.crc32(f"{a} {b} {c}".encode("utf-8")) % SEMANTIC_DIM
+               for a, b, c in zip(tokens, tokens[1:], tokens[2:])]
+    np.add.at(vec, buckets, 1.0)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _load_semantic_scope(scope):
+    conn = _get_connection()
+    try:
+        rows = conn.execute(
+            'SELECT id, created + ttl, vec FROM llm_semantic_cache WHERE scope = ? AND created + ttl > ?',
+            (scope, time.time())
+        ).fetchall()
+    finally:
+        conn.close()
+    ids = [row[0] for row in rows]
+    expires = np.array([row[1] for row in rows], dtype=np.float64)
+    matrix = (np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), SEMANTIC_DIM)
+              if rows else np.empty((0, SEMANTIC_DIM), dtype=np.float32))
+    return ids, expires, matrix
+
+
+def semantic_get(scope, vec):
+    """Returns the cached value of the most similar text in scope, or None below threshold."""
+    try:
+        with _semantic_lock:
+            if scope in _semantic_index:
+                _semantic_index.move_to_end(scope)
+            else:
+                _semantic_index[scope] = _load_semantic_scope(scope)
+                if len(_semantic_index) > SEMANTIC_INDEX_SCOPES:
+                    _semantic_index.popitem(last=False)
+            ids, expires, matrix = _semantic_index[scope]
+        if not ids:
+            return None
+        # Expired rows never win the argmax over a live one
+        sims = np.where(expires > time.time(), matrix @ vec, -np.inf)
+        best = int(np.argmax(sims))
+        if sims[best] < SEMANTIC_THRESHOLD:
+            return None
+        conn = _get_connection()
+        try:
+            row = conn.execute(
+                'SELECT value FROM llm_semantic_cache WHERE id = ? AND created + ttl > ?', (ids[best], time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("LLM semantic cache read failed: %s", e)
+        return None
+    return row[0] if row else None
+
+
+def semantic_set(scope, vec, value, ttl=DEFAULT_TTL):
+    try:
+        conn = _get_connection()
+        try:
+            created = time.time()
+            cur = conn.execute(
+                'INSERT INTO llm_semantic_cache (scope, vec, value, created, ttl) VALUES (?, ?, ?, ?, ?)',
+                (scope, vec.astype(np.float32).tobytes(), value, created, ttl)
+            )
+            conn.commit()
+            row_id = cur.lastrowid
+            _count_write(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("LLM semantic cache write failed: %s", e)
+        return
+    with _semantic_lock:
+        if scope in _semantic_index:
+            ids, expires, matrix = _semantic_index[scope]
+            live = expires > created  # drop rows that have expired since the scope was loaded
+            _semantic_index[scope] = ([i for i, keep in zip(ids, live) if keep] + [row_id],
+                                      np.append(expires[live], created + ttl),
+                                      np.vstack([matrix[live], vec[None, :]]))
+
+
+def cached(namespace, key_fn, ttl=DEFAULT_TTL, should_cache=bool, semantic_fn=None):
+    """
+    Decorator: caches the JSON-serializable result of an LLM call.
+    key_fn(*args, **kwargs) returns the tuple of inputs that define the prompt.
+    semantic_fn(*args, **kwargs), if given, returns (scope, text) and enables the
+    near-duplicate tier: only texts within the same scope are compared.
+    Results failing should_cache (errors, empty fallbacks) are never stored.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(namespace, *key_fn(*args, **kwargs))
+            hit = get(key)
+            if hit is not None:
+                log.info("LLM cache hit (%s): %s…", namespace, key[:8])
+                return json.loads(hit)
+
+            scope = vec = None
+            if semantic_fn is not None:
+                sem_scope, sem_text = semantic_fn(*args, **kwargs)
+                scope = make_key(namespace, sem_scope)
+                vec = embed(sem_text)
+                hit = semantic_get(scope, vec)
+                if hit is not None:
+                    log.info("LLM semantic cache hit (%s)", namespace)
+                    return json.loads(hit)
+
+            result = fn(*args, **kwargs)
+            if should_cache(result):
+                serialized = json.dumps(result, ensure_ascii=False)
+                put(key, serialized, ttl)
+                if vec is not None:
+                    semantic_set(scope, vec, serialized, ttl)
+            return result
+        return wrapper
+    return decorator
+
@@ -12,9 +12,15 @@ prompt, so both layers reason from the same structured evidence.
 """
 
 import os
+import math
 import pickle
+import warnings
+import hashlib
+import threading
 import joblib
 import logging
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
 
 log = logging.getLogger("HonestRecruiter.ML")
@@ -39,10 +45,24 @@ fraud_model    = joblib.load(os.path.join(_base, "fraud_model.pkl")) if os.path.
 
 if not fraud_model:
     log.warning("fraud_model.pkl could not be loaded — fraud score will use heuristic fallback.")
+
+# fraud_model inputs, in training order. A model fitted on a DataFrame records
+# its column order; follow it so the plain array lines up by name.
+FRAUD_FEATURES = ("claimed_experience", "repo_count", "account_age", "last_commit_days",
+                  "experience_gap", "skill_match", "email_score")
+if fraud_model is not None and getattr(fraud_model, "feature_names_in_", None) is not None:
+    FRAUD_FEATURES = tuple(str(name) for name in fraud_model.feature_names_in_)
 if not resume_model or not vectorizer:
     log.warning("resume_model.pkl / vectorizer.pkl missing — category prediction unavailable.")
 
 
+# Predicted category by resume content: duplicate / repeat submissions skip
+# the TF-IDF transform, which dominates predict_resume_category.
+CATEGORY_CACHE_SIZE = 1024
+_category_cache = OrderedDict()  # blake2b digest of raw_text -> category
+_category_cache_lock = threading.Lock()
+
+
 # ── Public API ────────────────────────────────────────────────────────────────
 
 def predict_resume_category(raw_text: str) -> str:
@@ -51,14 +71,27 @@ def predict_resume_category(raw_text: str) -> str:
         return "Unknown"
     if not resume_model or not vectorizer:
         return "General"
+
+    key = hashlib.blake2b(raw_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _category_cache_lock:
+        category = _category_cache.get(key)
+        if category is not None:
+            _category_cache.move_to_end(key)
+            return category
     try:
         X = vectorizer.transform([raw_text])
         with joblib.parallel_backend("threading", n_jobs=1):
-            return str(resume_model.predict(X)[0])
+            category = str(resume_model.predict(X)[0])
     except Exception as e:
         log.error("predict_resume_category failed: %s", e)
         return "General"
 
+    with _category_cache_lock:
+        _category_cache[key] = category
+        if len(_category_cache) > CATEGORY_CACHE_SIZE:
+            _category_cache.popitem(last=False)
+    return category
+
 
 def extract_ml_features(data: dict) -> dict:
     """
@@ -170,26 +203,20 @@ def predict_fraud_probability(data: dict) -> float:
     # ── ML Model Path ─────────────────────────────────────────────────────
     if fraud_model is not None:
         try:
-            import pandas as pd
-            X = pd.DataFrame([{
-                "claimed_experience": features["claimed_experience"],
-                "repo_count":         features["repo_count"],
-                "account_age":        features["account_age"],
-                "last_commit_days":   features["last_commit_days"],
-                "experience_gap":     features["experience_gap"],
-                "skill_match":        features["skill_match"],
-                "email_score":        features["email_score"],
-            }])
-
-            with joblib.parallel_backend("threading", n_jobs=1):
+            # One (1, n_features) row; sklearn takes it directly, no DataFrame needed
+            X = np.array([[features[name] for name in FRAUD_FEATURES]], dtype=np.float64)
+
+            with joblib.parallel_backend("threading", n_jobs=1), warnings.catch_warnings():
+                # Columns follow FRAUD_FEATURES, so sklearn's "no feature names" notice is moot here
+                warnings.filterwarnings("ignore", message="X does not have valid feature names",
+                                        category=UserWarning)
                 if hasattr(fraud_model, "predict_proba"):
                     prob = fraud_model.predict_proba(X)[0][1] * 100
                 else:
                     # For models without predict_proba (e.g. LinearSVC)
                     decision = fraud_model.decision_function(X)[0]
-                # Sigmoid calibration
-                import math
-                prob = 100.0 / (1.0 + math.exp(-decision))
+                    # Sigmoid calibration
+                    prob = 100.0 / (1.0 + math.exp(-decision))
 
             # Clamp and log
             prob = float(max(1.0, min(99.0, prob)))
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """
+    Every test gets its own empty llm_cache database. The fixture value
+    switches to another empty database, for tests comparing two cold runs.
+    """
+    databases = iter(range(1_000_000))
+
+    def reset():
+        monkeypatch.setattr(llm_cache, "CACHE_DB_PATH", str(tmp_path / f"llm_cache_{next(databases)}.db"))
+        monkeypatch.setattr(llm_cache, "_initialized", False)
+        monkeypatch.setattr(llm_cache, "_key_filter", set())
+        monkeypatch.setattr(llm_cache, "_semantic_index", type(llm_cache._semantic_index)())
+        monkeypatch.setattr(llm_cache, "_writes_since_purge", 0)
+
+    reset()
+    return reset
@@ -0,0 +1,24 @@
+import os
+
+import candidate_db
+
+
+def test_backup_flush_fsyncs_only_the_written_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_db, "REPORTS_DIR", str(tmp_path))
+    monkeypatch.setattr(candidate_db, "_start_backup_flusher", lambda: None)
+    monkeypatch.setattr(os, "sync", lambda: (_ for _ in ()).throw(AssertionError("host-wide sync")), raising=False)
+    synced = []
+    monkeypatch.setattr(candidate_db, "_fsync_path", synced.append)
+
+    paths = [candidate_db._write_report_backup(h, b'{"ok": true}') for h in ("ab12", "cd34", "ab12")]
+    candidate_db._flush_pending_backups()
+    candidate_db._flush_pending_backups()  # nothing new written: no fsyncs
+
+    assert synced == sorted(set(paths))
+    assert open(paths[0], "rb").read() == b'{"ok": true}'
+
+
+def test_fsync_failures_are_logged_not_raised(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_db, "_pending_backups", {str(tmp_path / "gone.json")})
+    candidate_db._flush_pending_backups()
+    assert not candidate_db._pending_backups
@@ -0,0 +1,60 @@
+import extraction_service
+
+BODY = "\n".join(
+    f"Built service {i} in Python and Go on AWS, cutting p99 latency by {i}% for the payments team."
+    for i in range(60)
+)
+
+
+def _resume(name, email):
+    return f"{name}\nSenior Backend Engineer\n{email} | +1 415 555 0100\n\nEXPERIENCE\n{BODY}\n"
+
+
+def _fake_consensus(calls):
+    def get_ai_consensus(text, task_type, domain_hint):
+        calls.append(text)
+        return {"data": {"identity": {"full_name": text.splitlines()[0]}, "skills": ["Python"]},
+                "consensus_score": 90, "models_used": ["fake"]}
+    return get_ai_consensus
+
+
+def test_near_duplicate_with_another_name_gets_its_own_extraction(monkeypatch):
+    calls = []
+    monkeypatch.setattr(extraction_service, "get_ai_consensus", _fake_consensus(calls))
+    domain = {"domain": "Software"}
+
+    first = extraction_service.extract_entities(_resume("Jane Smith", "jane@example.com"), domain)
+    copy = extraction_service.extract_entities(_resume("John Carter", "jane@example.com"), domain)
+
+    assert first["identity"]["name"] == "Jane Smith"
+    assert copy["identity"]["name"] == "John Carter"
+    assert len(calls) == 2
+
+
+def test_near_duplicate_of_same_person_is_served_from_cache(monkeypatch):
+    calls = []
+    monkeypatch.setattr(extraction_service, "get_ai_consensus", _fake_consensus(calls))
+    domain = {"domain": "Software"}
+    text = _resume("Jane Smith", "jane@example.com")
+
+    first = extraction_service.extract_entities(text, domain)
+    edited = extraction_service.extract_entities(text.replace("p99", "p95", 1), domain)
+
+    assert edited["identity"]["name"] == first["identity"]["name"] == "Jane Smith"
+    assert len(calls) == 1
+
+
+def test_batch_matches_extract_entities_per_resume(monkeypatch, isolated_llm_cache):
+    calls = []
+    monkeypatch.setattr(extraction_service, "get_ai_consensus", _fake_consensus(calls))
+    texts = [_resume("Jane Smith", "jane@example.com"), _resume("John Carter", "john@example.com"),
+             "Wei Zhang\nData Engineer\nwei@example.com\nSpark and Airflow pipelines."]
+    domains = [{"domain": "Software"}, {"domain": "Software"}, {"domain": "Data Science"}]
+
+    batch = extraction_service.extract_entities_batch(texts, domains, max_workers=2)
+    assert len(calls) == len(texts)
+
+    isolated_llm_cache()  # cold cache again, so the scalar calls really extract
+    assert batch == [extraction_service.extract_entities(t, d) for t, d in zip(texts, domains)]
+    assert len(calls) == 2 * len(texts)
+    assert extraction_service.extract_entities_batch([], []) == []
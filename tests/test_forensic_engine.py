@@ -0,0 +1,34 @@
+import forensic_engine
+import hiring_intelligence_engine as hie
+
+ENTITIES = {
+    "identity": {"name": "Jane Smith", "github": "https://github.com/janesmith"},
+    "skills": ["Python", "AWS"],
+    "experience": [{"role": "Backend Engineer", "start_date": "2018", "end_date": "2024"}],
+}
+VERIFICATION = {
+    "identity_verification": {"identity_match_score": 40},
+    "api_signals": {"github": {"exists": True, "metrics": {"repo_count": 14, "last_commit_days_ago": 20,
+                                                           "account_created_year": 2016}}},
+}
+RESUME = "Jane Smith\nBackend Engineer\nBuilt Python services on AWS for the payments team.\n" * 5
+
+
+def _without_timestamp(report):
+    report["meta"].pop("scan_timestamp")
+    return report
+
+
+def test_batch_reports_match_the_scalar_report():
+    intelligence = hie.run_intelligence_analysis(ENTITIES, {}, RESUME, {"domain": "Software"}, use_cache=False)
+    jobs = [
+        (ENTITIES, {}, intelligence, {}, 1.25, 12.0),
+        (ENTITIES, VERIFICATION, intelligence, {}, 0.5, 45.0),
+        ({"identity": {}}, {}, {}, {}, 2.0, 75.0),
+    ]
+
+    batch = forensic_engine.generate_forensic_reports_batch(jobs, max_workers=2)
+
+    assert [_without_timestamp(r) for r in batch] == \
+        [_without_timestamp(forensic_engine.generate_forensic_report(*job)) for job in jobs]
+    assert forensic_engine.generate_forensic_reports_batch([]) == []
@@ -0,0 +1,47 @@
+import pytest
+
+import fraud
+
+
+def _flags(resume_name, gh_name):
+    result = fraud.detect_fraud({"name": resume_name}, {"exists": True, "name_on_profile": gh_name}, {})
+    return result["fraud_flags"]
+
+
+@pytest.mark.parametrize("resume_name, gh_name", [
+    ("Priya Sharma", "Rahul Verma"),
+    ("Alice Wong", "Bob Martin"),
+    ("Wei Zhang", "Carlos Mendes"),
+])
+def test_unrelated_names_are_flagged(resume_name, gh_name):
+    assert fraud.RULE_NAME_MISMATCH[0] in _flags(resume_name, gh_name)
+
+
+@pytest.mark.parametrize("resume_name, gh_name", [
+    ("John Doe", "Doe, John"),   # shared word
+    ("Jon Smith", "John Smyth"),  # near-typo, no shared word
+])
+def test_same_person_is_not_flagged(resume_name, gh_name):
+    assert fraud.RULE_NAME_MISMATCH[0] not in _flags(resume_name, gh_name)
+
+
+def test_batch_matches_detect_fraud_per_candidate():
+    cases = [
+        ({"name": "Priya Sharma"}, {"exists": True, "name_on_profile": "Rahul Verma"}, {}),
+        ({"name": "John Doe"}, {"exists": True, "name_on_profile": "Doe, John",
+                                "repos_count": 40, "followers": 1}, {}),
+        ({"name": "Jane Smith", "linkedin": "linkedin.com/in/x1"}, {}, {"exists": False}),
+        ({"name": "Jane Smith"}, {"exists": False},
+         {"exists": True, "linkedin_metrics": {"identity_match_score": 2, "slug_valid": False}}),
+        ({"name": "Jane Smith"}, {"exists": True, "name_on_profile": ""},
+         {"exists": True, "linkedin_metrics": {"identity_match_score": 9, "slug_valid": True}}),
+        # Missing values as JSON nulls
+        ({"name": None}, {"exists": True, "name_on_profile": "Rahul Verma", "repos_count": None,
+                          "followers": None},
+         {"exists": True, "linkedin_metrics": {"identity_match_score": None, "slug_valid": True}}),
+    ]
+
+    batch = fraud.detect_fraud_batch(*map(list, zip(*cases)))
+
+    assert batch == [fraud.detect_fraud(*case) for case in cases]
+    assert fraud.detect_fraud_batch([], [], []) == []
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import hiring_intelligence_engine as hie
+
+RESUME = (
+    "Jane Smith\nSenior Backend Engineer\n\nEXPERIENCE\n"
+    "Backend Engineer, Acme 2018 - 2024. Designed and deployed Python services on AWS, "
+    "led a team of 4, cut latency 40% and shipped the payments platform to production.\n"
+) * 3
+ENTITIES = {
+    "identity": {"name": "Jane Smith"},
+    "skills": ["Python", "AWS", "Docker"],
+    "experience": [{"role": "Backend Engineer", "start_date": "2018", "end_date": "2024",
+                    "details": "Designed and deployed Python services on AWS"}],
+    "education": [{"degree": "BTech", "year": "2017"}],
+}
+DOMAIN = {"domain": "Software"}
+
+
+def _analyze(**kwargs):
+    return hie.run_intelligence_analysis(ENTITIES, {}, RESUME, DOMAIN, **kwargs)
+
+
+def test_numpy_fraud_probability_is_analyzed_and_cached():
+    hie._analysis_cache.clear()
+    uncached = _analyze(fraud_probability=30.5, use_cache=False)
+
+    first = _analyze(fraud_probability=np.float64(30.5))
+    hit = _analyze(fraud_probability=np.float64(30.5))
+
+    assert first == uncached
+    assert hit == uncached
+
+
+def test_unserializable_result_skips_the_cache(monkeypatch):
+    hie._analysis_cache.clear()
+    real = hie._run_intelligence_analysis
+
+    def with_object(*args):
+        result = real(*args)
+        result["extra"] = object()
+        return result
+
+    monkeypatch.setattr(hie, "_run_intelligence_analysis", with_object)
+    result = _analyze(fraud_probability=10.0)
+
+    assert "extra" in result
+    assert not hie._analysis_cache
+
+
+def test_batch_hiring_index_matches_the_scalar_analysis():
+    github = {"api_signals": {"github": {"exists": True, "metrics": {"activity_score": 8}}}}
+    jobs = [
+        (ENTITIES, {}, RESUME, DOMAIN, 0.0),
+        (ENTITIES, github, RESUME, DOMAIN, 42.5),
+        (ENTITIES, {}, RESUME.replace("Senior ", ""), {"domain": "Data Science"}, 12.0),
+        ({"skills": []}, {}, "Jane Smith\nIntern", DOMAIN, 5.0),  # too short: fast reject
+        (ENTITIES, github, RESUME, DOMAIN, 95.0),  # fraud above the cutoff: fast reject
+    ]
+
+    scores = hie.run_intelligence_analysis_batch(jobs)
+
+    expected = [
+        hie.run_intelligence_analysis(e, v, t, d, fraud_probability=f, use_cache=False)["score"]["hiring_index"]
+        for e, v, t, d, f in jobs
+    ]
+    assert scores.tolist() == expected
+    assert hie.run_intelligence_analysis_batch([]).size == 0
+
+
+@pytest.mark.parametrize("automaton", [True, False])
+def test_phrase_scan_matches_substring_check_with_or_without_pyahocorasick(monkeypatch, automaton):
+    if not automaton:
+        monkeypatch.setattr(hie, "_PHRASE_AC", None)
+    text = (RESUME + "spearheaded a revolutionary cross-functional initiative; mentored juniors").lower()
+
+    assert hie._scan_phrases(text) == {p for p in hie._ALL_PHRASES if p in text}
@@ -0,0 +1,44 @@
+import pytest
+
+import identity_engine
+
+NAMES = ["Jane Smith", "John O'Neil", None, "Wei Zhang"]
+URLS = [
+    "https://www.linkedin.com/in/jane-smith-1234567/",
+    "https://linkedin.com/in/joneil",
+    "https://example.com/profile",
+    None,
+]
+
+
+def _scalar_similarity(name, url):
+    slug = identity_engine.extract_linkedin_slug(url)
+    if not name or not slug:
+        return 0.0
+    clean = identity_engine._NON_ALPHA.sub
+    return identity_engine._similarity(clean('', slug), clean('', name.lower()))
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_similarity_matrix_matches_pairwise_similarity(monkeypatch, native):
+    if not native:
+        monkeypatch.setattr(identity_engine, "_cdist", None)
+    matrix = identity_engine.slug_similarity_matrix(NAMES, URLS)
+
+    assert matrix.shape == (len(NAMES), len(URLS))
+    for i, name in enumerate(NAMES):
+        for j, url in enumerate(URLS):
+            assert matrix[i, j] == pytest.approx(_scalar_similarity(name, url), abs=1e-6)
+
+
+def test_batch_matches_verify_identity_per_candidate(monkeypatch):
+    monkeypatch.setattr(identity_engine, "check_linkedin_reachability", lambda url: "joneil" not in url)
+    resumes = [{"name": "Jane Smith", "email": "jane.smith@example.com"},
+               {"name": "John O'Neil", "email": "joneil@example.com"},
+               {"name": "Wei Zhang"}]
+    urls = URLS[:2] + ["https://linkedin.com/in/wz"]
+
+    batch = identity_engine.verify_identity_batch(resumes, urls)
+
+    assert batch == [identity_engine.verify_identity(r, u) for r, u in zip(resumes, urls)]
+    assert identity_engine.verify_identity_batch([], []) == []
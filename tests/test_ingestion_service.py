@@ -0,0 +1,52 @@
+import sqlite3
+
+import pymupdf
+
+import ingestion_service
+import llm_cache
+
+
+def _pdf():
+    doc = pymupdf.open()
+    doc.new_page().insert_text((50, 72), "Jane Smith\nBackend Engineer\n" + "Built Python services on AWS.\n" * 20)
+    return doc.tobytes()
+
+
+def test_cache_version_bump_reruns_the_pipeline(monkeypatch):
+    runs = []
+    real = ingestion_service.extract_text_layers
+
+    def counting(file_bytes):
+        runs.append(1)
+        return real(file_bytes)
+
+    monkeypatch.setattr(ingestion_service, "extract_text_layers", counting)
+    pdf = _pdf()
+
+    first = ingestion_service.ingest_document(pdf, "a.pdf")
+    assert ingestion_service.ingest_document(pdf, "renamed.pdf") == first
+    assert len(runs) == 1
+
+    monkeypatch.setattr(ingestion_service, "INGEST_CACHE_VERSION", ingestion_service.INGEST_CACHE_VERSION + 1)
+    assert ingestion_service.ingest_document(pdf, "a.pdf")["success"]
+    assert len(runs) == 2
+
+
+def test_cached_results_expire_on_disk_after_the_ingest_ttl(monkeypatch):
+    ingestion_service.ingest_document(_pdf(), "a.pdf")
+    conn = sqlite3.connect(llm_cache.CACHE_DB_PATH)
+    try:
+        assert conn.execute('SELECT ttl FROM llm_cache').fetchall() == [(ingestion_service.INGEST_CACHE_TTL,)]
+        conn.execute('UPDATE llm_cache SET created = created - ?', (ingestion_service.INGEST_CACHE_TTL,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    monkeypatch.setattr(llm_cache, "_initialized", False)
+    llm_cache.init_cache()
+
+    conn = sqlite3.connect(llm_cache.CACHE_DB_PATH)
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone() == (0,)
+    finally:
+        conn.close()
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+flask = pytest.importorskip("flask")
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web cam"))
+
+from werkzeug.exceptions import HTTPException  # noqa: E402
+
+from json_http import http_error, ojsonify, request_json  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    # Same wiring as app.py: JSON HTTP errors plus a catch-all 500 handler
+    app = flask.Flask(__name__)
+    app.register_error_handler(HTTPException, http_error)
+
+    @app.errorhandler(Exception)
+    def crash(e):
+        return ojsonify({"success": False, "error": "Internal engine failure."}), 500
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return ojsonify(request_json())
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body", [b"{bad json", b"[1, 2]", b'"text"'])
+def test_bad_bodies_are_client_errors(client, body):
+    response = client.post("/echo", data=body, content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+def test_valid_and_empty_bodies_parse(client):
+    assert client.post("/echo", data=b'{"a": 1}').get_json() == {"a": 1}
+    assert client.post("/echo").get_json() == {}
+
+
+def test_other_http_errors_keep_their_status(client):
+    assert client.get("/echo").status_code == 405
+    assert client.get("/missing").status_code == 404
@@ -0,0 +1,27 @@
+import linkedin_engine
+
+
+class FakeClient:
+    def __init__(self):
+        self.prompts = []
+        self.models = self
+
+    def generate_content(self, model, contents):
+        self.prompts.append(contents)
+        text = contents[len(linkedin_engine._SUMMARY_PROMPT):]
+        return type("Response", (), {"text": f" Summary of {text.splitlines()[0]} "})()
+
+
+def test_batch_matches_generate_career_summary_per_resume(monkeypatch, isolated_llm_cache):
+    client = FakeClient()
+    monkeypatch.setattr(linkedin_engine, "_client", lambda: client)
+    texts = ["Jane Smith\nBackend Engineer", "John Carter\nData Analyst", "Wei Zhang\nSRE"]
+
+    batch = linkedin_engine.generate_career_summaries_batch(texts)
+    assert len(client.prompts) == len(texts)
+
+    isolated_llm_cache()  # cold cache again, so the scalar calls really generate
+    assert batch == [linkedin_engine.generate_career_summary(t) for t in texts]
+    assert batch[0] == "Summary of Jane Smith"
+    assert len(client.prompts) == 2 * len(texts)
+    assert linkedin_engine.generate_career_summaries_batch([]) == []
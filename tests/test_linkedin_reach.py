@@ -0,0 +1,67 @@
+import pytest
+import requests
+
+import identity_engine
+import linkedin_engine
+import linkedin_reach
+
+
+class FakeSession:
+    def __init__(self, status):
+        self.status = status
+        self.calls = []
+
+    def head(self, url, timeout, allow_redirects):
+        self.calls.append((url, allow_redirects))
+        if isinstance(self.status, Exception):
+            raise self.status
+        return type("Response", (), {"status_code": self.status})()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(status):
+        fake = FakeSession(status)
+        monkeypatch.setattr(linkedin_reach, "_SESSION", fake)
+        monkeypatch.setattr(linkedin_reach, "_status_cache", type(linkedin_reach._status_cache)())
+        return fake
+    return install
+
+
+def test_final_answers_are_cached_per_slug_and_redirect_mode(session):
+    fake = session(200)
+    url = "https://www.linkedin.com/in/Jane-Smith/"
+
+    assert linkedin_engine.verify_linkedin_authenticity(url, "Jane Smith")["reachable"] is True
+    assert linkedin_engine.verify_linkedin_authenticity(url.lower(), "Jane Smith")["reachable"] is True
+    assert identity_engine.check_linkedin_reachability(url) is True
+    assert identity_engine.check_linkedin_reachability(url) is True
+
+    assert fake.calls == [(url, False), (url, True)]
+
+
+@pytest.mark.parametrize("status", [999, 403, 429, 503])
+def test_rate_limits_and_server_errors_are_retried(session, status):
+    fake = session(status)
+    url = "https://www.linkedin.com/in/jane-smith"
+
+    assert linkedin_engine.verify_linkedin_authenticity(url, "Jane Smith")["reachable"] is (status in (999, 403))
+    assert identity_engine.check_linkedin_reachability(url) is False  # only 200 counts here
+    assert linkedin_reach.profile_reachable(url, {200}) is False
+
+    assert len(fake.calls) == 3
+
+
+def test_network_errors_are_not_cached(session):
+    fake = session(requests.ConnectionError("down"))
+    url = "https://linkedin.com/in/jane-smith"
+
+    assert linkedin_reach.profile_reachable(url, {200}) is False
+    assert linkedin_reach.profile_reachable(url, {200}) is False
+    assert len(fake.calls) == 2
+
+
+def test_non_profile_urls_never_hit_the_network(session):
+    fake = session(200)
+    assert linkedin_reach.profile_reachable("https://example.com/jane", {200}) is False
+    assert fake.calls == []
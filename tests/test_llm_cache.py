@@ -0,0 +1,70 @@
+import sqlite3
+import time
+
+import llm_cache
+
+
+def _age_all_rows():
+    conn = sqlite3.connect(llm_cache.CACHE_DB_PATH)
+    conn.execute('UPDATE llm_cache SET created = 0')
+    conn.execute('UPDATE llm_semantic_cache SET created = 0')
+    conn.commit()
+    conn.close()
+
+
+def _row_counts():
+    conn = sqlite3.connect(llm_cache.CACHE_DB_PATH)
+    try:
+        return tuple(conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                     for table in ("llm_cache", "llm_semantic_cache"))
+    finally:
+        conn.close()
+
+
+def test_expired_rows_are_deleted_at_init(monkeypatch):
+    llm_cache.put("k1", "v1")
+    llm_cache.semantic_set("scope", llm_cache.embed("jane smith backend engineer"), "v1")
+    _age_all_rows()
+    assert _row_counts() == (1, 1)
+
+    monkeypatch.setattr(llm_cache, "_initialized", False)
+    llm_cache.init_cache()
+
+    assert _row_counts() == (0, 0)
+
+
+def test_expired_rows_are_deleted_every_n_writes(monkeypatch):
+    monkeypatch.setattr(llm_cache, "PURGE_EVERY_WRITES", 3)
+    llm_cache.put("old", "v")
+    _age_all_rows()
+
+    llm_cache.put("k2", "v")
+    assert _row_counts() == (2, 0)
+    llm_cache.put("k3", "v")  # third write: purge runs
+    assert _row_counts() == (2, 0)
+    assert llm_cache.get("old") is None
+    assert llm_cache.get("k3") == "v"
+
+
+def test_semantic_index_keeps_a_bounded_number_of_scopes(monkeypatch):
+    monkeypatch.setattr(llm_cache, "SEMANTIC_INDEX_SCOPES", 3)
+    vec = llm_cache.embed("jane smith backend engineer python aws")
+    for i in range(5):
+        llm_cache.semantic_set(f"scope{i}", vec, f"v{i}")
+        assert llm_cache.semantic_get(f"scope{i}", vec) == f"v{i}"
+
+    assert list(llm_cache._semantic_index) == ["scope2", "scope3", "scope4"]
+    assert llm_cache.semantic_get("scope0", vec) == "v0"  # evicted scopes reload from disk
+
+
+def test_expired_best_match_does_not_hide_a_live_one():
+    text = "jane smith backend engineer built python services on aws for the payments team " * 5
+    exact, near = llm_cache.embed(text), llm_cache.embed(text + " and go")
+    assert llm_cache.semantic_get("scope", exact) is None  # loads the (empty) scope
+
+    llm_cache.semantic_set("scope", exact, "dead", ttl=0.2)
+    llm_cache.semantic_set("scope", near, "live")
+    time.sleep(0.3)
+
+    assert float(near @ exact) >= llm_cache.SEMANTIC_THRESHOLD
+    assert llm_cache.semantic_get("scope", exact) == "live"
@@ -1,55 +1,63 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request
+from werkzeug.exceptions import HTTPException
 import uuid
 from interview_engine import InterviewEngine
 from session_storage import save_session, load_session
+from answer_evaluator import AnswerEvaluator
+from json_http import ojsonify, request_json, http_error
 import os
 
 app = Flask(__name__)
 app.secret_key = "super_secret_interview_key"
 
+app.register_error_handler(HTTPException, http_error)
+
 # In-memory storage for active sessions
 active_sessions = {}
 
+# Stateless evaluator — shared across all /submit_answer requests
+_EVALUATOR = AnswerEvaluator()
+
 @app.route('/interview/<candidate_hash>')
 def interview(candidate_hash):
     return render_template('interview.html', candidate_hash=candidate_hash)
 
 @app.route('/start_session', methods=['POST'])
 def start_session():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash', str(uuid.uuid4()))
     
     # Initialize engine for this candidate
     active_sessions[candidate_hash] = InterviewEngine(candidate_hash)
     
-    return jsonify({"status": "success", "candidate_hash": candidate_hash})
+    return ojsonify({"status": "success", "candidate_hash": candidate_hash})
 
 @app.route('/process_frame', methods=['POST'])
 def process_frame():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     image_b64 = data.get('image')
     
     engine = active_sessions.get(candidate_hash)
     if not engine or not image_b64:
         # If session dropped, ignore or error
-        return jsonify({"error": "Invalid session or missing image"}), 400
+        return ojsonify({"error": "Invalid session or missing image"}), 400
         
     metrics = engine.process_frame(image_b64)
-    return jsonify(metrics)
+    return ojsonify(metrics)
 
 @app.route('/cheating_event', methods=['POST'])
 def cheating_event():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     event_type = data.get('event_type')
     
     engine = active_sessions.get(candidate_hash)
     if not engine or not event_type:
-        return jsonify({"error": "Invalid session or missing event"}), 400
+        return ojsonify({"error": "Invalid session or missing event"}), 400
         
     engine.log_cheating_event(event_type)
-    return jsonify({"status": "logged"})
+    return ojsonify({"status": "logged"})
 
 @app.route('/load_questions/', defaults={'pattern': ''}, methods=['GET'])
 @app.route('/load_questions/<pattern>', methods=['GET'])
@@ -71,24 +79,22 @@ def load_questions(pattern):
     # Sort questions by ID to maintain Q1, Q2, Q3 order
     questions.sort(key=lambda item: item.get("id", ""))
             
-    return jsonify(questions)
+    return ojsonify(questions)
 
 @app.route('/submit_answer', methods=['POST'])
 def submit_answer():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     question = data.get('question')
     answer = data.get('answer')
     
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
+        return ojsonify({"error": "Invalid session"}), 400
         
     metrics = engine.get_current_metrics()
     
-    from answer_evaluator import AnswerEvaluator
-    evaluator = AnswerEvaluator()
-    eval_result = evaluator.evaluate(question, answer, metrics)
+    eval_result = _EVALUATOR.evaluate(question, answer, metrics)
     
     # Store evaluated answer in session object
     engine.log_evaluated_answer({
@@ -97,25 +103,25 @@ def submit_answer():
         "evaluation": eval_result
     })
     
-    return jsonify(eval_result)
+    return ojsonify(eval_result)
 
 @app.route('/get_metrics', methods=['GET'])
 def get_metrics():
     candidate_hash = request.args.get('candidate_hash')
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
+        return ojsonify({"error": "Invalid session"}), 400
         
-    return jsonify(engine.get_current_metrics())
+    return ojsonify(engine.get_current_metrics())
 
 @app.route('/end_session', methods=['POST'])
 def end_session():
-    data = request.json
+    data = request_json()
     candidate_hash = data.get('candidate_hash')
     
     engine = active_sessions.get(candidate_hash)
     if not engine:
-        return jsonify({"error": "Invalid session"}), 400
+        return ojsonify({"error": "Invalid session"}), 400
         
     summary = engine.finalize_session()
     save_session(candidate_hash, summary)
@@ -131,7 +137,7 @@ def end_session():
     # Combine forensic + behavioral scoring
     # But DO NOT implement now.
     
-    return jsonify({"status": "success", "summary": summary})
+    return ojsonify({"status": "success", "summary": summary})
 
 @app.route('/session_summary/<candidate_hash>')
 def session_summary(candidate_hash):
@@ -0,0 +1,32 @@
+import orjson
+from flask import current_app, request
+from werkzeug.exceptions import BadRequest
+
+# orjson request/response helpers shared by the recruiter app and the interview app
+
+ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def ojsonify(payload, status=200):
+    """orjson-backed drop-in for flask.jsonify (5-6x faster serialization)."""
+    return current_app.response_class(orjson.dumps(payload, option=ORJSON_OPTS),
+                                      status=status, mimetype="application/json")
+
+def request_json():
+    """
+    Parse the request body once with orjson instead of stdlib-backed request.json.
+    An empty body is {}; malformed JSON or a non-object body is a 400, not a 500.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        raise BadRequest(f"Malformed JSON body: {e}") from e
+    if not isinstance(data, dict):
+        raise BadRequest("JSON body must be an object")
+    return data
+
+def http_error(e):
+    """Error handler rendering werkzeug HTTPExceptions (400, 404, 405...) as JSON with their own status."""
+    return ojsonify({"success": False, "error": e.name, "detail": e.description}, e.code)